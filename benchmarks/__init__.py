@@ -0,0 +1 @@
+"""Benchmarks for readers and parsers. Run from the repository root."""
@@ -0,0 +1,199 @@
+"""Synthetic document generators for benchmarks."""
+import csv
+import random
+import zipfile
+from pathlib import Path
+from typing import List
+from xml.sax.saxutils import escape
+
+
+WORDS = (
+    "access control policy security network firewall encryption audit "
+    "compliance identity password rotation review incident response data "
+    "classification retention backup vendor risk assessment owner approval "
+    "exception logging monitoring privileged account least privilege"
+).split()
+
+
+def sentence(rng: random.Random, words: int = 12) -> str:
+    """Generate a pseudo-policy sentence."""
+    text = ' '.join(rng.choice(WORDS) for _ in range(words))
+    return text.capitalize() + '.'
+
+
+def paragraph(rng: random.Random, sentences: int = 5) -> str:
+    """Generate a paragraph of pseudo-policy sentences."""
+    return ' '.join(sentence(rng) for _ in range(sentences))
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path: Path, pages: int, lines_per_page: int = 45, seed: int = 0) -> Path:
+    """
+    Write an N-page text PDF without third-party libraries.
+    
+    Each page holds lines_per_page lines of Helvetica text.
+    """
+    rng = random.Random(seed)
+    objects: List[bytes] = []
+    
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+    
+    catalog = add(b'')  # Filled in once the page tree exists
+    page_tree = add(b'')
+    font = add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+    
+    page_ids = []
+    for page_num in range(pages):
+        lines = [f"Section {page_num + 1}.{i + 1} {sentence(rng, 10)}" for i in range(lines_per_page)]
+        ops = ['BT', '/F1 10 Tf', '14 TL', '50 760 Td']
+        ops += [f"({_pdf_escape(line)}) Tj T*" for line in lines]
+        ops.append('ET')
+        stream = '\n'.join(ops).encode('latin-1')
+        contents = add(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        page_ids.append(add(
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>'
+            % (page_tree, font, contents)
+        ))
+    
+    kids = b' '.join(b'%d 0 R' % i for i in page_ids)
+    objects[page_tree - 1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids))
+    objects[catalog - 1] = b'<< /Type /Catalog /Pages %d 0 R >>' % page_tree
+    
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+        len(objects) + 1, catalog, xref
+    )
+    
+    path.write_bytes(bytes(out))
+    return path
+
+
+_DOCX_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/docProps/core.xml" '
+    'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+    '</Types>'
+)
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" '
+    'Target="docProps/core.xml"/>'
+    '</Relationships>'
+)
+_DOCX_CORE = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+    'xmlns:dc="http://purl.org/dc/elements/1.1/">'
+    '<dc:title>Synthetic Policy</dc:title><dc:creator>benchmarks</dc:creator>'
+    '</cp:coreProperties>'
+)
+
+
+def _docx_paragraph(text: str, heading_level: int = 0) -> str:
+    ppr = f'<w:pPr><w:outlineLvl w:val="{heading_level - 1}"/></w:pPr>' if heading_level else ''
+    return f'<w:p>{ppr}<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def write_docx(
+    path: Path,
+    sections: int,
+    paragraphs_per_section: int = 10,
+    table_rows: int = 20,
+    table_columns: int = 5,
+    seed: int = 0,
+) -> Path:
+    """
+    Write a DOCX of headed sections, each with paragraphs and one table.
+    
+    The package is assembled directly as WordprocessingML so large files can
+    be produced without python-docx.
+    """
+    rng = random.Random(seed)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _DOCX_CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _DOCX_RELS)
+        archive.writestr('docProps/core.xml', _DOCX_CORE)
+        with archive.open('word/document.xml', 'w') as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:document {_DOCX_NS}><w:body>'.encode())
+            for number in range(1, sections + 1):
+                parts = [_docx_paragraph(f"{number}. {sentence(rng, 4)}", heading_level=1)]
+                parts += [_docx_paragraph(paragraph(rng)) for _ in range(paragraphs_per_section)]
+                if table_rows:
+                    rows = [[f"Column {c + 1}" for c in range(table_columns)]]
+                    rows += [[sentence(rng, 3) for _ in range(table_columns)] for _ in range(table_rows)]
+                    parts.append('<w:tbl>' + ''.join(
+                        '<w:tr>' + ''.join(f'<w:tc>{_docx_paragraph(cell)}</w:tc>' for cell in row) + '</w:tr>'
+                        for row in rows
+                    ) + '</w:tbl>')
+                f.write(''.join(parts).encode())
+            f.write(b'<w:sectPr/></w:body></w:document>')
+    return path
+
+
+def write_xlsx(path: Path, rows: int, columns: int, sheets: int = 1, seed: int = 0) -> Path:
+    """Write a workbook of rows x columns per sheet (mixed text and numbers)."""
+    from openpyxl import Workbook
+    
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    for sheet in range(sheets):
+        worksheet = workbook.create_sheet(f"Sheet{sheet + 1}")
+        worksheet.append([f"Column {c + 1}" for c in range(columns)])
+        for row in range(rows):
+            worksheet.append([
+                rng.choice(WORDS) if c % 2 else row * columns + c
+                for c in range(columns)
+            ])
+    workbook.save(path)
+    return path
+
+
+def write_csv(path: Path, rows: int, columns: int = 8, seed: int = 0) -> Path:
+    """Write a CSV with a header row and rows x columns of mixed values."""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow([f"column_{c + 1}" for c in range(columns)])
+        for row in range(rows):
+            writer.writerow([
+                sentence(rng, 3) if c % 2 else row * columns + c
+                for c in range(columns)
+            ])
+    return path
+
+
+def write_text(path: Path, size_mb: float, seed: int = 0) -> Path:
+    """Write a UTF-8 text file of roughly size_mb megabytes of paragraphs."""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        while written < target:
+            text = paragraph(rng) + '\n'
+            f.write(text)
+            written += len(text)
+    return path
@@ -0,0 +1,171 @@
+"""
+Local fake of the Vault HTTP API for exercising the credentials provider.
+
+Implements just what src/services/credentials.py uses: Kubernetes login,
+KV v2 reads, dynamic (leased) reads and lease renewal. Every request can be
+delayed to simulate a remote store, and GET /stats reports request counts so
+caching and coalescing can be checked from outside.
+
+Usage:
+    python -m benchmarks.fake_vault [--port 8200] [--token dev]
+                                    [--secret smb/fileserver=username=svc,password=pw]
+                                    [--lease SECONDS] [--latency-ms MS]
+
+then start the server with SECRET_ENDPOINT=http://127.0.0.1:8200 and
+VAULT_TOKEN=dev. With --lease 0 (the default) secrets are KV v2 entries
+under the 'secret' mount; with --lease N they are leased, renewable
+secrets read from their path as-is (set VAULT_KV_MOUNT= to match).
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+
+class FakeVault(ThreadingHTTPServer):
+    """In-memory secret store speaking a subset of the Vault API."""
+    
+    daemon_threads = True
+    
+    def __init__(
+        self,
+        address: tuple,
+        secrets: Dict[str, Dict[str, Any]],
+        token: str = 'dev',
+        lease_seconds: int = 0,
+        latency_ms: float = 0
+    ):
+        super().__init__(address, FakeVaultHandler)
+        self.secrets = secrets
+        self.tokens = {token}
+        self.lease_seconds = lease_seconds
+        self.latency = latency_ms / 1000
+        self.stats: Counter = Counter()
+        self.lock = threading.Lock()
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def count(self, kind: str):
+        with self.lock:
+            self.stats[kind] += 1
+
+
+class FakeVaultHandler(BaseHTTPRequestHandler):
+    server: FakeVault
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        if self.path == '/stats':
+            return self._reply(200, dict(self.server.stats))
+        if not self._authorised():
+            return
+        path = self.path[len('/v1/'):]
+        if path.startswith('secret/data/'):
+            secret = self.server.secrets.get(path[len('secret/data/'):])
+            body = {'data': {'data': secret, 'metadata': {'version': 1}}, 'lease_duration': 0}
+        else:
+            secret = self.server.secrets.get(path)
+            body = {
+                'data': secret,
+                'lease_id': f"{path}/{uuid.uuid4().hex}",
+                'lease_duration': self.server.lease_seconds,
+                'renewable': True,
+            }
+        self.server.count('read')
+        if secret is None:
+            return self._reply(404, {'errors': []})
+        self._reply(200, body)
+    
+    def do_POST(self):
+        if self.path.startswith('/v1/auth/') and self.path.endswith('/login'):
+            payload = self._payload()
+            if not payload or not payload.get('jwt'):
+                return self._reply(400, {'errors': ['missing jwt']})
+            token = uuid.uuid4().hex
+            self.server.tokens.add(token)
+            self.server.count('login')
+            return self._reply(200, {'auth': {'client_token': token, 'lease_duration': 3600, 'renewable': True}})
+        self._reply(404, {'errors': []})
+    
+    def do_PUT(self):
+        if self.path != '/v1/sys/leases/renew':
+            return self._reply(404, {'errors': []})
+        if not self._authorised():
+            return
+        payload = self._payload() or {}
+        self.server.count('renew')
+        self._reply(200, {
+            'lease_id': payload.get('lease_id'),
+            'lease_duration': payload.get('increment') or self.server.lease_seconds,
+            'renewable': True,
+        })
+    
+    def _authorised(self) -> bool:
+        if self.headers.get('X-Vault-Token') in self.server.tokens:
+            return True
+        self._reply(403, {'errors': ['permission denied']})
+        return False
+    
+    def _payload(self) -> Optional[Dict[str, Any]]:
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+    
+    def _reply(self, status: int, body: Dict[str, Any]):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_fake_vault(
+    secrets: Dict[str, Dict[str, Any]],
+    token: str = 'dev',
+    lease_seconds: int = 0,
+    latency_ms: float = 0,
+    port: int = 0
+) -> FakeVault:
+    """Serve a fake Vault on a background thread; call shutdown() when done."""
+    server = FakeVault(('127.0.0.1', port), secrets, token, lease_seconds, latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_secret(spec: str) -> tuple[str, Dict[str, str]]:
+    """'smb/fileserver=username=svc,password=pw' -> ('smb/fileserver', {...})."""
+    path, _, fields = spec.partition('=')
+    return path, dict(field.split('=', 1) for field in fields.split(',') if field)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8200)
+    parser.add_argument('--token', default='dev')
+    parser.add_argument('--secret', action='append', default=[], help='PATH=KEY=VALUE[,KEY=VALUE...]')
+    parser.add_argument('--lease', type=int, default=0, help='Lease seconds (0 = KV v2 secrets)')
+    parser.add_argument('--latency-ms', type=float, default=0)
+    args = parser.parse_args()
+    
+    secrets = dict(parse_secret(spec) for spec in args.secret)
+    server = FakeVault(('127.0.0.1', args.port), secrets, args.token, args.lease, args.latency_ms)
+    print(f"Fake Vault on {server.url} with {len(secrets)} secrets")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+"""
+Load-test the tool-call API end to end.
+
+Drives POST /api/v1/tools/call with a weighted mix of policy-read-document
+and policy-list-documents requests against a local corpus, and reports
+latency percentiles, throughput and error rate per tool.
+
+Modes:
+    closed  --concurrency clients each send their next request as soon as
+            the previous one completes (measures capacity).
+    open    requests arrive at --rate per second (Poisson arrivals)
+            whether or not earlier ones finished (measures latency under a
+            given load). Latency is measured from the scheduled arrival, so
+            queueing delay is not hidden when the server falls behind.
+
+Usage:
+    python -m benchmarks.loadtest [--url URL | --spawn-workers N]
+                                  [--mode closed|open] [--concurrency N]
+                                  [--rate R] [--duration S] [--warmup S]
+                                  [--mix read=0.8,list=0.2] [--corpus DIR]
+                                  [--rate-limit] [--json OUT]
+
+Without --corpus a mixed synthetic corpus is generated. The server must be
+able to read the corpus path, so run it on the same host.
+
+Every request comes from one address, which the server's rate limiter
+counts as a single agent, so a server started with --spawn-workers runs
+with RATE_LIMIT_ENABLED=false unless --rate-limit is given. Against --url
+the server's own setting applies; rejected calls show as HTTP 429 errors.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.corpus import write_csv, write_docx, write_pdf, write_text, write_xlsx
+from benchmarks.suite import percentile
+from src.config import settings
+
+
+TOOLS = {
+    'read': 'policy-read-document',
+    'list': 'policy-list-documents',
+}
+
+
+@dataclass
+class ToolStats:
+    """Outcomes of one tool's requests inside the measurement window."""
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    error_kinds: Dict[str, int] = field(default_factory=dict)
+    
+    def record(self, latency: float, error: Optional[str]):
+        self.latencies.append(latency)
+        if error:
+            self.errors += 1
+            self.error_kinds[error] = self.error_kinds.get(error, 0) + 1
+    
+    def summary(self, window: float) -> Dict[str, Any]:
+        count = len(self.latencies)
+        row: Dict[str, Any] = {
+            'requests': count,
+            'throughput_rps': round(count / window, 2),
+            'error_rate': round(self.errors / count, 4) if count else 0.0,
+            'errors': self.error_kinds,
+        }
+        if count:
+            row.update({
+                f"p{q}_ms": round(percentile(self.latencies, q) * 1000, 2)
+                for q in (50, 95, 99)
+            })
+            row['max_ms'] = round(max(self.latencies) * 1000, 2)
+        return row
+
+
+def sample_corpus(directory: Path) -> List[Path]:
+    """Generate a small mixed-format corpus."""
+    return [
+        write_pdf(directory / 'access-control.pdf', 20),
+        write_docx(directory / 'incident-response.docx', 20),
+        write_xlsx(directory / 'vendor-risk.xlsx', 2_000, 10),
+        write_csv(directory / 'asset-inventory.csv', 5_000),
+        write_text(directory / 'retention.txt', 0.5),
+    ]
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        if name not in TOOLS:
+            raise argparse.ArgumentTypeError(f"unknown tool '{name}' (use {', '.join(TOOLS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class LoadTest:
+    """Request generator shared by both modes."""
+    
+    def __init__(self, client: httpx.AsyncClient, corpus: Path, files: List[Path], mix: Dict[str, float], seed: int):
+        self.client = client
+        self.corpus = corpus
+        self.files = files
+        self.kinds = list(mix)
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, ToolStats] = {TOOLS[kind]: ToolStats() for kind in self.kinds}
+        self.measure_from = 0.0
+        self.measure_until = 0.0
+    
+    def next_request(self) -> Dict[str, Any]:
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        if kind == 'read':
+            arguments = {'source': str(self.rng.choice(self.files))}
+        else:
+            arguments = {'source': str(self.corpus)}
+        return {'name': TOOLS[kind], 'arguments': arguments}
+    
+    async def send(self, payload: Dict[str, Any], started: float):
+        """Send one call; latency is counted from `started`."""
+        error = None
+        try:
+            response = await self.client.post('/api/v1/tools/call', json=payload)
+            if response.status_code != 200:
+                error = f"http_{response.status_code}"
+            elif response.json().get('status') != 'success':
+                error = 'tool_error'
+        except httpx.TimeoutException:
+            error = 'timeout'
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        finished = time.perf_counter()
+        if self.measure_from <= started < self.measure_until:
+            self.stats[payload['name']].record(finished - started, error)
+    
+    async def closed_loop(self, concurrency: int, end: float):
+        async def client_loop():
+            while time.perf_counter() < end:
+                await self.send(self.next_request(), time.perf_counter())
+        
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    
+    async def open_loop(self, rate: float, max_outstanding: int, end: float) -> int:
+        """Issue Poisson arrivals until end; returns arrivals dropped at the outstanding cap."""
+        pending = set()
+        dropped = 0
+        next_arrival = time.perf_counter()
+        while next_arrival < end:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(pending) >= max_outstanding:
+                dropped += 1
+            else:
+                task = asyncio.create_task(self.send(self.next_request(), next_arrival))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            next_arrival += self.rng.expovariate(rate)
+        if pending:
+            await asyncio.wait(pending)
+        return dropped
+
+
+def spawn_server(workers: int, port: int, rate_limit: bool) -> subprocess.Popen:
+    """Start the API under uvicorn with the given worker count and rate limiter state."""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'src.main:app', '--host', '127.0.0.1',
+         '--port', str(port), '--workers', str(workers), '--log-level', 'warning'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        env={**os.environ, 'RATE_LIMIT_ENABLED': str(rate_limit).lower()},
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        if server.poll() is not None:
+            raise RuntimeError('Server exited during startup')
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError('Server did not become healthy')
+
+
+async def run(args: argparse.Namespace, corpus: Path, files: List[Path]) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.max_outstanding, max_keepalive_connections=args.max_outstanding)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        test = LoadTest(client, corpus, files, args.mix, args.seed)
+        start = time.perf_counter()
+        test.measure_from = start + args.warmup
+        test.measure_until = end = test.measure_from + args.duration
+        dropped = 0
+        if args.mode == 'closed':
+            await test.closed_loop(args.concurrency, end)
+        else:
+            dropped = await test.open_loop(args.rate, args.max_outstanding, end)
+    
+    tools = {name: stats.summary(args.duration) for name, stats in test.stats.items()}
+    overall = ToolStats()
+    for stats in test.stats.values():
+        overall.latencies += stats.latencies
+        overall.errors += stats.errors
+        for kind, count in stats.error_kinds.items():
+            overall.error_kinds[kind] = overall.error_kinds.get(kind, 0) + count
+    return {
+        'config': {
+            'url': args.url,
+            'mode': args.mode,
+            'concurrency': args.concurrency if args.mode == 'closed' else None,
+            'rate': args.rate if args.mode == 'open' else None,
+            'duration_s': args.duration,
+            'warmup_s': args.warmup,
+            'mix': args.mix,
+            'server_workers': args.spawn_workers,
+            # None: the --url server's own setting
+            'server_rate_limit': args.rate_limit if args.spawn_workers else None,
+            'corpus_files': len(files),
+        },
+        'overall': {**overall.summary(args.duration), 'dropped_arrivals': dropped},
+        'tools': tools,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=f"http://127.0.0.1:{settings.server_port}")
+    parser.add_argument('--spawn-workers', type=int, help='Start a local server with N workers for the run')
+    parser.add_argument('--port', type=int, default=8765, help='Port for --spawn-workers')
+    parser.add_argument(
+        '--rate-limit', action='store_true', help='Keep the rate limiter on in the --spawn-workers server'
+    )
+    parser.add_argument('--mode', choices=('closed', 'open'), default='closed')
+    parser.add_argument('--concurrency', type=int, default=16, help='Clients in closed mode')
+    parser.add_argument('--rate', type=float, default=50.0, help='Arrivals per second in open mode')
+    parser.add_argument('--max-outstanding', type=int, default=1000, help='Open-mode cap on in-flight requests')
+    parser.add_argument('--duration', type=float, default=30.0, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=5.0, help='Unmeasured seconds before the window')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--mix', type=parse_mix, default={'read': 0.8, 'list': 0.2})
+    parser.add_argument('--corpus', type=Path, help='Directory of documents to read')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', type=Path, help='Write results as JSON')
+    args = parser.parse_args()
+    
+    server = None
+    if args.spawn_workers:
+        args.url = f"http://127.0.0.1:{args.port}"
+        server = spawn_server(args.spawn_workers, args.port, args.rate_limit)
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus = args.corpus.resolve() if args.corpus else Path(tmp)
+            files = sorted(p for p in corpus.iterdir() if p.is_file()) if args.corpus else sample_corpus(corpus)
+            result = asyncio.run(run(args, corpus, files))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    
+    rate_limit = result['config']['server_rate_limit']
+    print(f"server rate limit: {'server setting' if rate_limit is None else 'on' if rate_limit else 'off'}")
+    print(f"{'tool':<24} {'req':>7} {'rps':>8} {'err%':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in [*result['tools'].items(), ('overall', result['overall'])]:
+        print(
+            f"{name:<24} {row['requests']:>7} {row['throughput_rps']:>8} {row['error_rate'] * 100:>6.2f} "
+            f"{row.get('p50_ms', '-'):>9} {row.get('p95_ms', '-'):>9} {row.get('p99_ms', '-'):>9}"
+        )
+    if result['overall']['dropped_arrivals']:
+        print(f"dropped arrivals (outstanding cap): {result['overall']['dropped_arrivals']}")
+    
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare PDF extraction engines on a corpus.
+
+Measures throughput of the fast (pdfium) and layout (pdfplumber) engines
+and how closely the fast output matches the layout output, word by word.
+
+Usage:
+    python -m benchmarks.pdf_engines [--corpus DIR] [--repeat N] [--json OUT]
+
+Without --corpus a small synthetic corpus is generated.
+"""
+import argparse
+import difflib
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.corpus import write_pdf
+from src.services.parsers.pdf_parser import PDFParser, PDF_ENGINES
+
+
+def fidelity(reference: str, candidate: str) -> float:
+    """Word-sequence similarity of two extractions (1.0 = identical words)."""
+    matcher = difflib.SequenceMatcher(None, reference.split(), candidate.split(), autojunk=False)
+    return matcher.ratio()
+
+
+def bench_file(parser: PDFParser, path: Path, repeat: int) -> Dict[str, Any]:
+    """Time each engine on one file and score fast-engine fidelity."""
+    size_mb = path.stat().st_size / (1024 * 1024)
+    row: Dict[str, Any] = {'file': path.name, 'size_mb': round(size_mb, 3)}
+    outputs = {}
+    
+    for engine in PDF_ENGINES:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = parser.parse_sync(path, engine=engine)
+            timings.append(time.perf_counter() - start)
+        outputs[engine] = result['content']
+        median = statistics.median(timings)
+        pages = result['metadata']['pages']
+        row[engine] = {
+            'median_s': round(median, 4),
+            'pages_per_s': round(pages / median, 1) if median else None,
+            'mb_per_s': round(size_mb / median, 2) if median else None,
+        }
+    
+    row['speedup'] = round(row['layout']['median_s'] / row['fast']['median_s'], 1)
+    row['fidelity'] = round(fidelity(outputs['layout'], outputs['fast']), 4)
+    return row
+
+
+def sample_corpus(directory: Path) -> List[Path]:
+    """Generate a small synthetic corpus."""
+    return [write_pdf(directory / f"sample_{pages}p.pdf", pages, seed=pages) for pages in (5, 25, 100)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', type=Path, help='Directory of PDFs to benchmark')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', type=Path, help='Write results as JSON')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        files = sorted(args.corpus.glob('*.pdf')) if args.corpus else sample_corpus(Path(tmp))
+        pdf_parser = PDFParser()
+        rows = [bench_file(pdf_parser, path, args.repeat) for path in files]
+    
+    print(f"{'file':<32} {'MB':>7} {'fast p/s':>9} {'layout p/s':>11} {'speedup':>8} {'fidelity':>9}")
+    for row in rows:
+        print(
+            f"{row['file'][:32]:<32} {row['size_mb']:>7} {row['fast']['pages_per_s']:>9} "
+            f"{row['layout']['pages_per_s']:>11} {row['speedup']:>7}x {row['fidelity']:>9}"
+        )
+    
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == '__main__':
+    main()
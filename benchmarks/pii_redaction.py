@@ -0,0 +1,133 @@
+"""
+Measure PII redaction throughput.
+
+Compares the single-pass scanner in src.utils.redaction with the previous
+seven-pass re.sub implementation on log-shaped records and on document
+text with and without PII, and checks both produce the same output.
+
+Usage:
+    python -m benchmarks.pii_redaction [--size-mb N] [--repeat N] [--json OUT]
+"""
+import argparse
+import json
+import random
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.corpus import paragraph
+from src.utils.redaction import REDACTED, redact_stream, redact_text
+
+
+# The per-pattern implementation redaction replaced
+LEGACY_PATTERNS = [
+    re.compile(r'password[\"\']?\s*[:=]\s*[\"\'](.*?)[\"\']', re.IGNORECASE),
+    re.compile(r'api[_-]?key[\"\']?\s*[:=]\s*[\"\'](.*?)[\"\']', re.IGNORECASE),
+    re.compile(r'token[\"\']?\s*[:=]\s*[\"\'](.*?)[\"\']', re.IGNORECASE),
+    re.compile(r'secret[\"\']?\s*[:=]\s*[\"\'](.*?)[\"\']', re.IGNORECASE),
+    re.compile(r'credentials[\"\']?\s*[:=]\s*[\"\'](.*?)[\"\']', re.IGNORECASE),
+    re.compile(r'\b\d{3}-\d{2}-\d{4}\b'),
+    re.compile(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'),
+]
+
+PII_SNIPPETS = (
+    'Contact SSN 123-45-6789 for the account.',
+    'Card 4111 1111 1111 1111 was used.',
+    'config password="hunter2" was rotated.',
+    "api_key: 'abc123' must not be shared.",
+)
+
+
+def legacy_redact(text: str) -> str:
+    for pattern in LEGACY_PATTERNS:
+        text = pattern.sub(REDACTED, text)
+    return text
+
+
+def document_text(size_mb: float, pii_every: int, seed: int = 0) -> str:
+    """Policy-like text with dates and section numbers; PII every N paragraphs."""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    index = 0
+    while length < size_mb * 1024 * 1024:
+        text = f"Section {index // 10}.{index % 10} effective 2024-01-{index % 28 + 1:02d}. {paragraph(rng)}"
+        if pii_every and index % pii_every == 0:
+            text += ' ' + rng.choice(PII_SNIPPETS)
+        parts.append(text)
+        length += len(text) + 1
+        index += 1
+    return '\n'.join(parts)
+
+
+def log_strings(count: int, seed: int = 0) -> List[str]:
+    """String values typical of log record data."""
+    rng = random.Random(seed)
+    values = [
+        'policy-read-document', 'agent-123', 'local', 'csv', 'ok',
+        '/mnt/policies/access-control-policy.pdf', 's3://policies/2024/retention.docx',
+        'Document parsed successfully', 'https://intranet.example.com/policies/vendor-risk.xlsx',
+    ]
+    return [rng.choice(values) for _ in range(count)]
+
+
+def throughput(func: Callable[[], Any], size_bytes: int, repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {'median_s': round(median, 4), 'mb_per_s': round(size_bytes / median / (1024 * 1024), 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=float, default=8)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', type=Path, help='Write results as JSON')
+    args = parser.parse_args()
+    
+    cases = {
+        'document_clean': document_text(args.size_mb, pii_every=0),
+        'document_pii': document_text(args.size_mb, pii_every=20),
+    }
+    rows = []
+    for name, text in cases.items():
+        size = len(text.encode())
+        if legacy_redact(text) != redact_text(text):
+            raise SystemExit(f"{name}: outputs differ")
+        chunks = [text[i:i + 65536] for i in range(0, len(text), 65536)]
+        rows.append({
+            'case': name,
+            'size_mb': round(size / (1024 * 1024), 2),
+            'legacy': throughput(lambda: legacy_redact(text), size, args.repeat),
+            'single_pass': throughput(lambda: redact_text(text), size, args.repeat),
+            'stream_64k': throughput(lambda: ''.join(redact_stream(chunks)), size, args.repeat),
+        })
+    
+    values = log_strings(200_000)
+    size = sum(len(v.encode()) for v in values)
+    rows.append({
+        'case': 'log_values',
+        'size_mb': round(size / (1024 * 1024), 2),
+        'legacy': throughput(lambda: [legacy_redact(v) for v in values], size, args.repeat),
+        'single_pass': throughput(lambda: [redact_text(v) for v in values], size, args.repeat),
+    })
+    
+    print(f"{'case':<16} {'MB':>7} {'legacy MB/s':>12} {'single MB/s':>12} {'stream MB/s':>12}")
+    for row in rows:
+        stream = row.get('stream_64k', {}).get('mb_per_s', '-')
+        print(
+            f"{row['case']:<16} {row['size_mb']:>7} {row['legacy']['mb_per_s']:>12} "
+            f"{row['single_pass']['mb_per_s']:>12} {stream:>12}"
+        )
+    
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+"""
+Benchmark parsers and readers on synthetic corpora.
+
+Parser cases parse generated PDFs, DOCX files with tables, tall and wide
+spreadsheets, CSVs and multi-MB text at several sizes. Reader cases fetch
+generated files from local stand-ins for each source: the filesystem, a
+local HTTP server, an in-process S3 mock (requires moto) and a local bare
+git repository.
+
+Each case reports latency percentiles, throughput and peak Python heap
+usage (tracemalloc; memory held by native libraries such as pdfium is
+not included).
+
+Usage:
+    python -m benchmarks.suite [--sizes small,medium] [--formats pdf,csv]
+                               [--sources local,http] [--repeat N]
+                               [--json OUT] [--compare BASELINE.json]
+
+--compare prints the change against an earlier --json run and exits
+non-zero if any case got slower by more than --threshold percent.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from benchmarks.corpus import write_csv, write_docx, write_pdf, write_text, write_xlsx
+from src.services.parsers import parser_registry
+
+
+SIZES = ('small', 'medium', 'large')
+
+# name -> (extension, {size: generator(path)})
+PARSER_CASES: Dict[str, tuple[str, Dict[str, Callable[[Path], Path]]]] = {
+    'pdf': ('.pdf', {
+        'small': lambda p: write_pdf(p, 10),
+        'medium': lambda p: write_pdf(p, 100),
+        'large': lambda p: write_pdf(p, 1000),
+    }),
+    'docx': ('.docx', {
+        'small': lambda p: write_docx(p, 10),
+        'medium': lambda p: write_docx(p, 200),
+        'large': lambda p: write_docx(p, 2000),
+    }),
+    'xlsx-tall': ('.xlsx', {
+        'small': lambda p: write_xlsx(p, 1_000, 10),
+        'medium': lambda p: write_xlsx(p, 20_000, 10),
+        'large': lambda p: write_xlsx(p, 100_000, 10),
+    }),
+    'xlsx-wide': ('.xlsx', {
+        'small': lambda p: write_xlsx(p, 100, 100),
+        'medium': lambda p: write_xlsx(p, 1_000, 200),
+        'large': lambda p: write_xlsx(p, 5_000, 200),
+    }),
+    'csv': ('.csv', {
+        'small': lambda p: write_csv(p, 10_000),
+        'medium': lambda p: write_csv(p, 100_000),
+        'large': lambda p: write_csv(p, 1_000_000),
+    }),
+    'text': ('.txt', {
+        'small': lambda p: write_text(p, 1),
+        'medium': lambda p: write_text(p, 10),
+        'large': lambda p: write_text(p, 100),
+    }),
+}
+
+# Payload fetched by reader cases
+READER_PAYLOAD_MB = {'small': 0.1, 'medium': 5, 'large': 50}
+READER_SOURCES = ('local', 'http', 's3', 'git')
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def measure(func: Callable[[], Any], size_bytes: int, repeat: int) -> Dict[str, Any]:
+    """Time func repeat times, then once more under tracemalloc for peak memory."""
+    func()  # Warm-up: imports, page cache, clones
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    p50 = percentile(timings, 50)
+    return {
+        'size_mb': round(size_bytes / (1024 * 1024), 3),
+        'runs': repeat,
+        'p50_ms': round(p50 * 1000, 2),
+        'p95_ms': round(percentile(timings, 95) * 1000, 2),
+        'p99_ms': round(percentile(timings, 99) * 1000, 2),
+        'mb_per_s': round(size_bytes / (1024 * 1024) / p50, 2) if p50 else None,
+        'peak_mb': round(peak / (1024 * 1024), 2),
+    }
+
+
+def bench_parsers(workdir: Path, formats: List[str], sizes: List[str], repeat: int) -> List[Dict[str, Any]]:
+    rows = []
+    for name in formats:
+        extension, generators = PARSER_CASES[name]
+        parser = parser_registry.get_parser(extension)
+        for size in sizes:
+            path = generators[size](workdir / f"{name}-{size}{extension}")
+            print(f"parser {name:<10} {size:<7}", end=' ', flush=True)
+            result = measure(lambda: parser.parse_sync(path), path.stat().st_size, repeat)
+            print(f"{result['p50_ms']:>10} ms")
+            rows.append({'kind': 'parser', 'name': name, 'size': size, **result})
+            path.unlink()
+    return rows
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_source(root: Path) -> Iterator[Callable[[str], str]]:
+    """Read root's files in place."""
+    yield lambda name: str(root / name)
+
+
+@contextmanager
+def http_source(root: Path) -> Iterator[Callable[[str], str]]:
+    """Serve root over HTTP from a separate process."""
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'http.server', str(port), '--bind', '127.0.0.1', '--directory', str(root)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError('HTTP server did not start')
+                time.sleep(0.05)
+        yield lambda name: f"http://127.0.0.1:{port}/{name}"
+    finally:
+        server.terminate()
+        server.wait()
+
+
+@contextmanager
+def s3_source(root: Path) -> Iterator[Callable[[str], str]]:
+    """Upload root's files to a bucket in an in-process S3 mock."""
+    try:
+        from moto import mock_aws
+    except ImportError:  # moto < 5
+        from moto import mock_s3 as mock_aws
+    import boto3
+    
+    with mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket='bench')
+        for path in root.iterdir():
+            client.upload_file(str(path), 'bench', path.name)
+        yield lambda name: f"s3://bench/{name}"
+
+
+@contextmanager
+def git_source(root: Path, workdir: Path) -> Iterator[Callable[[str], str]]:
+    """Commit root's files to a local bare repository (git://local/bench/corpus)."""
+    bare = workdir / 'remotes' / 'bench' / 'corpus.git'
+    checkout = workdir / 'checkout'
+    git = ['git', '-c', 'user.name=bench', '-c', 'user.email=bench@localhost']
+    subprocess.run(['git', 'init', '-q', '--bare', '-b', 'main', str(bare)], check=True)
+    subprocess.run(['git', 'init', '-q', '-b', 'main', str(checkout)], check=True)
+    for path in root.iterdir():
+        shutil.copy(path, checkout / path.name)
+    subprocess.run(git + ['-C', str(checkout), 'add', '.'], check=True)
+    subprocess.run(git + ['-C', str(checkout), 'commit', '-q', '-m', 'corpus'], check=True)
+    subprocess.run(git + ['-C', str(checkout), 'push', '-q', str(bare), 'main'], check=True)
+    yield lambda name: f"git://local/bench/corpus/main/{name}"
+
+
+def _reader(source: str, workdir: Path):
+    downloads = workdir / 'downloads'
+    if source == 'local':
+        from src.services.readers.local_reader import LocalReader
+        return LocalReader(downloads)
+    if source == 'http':
+        from src.services.readers.http_reader import HTTPReader
+        return HTTPReader(downloads)
+    if source == 's3':
+        from src.services.readers.s3_reader import S3Reader
+        return S3Reader(downloads)
+    from src.services.readers.git_reader import GitReader
+    return GitReader(downloads, remote_template=f"file://{workdir}/remotes/{{org}}/{{repo}}.git")
+
+
+def bench_readers(workdir: Path, sources: List[str], sizes: List[str], repeat: int) -> List[Dict[str, Any]]:
+    corpus = workdir / 'corpus'
+    corpus.mkdir()
+    files = {size: write_text(corpus / f"payload-{size}.txt", READER_PAYLOAD_MB[size]) for size in sizes}
+    credentials = {'access_key_id': 'bench', 'secret_access_key': 'bench', 'region': 'us-east-1'}
+    loop = asyncio.new_event_loop()
+    rows = []
+    
+    for source in sources:
+        if source == 'local':
+            context = local_source(corpus)
+        elif source == 'http':
+            context = http_source(corpus)
+        elif source == 's3':
+            context = s3_source(corpus)
+        else:
+            context = git_source(corpus, workdir)
+        
+        try:
+            with context as uri_for:
+                reader = _reader(source, workdir)
+                for size, path in files.items():
+                    uri = uri_for(path.name)
+                    print(f"reader {source:<10} {size:<7}", end=' ', flush=True)
+                    result = measure(
+                        lambda: loop.run_until_complete(reader.read_file(uri, credentials)),
+                        path.stat().st_size, repeat
+                    )
+                    print(f"{result['p50_ms']:>10} ms")
+                    rows.append({'kind': 'reader', 'name': source, 'size': size, **result})
+        except ImportError as e:
+            print(f"reader {source:<10} skipped ({e})")
+    
+    loop.close()
+    return rows
+
+
+def compare(rows: List[Dict[str, Any]], baseline_path: Path, threshold: float) -> bool:
+    """Print p50 changes against a baseline run; True if nothing regressed."""
+    baseline = {
+        (row['kind'], row['name'], row['size']): row
+        for row in json.loads(baseline_path.read_text())['results']
+    }
+    ok = True
+    print(f"\n{'case':<28} {'base ms':>10} {'now ms':>10} {'change':>8}")
+    for row in rows:
+        before = baseline.get((row['kind'], row['name'], row['size']))
+        if before is None or not before['p50_ms']:
+            continue
+        change = (row['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100
+        regressed = change > threshold
+        ok = ok and not regressed
+        label = f"{row['kind']} {row['name']} {row['size']}"
+        print(
+            f"{label:<28} {before['p50_ms']:>10} {row['p50_ms']:>10} {change:>+7.1f}%"
+            + ('  REGRESSION' if regressed else '')
+        )
+    return ok
+
+
+def _metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+
+
+def _csv_list(choices: tuple[str, ...]) -> Callable[[str], List[str]]:
+    def parse(value: str) -> List[str]:
+        items = [item for item in value.split(',') if item]
+        unknown = set(items) - set(choices)
+        if unknown:
+            raise argparse.ArgumentTypeError(f"unknown: {', '.join(sorted(unknown))}")
+        return items
+    return parse
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=_csv_list(SIZES), default=['small', 'medium'])
+    parser.add_argument('--formats', type=_csv_list(tuple(PARSER_CASES)), default=list(PARSER_CASES))
+    parser.add_argument('--sources', type=_csv_list(READER_SOURCES), default=list(READER_SOURCES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', type=Path, help='Write results as JSON')
+    parser.add_argument('--compare', type=Path, help='Baseline JSON from an earlier run')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Regression threshold in percent')
+    args = parser.parse_args()
+    
+    # Per-call INFO logs from readers and parsers would dominate the output
+    logging.getLogger('policy-reader').setLevel(logging.WARNING)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        rows = bench_parsers(workdir, args.formats, args.sizes, args.repeat)
+        rows += bench_readers(workdir, args.sources, args.sizes, args.repeat)
+    
+    print(f"\n{'case':<28} {'MB':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'MB/s':>8} {'peak MB':>8}")
+    for row in rows:
+        label = f"{row['kind']} {row['name']} {row['size']}"
+        print(
+            f"{label:<28} {row['size_mb']:>8} {row['p50_ms']:>9} {row['p95_ms']:>9} "
+            f"{row['p99_ms']:>9} {row['mb_per_s']:>8} {row['peak_mb']:>8}"
+        )
+    
+    if args.json:
+        args.json.write_text(json.dumps({'meta': _metadata(), 'results': rows}, indent=2))
+    
+    if args.compare and not compare(rows, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
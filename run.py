@@ -1,39 +1,354 @@
-"""Multi-process server runner."""
+"""
+Multi-process server runner.
+
+The supervisor imports the application and the enabled readers and parsers
+once, freezes the garbage collector and forks the workers, so their code and
+preloaded libraries are shared copy-on-write. All workers accept on one
+listening socket that the supervisor holds, so restarting a worker never
+refuses connections.
+
+- Workers are recycled after worker_max_requests requests (plus jitter) or
+  when their RSS exceeds worker_max_rss_mb; a replacement is started before
+  an RSS-recycled worker is stopped.
+- SIGHUP replaces all workers one at a time (zero-downtime restart).
+- SIGTERM/SIGINT stop the workers gracefully, then the supervisor.
+- Workers or the metrics exporter that exit are restarted, with backoff when
+  they keep crashing on startup.
+"""
+import asyncio
+import gc
+import os
+import random
+import select
+import shutil
+import signal
+import socket
+import threading
+import time
 import uvicorn
-import multiprocessing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
 from src.config import settings
 
+# Supervisor loop period
+TICK_SECONDS = 0.5
+# How often worker RSS is checked against worker_max_rss_mb
+RSS_CHECK_SECONDS = 5.0
+# Longest a new worker may take to start serving
+WORKER_BOOT_TIMEOUT = 30.0
+# Workers exiting sooner than this after starting count as crashes
+MIN_UPTIME_SECONDS = 5.0
+MAX_RESPAWN_BACKOFF = 30.0
+LISTEN_BACKLOG = 2048
 
-def run_main_server():
-    """Run main application server."""
-    uvicorn.run(
-        "src.main:app",
-        host=settings.server_host,
-        port=settings.server_port,
-        workers=settings.server_workers,
-        log_level=settings.log_level.lower(),
-        reload=False
-    )
+
+def prepare_metrics_dir():
+    """
+    Point all processes at a fresh shared Prometheus directory.
+    
+    Must run before any process imports prometheus_client; workers and the
+    exporter inherit the environment variable.
+    """
+    metrics_dir = Path(settings.metrics_multiproc_dir)
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = str(metrics_dir)
+
+
+def preload():
+    """Import the application and everything workers would import lazily."""
+    from src.main import app
+    from src.services.parsers import parser_registry
+    from src.services.readers import reader_registry
+    
+    reader_registry.preload()
+    parser_registry.preload()
+    
+    # Keep the collector from touching (and so un-sharing) preloaded objects
+    gc.collect()
+    gc.freeze()
+    return app
 
 
 def run_metrics_server():
     """Run metrics exporter server."""
-    if not settings.metrics_enabled:
-        return
+    from prometheus_client import start_http_server
+    from src.utils.logger import logger
+    from src.utils.metrics import metrics_registry
     
-    # TODO: Implement metrics exporter
-    print(f"Metrics server would run on port {settings.metrics_port}")
+    tls = {}
+    if settings.metrics_tls_enabled:
+        if Path(settings.metrics_cert_path).exists() and Path(settings.metrics_key_path).exists():
+            tls = {'certfile': settings.metrics_cert_path, 'keyfile': settings.metrics_key_path}
+        else:
+            logger.warning(
+                "Metrics TLS enabled but certificate/key not found; serving plain HTTP",
+                extra={'data': {'cert_path': settings.metrics_cert_path}}
+            )
+    
+    start_http_server(
+        settings.metrics_port,
+        addr=settings.server_host,
+        registry=metrics_registry(),
+        **tls
+    )
+    logger.info(f"Metrics exporter listening on port {settings.metrics_port}")
+    
+    # Exporter runs in a daemon thread; keep the process alive
+    threading.Event().wait()
 
 
-if __name__ == "__main__":
-    # Start main server
-    main_process = multiprocessing.Process(target=run_main_server)
-    main_process.start()
+async def serve_worker(server: uvicorn.Server, sock: socket.socket, ready_fd: int):
+    """Serve on the shared socket, telling the supervisor once accepting."""
+    serving = asyncio.ensure_future(server.serve(sockets=[sock]))
+    while not server.started and not serving.done():
+        await asyncio.sleep(0.01)
+    if server.started:
+        os.write(ready_fd, b'1')
+    os.close(ready_fd)
+    await serving
+
+
+def run_worker(app, sock: socket.socket, ready_fd: int, max_requests: Optional[int]):
+    """Worker process body: a uvicorn server on the inherited socket."""
+    config = uvicorn.Config(
+        app,
+        log_level=settings.log_level.lower(),
+        limit_max_requests=max_requests,
+        timeout_graceful_shutdown=settings.worker_graceful_timeout_seconds,
+    )
+    asyncio.run(serve_worker(uvicorn.Server(config), sock, ready_fd))
+
+
+def process_rss(pid: int) -> Optional[int]:
+    """RSS of another process in bytes."""
+    try:
+        with open(f"/proc/{pid}/statm", 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+@dataclass
+class Worker:
+    """A forked worker process."""
+    pid: int
+    started: float
+    ready_fd: int
+    retiring: bool = False
+    kill_at: float = 0.0
+
+
+class Supervisor:
+    """Forks, watches and replaces worker processes and the metrics exporter."""
+    
+    def __init__(self, app, sock: socket.socket):
+        from src.utils.logger import logger
+        self.app = app
+        self.sock = sock
+        self.logger = logger
+        self.workers: Dict[int, Worker] = {}
+        self.metrics_pid: Optional[int] = None
+        self.metrics_restart_at = 0.0
+        self.stopping = False
+        self.restart_requested = False
+        self.backoff = 0.0
+        self.next_spawn_at = 0.0
+        self.next_rss_check = 0.0
+    
+    def _fork(self, target, *args) -> int:
+        """Fork a child running target; the child never returns."""
+        pid = os.fork()
+        if pid:
+            return pid
+        
+        code = 0
+        try:
+            for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+                signal.signal(sig, signal.SIG_DFL)
+            # The supervisor handles hangups; workers shut down on SIGTERM/SIGINT
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            for worker in self.workers.values():
+                os.close(worker.ready_fd)
+            target(*args)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except KeyboardInterrupt:
+            pass
+        except BaseException as e:
+            code = 1
+            self.logger.exception(f"Process {os.getpid()} failed: {e}")
+        finally:
+            from src.utils.logger import stop_log_listener
+            stop_log_listener()
+            os._exit(code)
+    
+    def spawn_worker(self) -> Worker:
+        max_requests = None
+        if settings.worker_max_requests:
+            max_requests = settings.worker_max_requests + random.randint(0, settings.worker_max_requests_jitter)
+        
+        ready_r, ready_w = os.pipe()
+        pid = self._fork(self._worker_main, ready_r, ready_w, max_requests)
+        os.close(ready_w)
+        worker = Worker(pid=pid, started=time.monotonic(), ready_fd=ready_r)
+        self.workers[pid] = worker
+        self.logger.info(f"Started worker {pid}", extra={'data': {'max_requests': max_requests}})
+        return worker
+    
+    def _worker_main(self, ready_r: int, ready_w: int, max_requests: Optional[int]):
+        os.close(ready_r)
+        run_worker(self.app, self.sock, ready_w, max_requests)
+    
+    def spawn_metrics(self):
+        self.metrics_pid = self._fork(run_metrics_server)
+    
+    def wait_ready(self, worker: Worker, timeout: float = WORKER_BOOT_TIMEOUT) -> bool:
+        """Wait for a new worker to start accepting connections."""
+        readable, _, _ = select.select([worker.ready_fd], [], [], timeout)
+        return bool(readable) and os.read(worker.ready_fd, 1) == b'1'
     
-    # Start metrics server if enabled
-    if settings.metrics_enabled:
-        metrics_process = multiprocessing.Process(target=run_metrics_server)
-        metrics_process.start()
+    def retire(self, worker: Worker, reason: str):
+        """Ask a worker to finish its in-flight requests and exit."""
+        if worker.retiring:
+            return
+        worker.retiring = True
+        worker.kill_at = time.monotonic() + settings.worker_graceful_timeout_seconds + 5
+        self.logger.info(f"Stopping worker {worker.pid}: {reason}")
+        try:
+            os.kill(worker.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    
+    def replace(self, worker: Worker, reason: str) -> bool:
+        """Start a replacement and stop worker once the replacement is serving."""
+        replacement = self.spawn_worker()
+        if not self.wait_ready(replacement):
+            self.logger.error(f"Replacement for worker {worker.pid} did not start; keeping the old worker")
+            self.retire(replacement, 'failed to start')
+            return False
+        self.retire(worker, reason)
+        return True
+    
+    def reap(self):
+        """Collect exited children and kill workers that overran their graceful timeout."""
+        from prometheus_client import multiprocess
+        
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            code = os.waitstatus_to_exitcode(status)
+            
+            if pid == self.metrics_pid:
+                self.metrics_pid = None
+                if not self.stopping:
+                    self.metrics_restart_at = time.monotonic() + MIN_UPTIME_SECONDS
+                    self.logger.warning(f"Metrics exporter {pid} exited ({code}); restarting")
+                continue
+            
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                continue
+            os.close(worker.ready_fd)
+            # Drop the worker's live gauges from the aggregated metrics
+            multiprocess.mark_process_dead(pid)
+            if worker.retiring or self.stopping:
+                continue
+            
+            uptime = time.monotonic() - worker.started
+            if code == 0:
+                self.logger.info(f"Worker {pid} exited after reaching its request limit")
+            elif uptime < MIN_UPTIME_SECONDS:
+                self.backoff = min(max(self.backoff * 2, 1.0), MAX_RESPAWN_BACKOFF)
+                self.next_spawn_at = time.monotonic() + self.backoff
+                self.logger.error(f"Worker {pid} crashed on startup ({code}); respawning in {self.backoff:.0f}s")
+            else:
+                self.logger.error(f"Worker {pid} died ({code}); respawning")
+            if uptime >= MIN_UPTIME_SECONDS:
+                self.backoff = 0.0
+        
+        now = time.monotonic()
+        for worker in self.workers.values():
+            if worker.retiring and now > worker.kill_at:
+                self.logger.warning(f"Worker {worker.pid} overran its graceful timeout; killing")
+                try:
+                    os.kill(worker.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                worker.kill_at = float('inf')
+    
+    def maintain(self):
+        """Keep server_workers workers and the metrics exporter running."""
+        if settings.metrics_enabled and self.metrics_pid is None and time.monotonic() >= self.metrics_restart_at:
+            self.spawn_metrics()
+        active = sum(1 for w in self.workers.values() if not w.retiring)
+        while active < settings.server_workers and time.monotonic() >= self.next_spawn_at:
+            self.spawn_worker()
+            active += 1
+    
+    def check_rss(self):
+        """Replace workers whose RSS is over worker_max_rss_mb."""
+        if not settings.worker_max_rss_mb or time.monotonic() < self.next_rss_check:
+            return
+        self.next_rss_check = time.monotonic() + RSS_CHECK_SECONDS
+        limit = settings.worker_max_rss_mb * 1024 * 1024
+        for worker in list(self.workers.values()):
+            rss = process_rss(worker.pid)
+            if not worker.retiring and rss is not None and rss > limit:
+                self.replace(worker, f"RSS {rss // (1024 * 1024)} MB over {settings.worker_max_rss_mb} MB")
+    
+    def rolling_restart(self):
+        """Replace every current worker, one at a time."""
+        self.restart_requested = False
+        self.logger.info("Restarting workers")
+        for worker in [w for w in self.workers.values() if not w.retiring]:
+            if self.stopping or not self.replace(worker, 'restart'):
+                break
+            self.reap()
+    
+    def shutdown(self):
+        """Stop all children gracefully, killing any that overrun."""
+        self.logger.info("Shutting down")
+        for worker in list(self.workers.values()):
+            self.retire(worker, 'shutdown')
+        if self.metrics_pid is not None:
+            os.kill(self.metrics_pid, signal.SIGTERM)
+        while self.workers or self.metrics_pid is not None:
+            self.reap()
+            time.sleep(0.1)
+    
+    def run(self):
+        def stop(signum, frame):
+            self.stopping = True
+        
+        def restart(signum, frame):
+            self.restart_requested = True
+        
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGHUP, restart)
+        
+        self.logger.info(
+            f"Supervisor {os.getpid()} serving on {settings.server_host}:{settings.server_port}",
+            extra={'data': {'workers': settings.server_workers}}
+        )
+        while not self.stopping:
+            self.reap()
+            self.maintain()
+            if self.restart_requested:
+                self.rolling_restart()
+            self.check_rss()
+            time.sleep(TICK_SECONDS)
+        self.shutdown()
+
+
+if __name__ == "__main__":
+    prepare_metrics_dir()
     
-    # Wait for processes
-    main_process.join()
+    sock = socket.create_server((settings.server_host, settings.server_port), backlog=LISTEN_BACKLOG)
+    Supervisor(preload(), sock).run()
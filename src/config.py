@@ -1,5 +1,5 @@
 """Configuration management using Pydantic settings."""
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -18,6 +18,14 @@ class Settings(BaseSettings):
     server_host: str = Field(default="0.0.0.0", description="Server bind host")
     server_port: int = Field(default=8000, ge=1024, le=65535)
     server_workers: int = Field(default=4, ge=1, le=32)
+    worker_max_requests: int = Field(default=5000, ge=0, description="Recycle a worker after this many requests (0 = never)")
+    worker_max_requests_jitter: int = Field(
+        default=500, ge=0, description="Random extra requests per worker, so workers do not recycle together"
+    )
+    worker_max_rss_mb: int = Field(default=4096, ge=0, description="Recycle a worker whose RSS exceeds this (0 = never)")
+    worker_graceful_timeout_seconds: float = Field(
+        default=30.0, gt=0, description="Time a stopping worker gets to finish in-flight requests"
+    )
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
     
     # Security
@@ -25,6 +33,16 @@ class Settings(BaseSettings):
     secret_endpoint: str = Field(default="http://localhost:8200")
     vault_role: str = "policy-reader"
     vault_token: Optional[str] = None
+    vault_auth_mount: str = Field(default="kubernetes", description="Auth method used when no vault_token is set")
+    vault_kv_mount: str = Field(
+        default="secret",
+        description="KV v2 mount credentials paths are read from ('' to read paths as-is, e.g. dynamic secrets)"
+    )
+    vault_k8s_token_path: str = "/var/run/secrets/kubernetes.io/serviceaccount/token"
+    secret_timeout_seconds: float = Field(default=5.0, gt=0)
+    credentials_cache_ttl_seconds: int = Field(
+        default=300, ge=1, description="How long secrets without a lease are cached before re-reading"
+    )
     
     # Authentication
     auth_enabled: bool = True
@@ -36,6 +54,37 @@ class Settings(BaseSettings):
     rate_limit_enabled: bool = True
     rate_limit_per_minute: int = Field(default=100, ge=1)
     rate_limit_burst: int = Field(default=20, ge=1)
+    rate_limit_state_dir: str = Field(
+        default="/tmp/policy-reader/ratelimit",
+        description="Host-local directory for limiter state shared by all workers"
+    )
+    max_concurrent_requests: int = Field(default=32, ge=0, description="Tool calls executing at once per host (0 = unlimited)")
+    max_queued_requests: int = Field(default=64, ge=0, description="Tool calls waiting for a slot per worker")
+    queue_timeout_seconds: float = Field(default=10.0, gt=0, description="Longest a queued tool call waits for a slot")
+    
+    # Deadlines and cancellation
+    request_timeout_seconds: float = Field(
+        default=120.0, gt=0, description="Deadline of a tool call when the client does not send X-Request-Timeout"
+    )
+    max_request_timeout_seconds: float = Field(default=600.0, gt=0, description="Longest deadline a client may ask for")
+    parse_subprocess_enabled: bool = True
+    parse_subprocess_min_mb: float = Field(
+        default=8.0, ge=0, description="Parse documents at least this large in a child process killed on cancellation"
+    )
+    
+    # Response compression
+    compression_enabled: bool = True
+    compression_min_bytes: int = Field(
+        default=4096, ge=0, description="Smallest tool response body compressed when the client accepts gzip/zstd"
+    )
+    
+    # MCP transport (POST /mcp and stdio)
+    mcp_session_ttl_seconds: int = Field(default=3600, ge=60, description="Idle time before an MCP session expires")
+    mcp_session_dir: str = Field(
+        default="/tmp/policy-reader/mcp-sessions",
+        description="Host-local directory for MCP sessions shared by all workers"
+    )
+    mcp_max_batch_size: int = Field(default=50, ge=1, description="Most JSON-RPC messages in one batch")
     
     # Metrics
     metrics_enabled: bool = True
@@ -43,6 +92,10 @@ class Settings(BaseSettings):
     metrics_tls_enabled: bool = True
     metrics_cert_path: str = "certs/metrics/exporter.crt"
     metrics_key_path: str = "certs/metrics/exporter.key"
+    metrics_multiproc_dir: str = Field(
+        default="/tmp/policy-reader/metrics",
+        description="Shared directory where workers write Prometheus samples"
+    )
     
     # Document Sources
     smb_enabled: bool = True
@@ -60,17 +113,94 @@ class Settings(BaseSettings):
     azure_blob_enabled: bool = True
     azure_credentials_path: str = "azure/blob-reader"
     
+    # Remote reader timeouts, retries and hedging
+    http_connect_timeout_seconds: float = Field(default=5.0, gt=0)
+    http_read_timeout_seconds: float = Field(default=30.0, gt=0, description="Longest wait for the next chunk")
+    s3_connect_timeout_seconds: float = Field(default=5.0, gt=0)
+    s3_read_timeout_seconds: float = Field(default=30.0, gt=0)
+    smb_connect_timeout_seconds: float = Field(default=10.0, gt=0)
+    smb_read_timeout_seconds: float = Field(default=30.0, gt=0, description="Longest an SMB transfer may stall")
+    git_read_timeout_seconds: int = Field(default=30, ge=1, description="Abort git transfers slower than 1 KB/s for this long")
+    git_operation_timeout_seconds: float = Field(default=300.0, gt=0, description="Kill clones/pulls running longer")
+    reader_retry_attempts: int = Field(default=3, ge=1, description="Attempts per read, including the first")
+    reader_retry_base_delay_seconds: float = Field(default=0.2, ge=0)
+    reader_retry_max_delay_seconds: float = Field(default=5.0, ge=0)
+    reader_hedge_enabled: bool = Field(default=False, description="Send a second HTTP/S3 GET when the first is slow")
+    reader_hedge_percentile: float = Field(
+        default=95.0, gt=0, lt=100, description="Latency percentile of recent reads after which to hedge"
+    )
+    reader_hedge_min_delay_ms: int = Field(default=50, ge=0)
+    circuit_failure_threshold: int = Field(
+        default=5, ge=1, description="Consecutive connection failures before a host's circuit opens"
+    )
+    circuit_reset_seconds: float = Field(default=30.0, gt=0, description="How long an open circuit fails fast before probing")
+    not_found_cache_seconds: float = Field(default=30.0, ge=0, description="How long missing documents are remembered (0 = off)")
+    
     # Document Processing
     max_document_size_mb: int = Field(default=100, ge=1, le=500)
     cache_enabled: bool = True
     cache_ttl_seconds: int = Field(default=3600, ge=60)
+    cache_dir: str = Field(default="/tmp/policy-reader/cache", description="Host-local parsed document cache shared by workers")
+    cache_max_memory_mb: int = Field(default=256, ge=1, description="In-process cache size per worker")
+    cache_max_disk_mb: int = Field(default=2048, ge=1)
+    
+    # Prefetch
+    prefetch_enabled: bool = False
+    prefetch_sources: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Locations to keep warm, mapped to their credentials path ('' for none)"
+    )
+    prefetch_interval_seconds: int = Field(default=300, ge=10)
+    prefetch_concurrency_per_source: int = Field(default=2, ge=1)
+    prefetch_cpu_budget: float = Field(
+        default=0.25, gt=0, le=1, description="Fraction of one core the prefetcher may spend parsing"
+    )
+    pdf_engine: Literal["fast", "layout"] = Field(
+        default="layout",
+        description="layout: pdfplumber layout analysis; fast: pdfium text-only extraction"
+    )
+    excel_max_cells: int = Field(default=1_000_000, ge=1, description="Cell budget per workbook parse")
+    
+    # Parse scheduling (per worker; lanes by size weighted by format)
+    parse_slots: int = Field(default=0, ge=0, description="Parses run at once per worker (0 = CPU count)")
+    parse_small_lane_max_mb: float = Field(default=1.0, gt=0, description="Weighted size up to which a parse is small")
+    parse_large_lane_min_mb: float = Field(default=32.0, gt=0, description="Weighted size from which a parse is large")
+    parse_large_lane_slots: int = Field(
+        default=0, ge=0, description="Slots large parses may hold at once (0 = half of parse_slots)"
+    )
+    
+    # Memory
+    worker_memory_budget_mb: int = Field(
+        default=2048, ge=64, description="Estimated parse memory admitted at once per worker"
+    )
+    memory_wait_seconds: float = Field(default=10.0, gt=0, description="Longest a parse waits for memory budget")
+    rss_sample_interval_ms: int = Field(default=50, ge=5, description="RSS sampling period while requests run")
+    tracemalloc_enabled: bool = Field(
+        default=False, description="Trace Python allocations for /debug/memory (slows workers down)"
+    )
+    tracemalloc_frames: int = Field(default=1, ge=1, le=50, description="Stack frames kept per traced allocation")
+    debug_endpoints_enabled: bool = False
     
     # Logging
     log_format: Literal["json", "text"] = "json"
     log_rotation: Literal["daily", "hourly", "size"] = "daily"
     log_retention_days: int = Field(default=365, ge=1)
+    log_max_bytes: int = Field(default=100 * 1024 * 1024, ge=1024, description="Rotation size when log_rotation=size")
+    log_queue_size: int = Field(default=10000, ge=100, description="Buffered log records before dropping")
     audit_log_enabled: bool = True
     pii_redaction_enabled: bool = True
+    pii_redact_document_content: bool = Field(
+        default=False,
+        description="Also redact PII from parsed document content (requires pii_redaction_enabled)"
+    )
+    
+    # Tracing
+    tracing_exporter: Literal["none", "file", "otlp"] = Field(
+        default="none",
+        description="Export request spans as OpenTelemetry spans to a file or an OTLP/HTTP collector"
+    )
+    tracing_file_path: str = "logs/traces.jsonl"
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
 
 
 # Global settings instance
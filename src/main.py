@@ -1,12 +1,41 @@
 """FastAPI application."""
-from fastapi import FastAPI, HTTPException, Header
+import time
+_IMPORT_START = time.perf_counter()
+
+import asyncio
+import math
+import os
+from fastapi import FastAPI, HTTPException, Header, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Awaitable, Dict, Any, Optional, TypeVar
 from src.config import settings
 from src.tools import tool_registry
+from src.mcp.server import (
+    INVALID_REQUEST, PARSE_ERROR, error_response, has_requests, is_initialize, mcp_server, wants_progress
+)
+from src.mcp.sessions import Session, mcp_sessions
+from src.services.parsers import parser_registry
+from src.services.parsers.isolation import start_fork_server
+from src.services.memory_budget import memory_budget
+from src.services.prefetch import prefetcher
+from src.services.readers import reader_registry
+from src.services.rate_limiter import admission_controller
+from src.utils.deadline import deadline_scope
+from src.utils.errors import RateLimitError, RequestCancelledError, ServiceOverloadedError
+from src.utils.identity import agent_id_from_request
 from src.utils.logger import logger
+from src.utils.memory import TRACEMALLOC_GROUPINGS, current_rss, start_tracemalloc, top_allocations
+from src.utils.serialization import dumps, loads, tool_response
+from src.utils.metrics import IN_FLIGHT, TOOL_CALLS, TOOL_LATENCY, render_metrics
+from src.utils.tracing import request_trace, span
 
+IMPORT_TIME_MS = (time.perf_counter() - _IMPORT_START) * 1000
+
+T = TypeVar('T')
+# Response status for calls whose client went away (nothing receives it)
+CLIENT_CLOSED_REQUEST = 499
 
 app = FastAPI(
     title="Policy Document Reader MCP Server",
@@ -24,6 +53,48 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def report_startup():
+    """Log import timing and which sources/formats are enabled."""
+    logger.info(
+        f"Application imported in {IMPORT_TIME_MS:.1f} ms",
+        extra={'data': {
+            'enabled_protocols': reader_registry.enabled_protocols(),
+            'supported_formats': parser_registry.supported_formats(),
+            'preloaded_modules': {
+                **reader_registry.import_timings,
+                **parser_registry.import_timings,
+            },
+        }}
+    )
+
+
+@app.on_event("startup")
+async def start_memory_tracing():
+    """Trace allocations for /debug/memory when tracemalloc_enabled."""
+    start_tracemalloc()
+
+
+@app.on_event("startup")
+async def start_parse_fork_server():
+    """Start the process that large parses are forked from."""
+    if settings.parse_subprocess_enabled:
+        await asyncio.to_thread(start_fork_server)
+
+
+@app.on_event("startup")
+async def start_prefetch():
+    """Start the background prefetcher for configured sources."""
+    if settings.prefetch_enabled and settings.cache_enabled:
+        prefetcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_prefetch():
+    """Stop the background prefetcher."""
+    await prefetcher.stop()
+
+
 class ToolCallRequest(BaseModel):
     """Tool call request."""
     name: str
@@ -52,39 +123,214 @@ async def list_tools():
     return {"tools": tools}
 
 
+async def _wait_for_disconnect(http_request: Request):
+    """Return once the client has closed the connection (the request body must already be read)."""
+    while (await http_request.receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def _unless_disconnected(http_request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await awaitable, cancelling it if the client disconnects first.
+    
+    Raises:
+        RequestCancelledError: The client disconnected
+    """
+    task = asyncio.ensure_future(awaitable)
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(http_request))
+    try:
+        await asyncio.wait({task, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    finally:
+        disconnected.cancel()
+    if not task.done():
+        # Let downloads and parses unwind before the admission slot is released
+        task.cancel()
+        await asyncio.wait({task})
+        raise RequestCancelledError("Client disconnected")
+    return task.result()
+
+
 @app.post("/api/v1/tools/call")
 async def call_tool(
     request: ToolCallRequest,
-    authorization: Optional[str] = Header(None)
+    http_request: Request,
+    authorization: Optional[str] = Header(None),
+    x_request_timeout: Optional[float] = Header(None, gt=0)
 ):
     """
     Execute an MCP tool.
     
-    Security:
-        - Requires JWT token in Authorization header
-        - Agent ID extracted from token
+    The call runs under a deadline of X-Request-Timeout seconds (capped at
+    max_request_timeout_seconds), or request_timeout_seconds without it, and
+    is cancelled if the client disconnects.
+    
+    The agent id, which keys the rate limit, is the client address until
+    bearer tokens are verified (see src/utils/identity.py).
     """
+    # Unknown tool names share one label value to bound cardinality
+    tool_label = request.name if tool_registry.get_tool(request.name) else 'unknown'
+    
+    agent_id = agent_id_from_request(authorization, http_request.client and http_request.client.host)
+    
+    # Over-limit calls are rejected here, before any work is done
+    ticket = await admission_controller.admit(agent_id)
+    
+    start = time.perf_counter()
+    IN_FLIGHT.inc()
     try:
-        # Extract agent ID from JWT (simplified)
-        agent_id = "agent-123"  # TODO: Extract from JWT token
-        
         logger.info(
             f"Tool call: {request.name}",
             extra={'data': {'agent_id': agent_id}}
         )
         
-        # Execute tool
-        result = await tool_registry.execute_tool(
-            request.name,
-            request.arguments,
-            agent_id
-        )
+        with request_trace(request.name, agent_id), deadline_scope(x_request_timeout):
+            # Execute tool
+            result = await _unless_disconnected(http_request, tool_registry.execute_tool(
+                request.name,
+                request.arguments,
+                agent_id
+            ))
+            
+            with span('serialize'):
+                response = await tool_response(result, http_request.headers.get('accept-encoding'))
         
-        return result
+        TOOL_CALLS.labels(tool=tool_label, status=result.get('status', 'unknown')).inc()
+        return response
+    
+    except RequestCancelledError:
+        TOOL_CALLS.labels(tool=tool_label, status='cancelled').inc()
+        logger.info(f"Client disconnected; cancelled tool call {request.name}")
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
         
     except Exception as e:
+        TOOL_CALLS.labels(tool=tool_label, status='exception').inc()
         logger.error(f"Tool execution failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    finally:
+        admission_controller.release(ticket)
+        IN_FLIGHT.dec()
+        TOOL_LATENCY.labels(tool=tool_label).observe(time.perf_counter() - start)
+
+
+def _ignore_notification(message: Dict[str, Any]):
+    """Send for plain JSON responses, which cannot carry notifications."""
+
+
+async def _mcp_events(payload: Any, session: Session, timeout: Optional[float]):
+    """SSE stream of the notifications for payload, then its response."""
+    queue: asyncio.Queue = asyncio.Queue()
+    # The stream is sent after the endpoint returned, so its deadline is set here
+    with deadline_scope(timeout):
+        task = asyncio.ensure_future(mcp_server.handle(payload, session, queue.put_nowait))
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+    try:
+        while (message := await queue.get()) is not None:
+            yield b'event: message\ndata: ' + dumps(message) + b'\n\n'
+        if task.result() is not None:
+            yield b'event: message\ndata: ' + dumps(task.result()) + b'\n\n'
+    finally:
+        # Client disconnected before the response was ready
+        task.cancel()
+
+
+@app.post("/mcp")
+async def mcp_endpoint(
+    http_request: Request,
+    mcp_session_id: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None),
+    x_request_timeout: Optional[float] = Header(None, gt=0)
+):
+    """
+    MCP streamable HTTP transport (JSON-RPC 2.0).
+    
+    'initialize' opens a session whose id is returned in the Mcp-Session-Id
+    header; later requests send it back. The session's agent id comes from
+    the initialize request, as for POST /api/v1/tools/call, and later
+    Authorization headers are not read. Bodies may be JSON-RPC batches,
+    executed concurrently. When a tool call asks for progress and the client
+    accepts text/event-stream, the response is an SSE stream of progress
+    notifications ending with the JSON-RPC response. Tool calls get the same
+    deadline and disconnect handling as POST /api/v1/tools/call.
+    """
+    try:
+        payload = loads(await http_request.body())
+    except ValueError:
+        return JSONResponse(status_code=400, content=error_response(None, PARSE_ERROR, 'Parse error'))
+    
+    initializing = is_initialize(payload)
+    if initializing:
+        session = mcp_sessions.new(
+            agent_id_from_request(authorization, http_request.client and http_request.client.host)
+        )
+    elif not mcp_session_id:
+        return JSONResponse(
+            status_code=400,
+            content=error_response(None, INVALID_REQUEST, 'Missing Mcp-Session-Id header')
+        )
+    else:
+        session = mcp_sessions.get(mcp_session_id)
+        if session is None:
+            return JSONResponse(
+                status_code=404,
+                content=error_response(None, INVALID_REQUEST, 'Unknown or expired session')
+            )
+    headers = {'Mcp-Session-Id': session.session_id}
+    
+    if not has_requests(payload):
+        await mcp_server.handle(payload, session, _ignore_notification)
+        return Response(status_code=202, headers=headers)
+    
+    if not initializing and wants_progress(payload) and 'text/event-stream' in http_request.headers.get('accept', ''):
+        return StreamingResponse(
+            _mcp_events(payload, session, x_request_timeout),
+            media_type='text/event-stream',
+            headers={**headers, 'Cache-Control': 'no-cache'}
+        )
+    
+    try:
+        with deadline_scope(x_request_timeout):
+            result = await _unless_disconnected(
+                http_request, mcp_server.handle(payload, session, _ignore_notification)
+            )
+    except RequestCancelledError:
+        logger.info(f"Client disconnected; cancelled MCP request")
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    if result is None:
+        # Every request in the payload was cancelled by the client
+        return Response(status_code=202, headers=headers)
+    if initializing:
+        if 'result' not in result:
+            return JSONResponse(content=result)
+        mcp_sessions.save(session)
+    
+    response = await tool_response(result, http_request.headers.get('accept-encoding'))
+    response.headers.update(headers)
+    return response
+
+
+@app.delete("/mcp")
+async def mcp_close_session(mcp_session_id: Optional[str] = Header(None)):
+    """End an MCP session."""
+    if not mcp_session_id or not mcp_sessions.close(mcp_session_id):
+        raise HTTPException(status_code=404, detail="Unknown or expired session")
+    return Response(status_code=204)
+
+
+@app.exception_handler(RateLimitError)
+@app.exception_handler(ServiceOverloadedError)
+async def admission_rejected(request: Request, exc: Exception):
+    """Fast 429/503 with Retry-After for calls rejected by admission control."""
+    status_code = 429 if isinstance(exc, RateLimitError) else 503
+    retry_after = max(1, math.ceil(exc.details.get('retry_after', 1)))
+    return JSONResponse(
+        status_code=status_code,
+        content={'status': 'error', 'error': exc.message, 'retry_after': retry_after},
+        headers={'Retry-After': str(retry_after)}
+    )
 
 
 @app.get("/health")
@@ -93,11 +339,31 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/debug/memory")
+async def debug_memory(limit: int = 20, group_by: str = 'lineno'):
+    """
+    Memory state of the worker that serves the request.
+    
+    Returns RSS, the parse memory budget and, when tracemalloc_enabled, the
+    top allocation sites. Disabled unless debug_endpoints_enabled.
+    """
+    if not settings.debug_endpoints_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if group_by not in TRACEMALLOC_GROUPINGS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of {TRACEMALLOC_GROUPINGS}")
+    return {
+        'pid': os.getpid(),
+        'rss_bytes': current_rss(),
+        'memory_budget': memory_budget.status(),
+        'allocations': await asyncio.to_thread(top_allocations, max(1, min(limit, 200)), group_by),
+    }
+
+
 @app.get("/metrics")
 async def metrics():
     """Prometheus metrics endpoint."""
-    # TODO: Return Prometheus metrics
-    return {"status": "metrics_available"}
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 
 if __name__ == "__main__":
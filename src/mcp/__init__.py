@@ -0,0 +1,5 @@
+"""MCP JSON-RPC transport (streamable HTTP at /mcp and stdio)."""
+from src.mcp.server import MCPServer, mcp_server
+from src.mcp.sessions import Session, SessionStore, mcp_sessions
+
+__all__ = ['MCPServer', 'mcp_server', 'Session', 'SessionStore', 'mcp_sessions']
@@ -0,0 +1,308 @@
+"""
+MCP JSON-RPC 2.0 message handling, shared by the HTTP and stdio transports.
+
+Supported methods: initialize, ping, tools/list and tools/call. Batches
+(JSON arrays of messages) are executed concurrently and answered with an
+array of the responses to their requests. Tool calls go through the same
+admission control, metrics and tracing as POST /api/v1/tools/call.
+
+A tools/call with params._meta.progressToken receives notifications/progress
+messages (0-100) while the document is downloaded and parsed.
+notifications/cancelled stops a request still running in this process (over
+HTTP, requests of the session handled by the same worker); the cancelled
+request gets no response.
+"""
+import asyncio
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from pydantic import ValidationError as PydanticValidationError
+from src.config import settings
+from src.mcp.sessions import Session
+from src.services.rate_limiter import admission_controller
+from src.tools import ToolRegistry, tool_registry
+from src.utils.errors import RateLimitError, ServiceOverloadedError
+from src.utils.logger import logger
+from src.utils.metrics import IN_FLIGHT, TOOL_CALLS, TOOL_LATENCY
+from src.utils.progress import progress_reporter
+from src.utils.serialization import dumps
+from src.utils.tracing import request_trace
+
+# Newest first; clients asking for another version get the newest
+PROTOCOL_VERSIONS = ('2025-03-26', '2024-11-05')
+SERVER_INFO = {'name': 'policy-document-reader', 'version': '1.0.0'}
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+# Tool call rejected by admission control; data carries retry_after seconds
+SERVER_BUSY = -32000
+
+# Shortest interval between progress notifications for one request
+PROGRESS_INTERVAL = 0.25
+
+Message = Dict[str, Any]
+# Delivers a server-to-client message (notification) on the request's transport
+Send = Callable[[Message], None]
+
+
+class JSONRPCError(Exception):
+    """Error returned to the client as a JSON-RPC error response."""
+    
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+def error_response(request_id: Any, code: int, message: str, data: Any = None) -> Message:
+    error = {'code': code, 'message': message}
+    if data is not None:
+        error['data'] = data
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': error}
+
+
+def _messages(payload: Any) -> List[Any]:
+    return payload if isinstance(payload, list) else [payload]
+
+
+def is_initialize(payload: Any) -> bool:
+    return isinstance(payload, dict) and payload.get('method') == 'initialize'
+
+
+def _needs_response(message: Any) -> bool:
+    if not isinstance(message, dict) or message.get('jsonrpc') != '2.0':
+        return True
+    if message.get('method') is None and ('result' in message or 'error' in message):
+        return False
+    return 'id' in message
+
+
+def has_requests(payload: Any) -> bool:
+    """Whether anything in payload is answered (batches of notifications are not)."""
+    return payload == [] or any(_needs_response(m) for m in _messages(payload))
+
+
+def wants_progress(payload: Any) -> bool:
+    """Whether any request asked for progress notifications."""
+    for message in _messages(payload):
+        params = message.get('params') if isinstance(message, dict) else None
+        meta = params.get('_meta') if isinstance(params, dict) else None
+        if isinstance(meta, dict) and meta.get('progressToken') is not None:
+            return True
+    return False
+
+
+class ProgressNotifier:
+    """Turns reported progress into throttled, increasing notifications/progress messages."""
+    
+    def __init__(self, token: Union[str, int], send: Send, loop: asyncio.AbstractEventLoop):
+        self.token = token
+        self.send = send
+        self.loop = loop
+        self.last_progress = -1.0
+        self.last_sent = 0.0
+        self.lock = threading.Lock()
+    
+    def __call__(self, fraction: float, message: Optional[str]):
+        # Called from the event loop and from parser threads
+        progress = round(fraction * 100, 1)
+        with self.lock:
+            now = time.monotonic()
+            if progress <= self.last_progress:
+                return
+            if progress < 100 and now - self.last_sent < PROGRESS_INTERVAL:
+                return
+            self.last_progress = progress
+            self.last_sent = now
+        
+        params = {'progressToken': self.token, 'progress': progress, 'total': 100}
+        if message:
+            params['message'] = message
+        notification = {'jsonrpc': '2.0', 'method': 'notifications/progress', 'params': params}
+        try:
+            self.loop.call_soon_threadsafe(self.send, notification)
+        except RuntimeError:
+            # Loop closed: an abandoned parse outlived its request
+            pass
+
+
+class MCPServer:
+    """Dispatch MCP JSON-RPC messages to the tool registry."""
+    
+    def __init__(self, registry: ToolRegistry):
+        self.registry = registry
+        # Requests in flight in this process, by (session id, request id)
+        self.running: Dict[Tuple[str, Union[str, int]], asyncio.Task] = {}
+        self.methods: Dict[str, Callable[[Dict[str, Any], Session, Send], Awaitable[Any]]] = {
+            'initialize': self._initialize,
+            'ping': self._ping,
+            'tools/list': self._list_tools,
+            'tools/call': self._call_tool,
+        }
+    
+    async def handle(self, payload: Any, session: Session, send: Send) -> Union[Message, List[Message], None]:
+        """
+        Handle a decoded message or batch.
+        
+        Args:
+            payload: JSON-RPC message or list of messages
+            session: Client session
+            send: Delivers notifications for the requests in payload
+        
+        Returns:
+            Response, list of responses for a batch, or None if nothing needs answering
+        """
+        if not isinstance(payload, list):
+            return await self.handle_message(payload, session, send)
+        if not payload:
+            return error_response(None, INVALID_REQUEST, 'Empty batch')
+        if len(payload) > settings.mcp_max_batch_size:
+            return error_response(
+                None, INVALID_REQUEST, f"Batch of {len(payload)} exceeds {settings.mcp_max_batch_size} messages"
+            )
+        responses = await asyncio.gather(*(self.handle_message(m, session, send) for m in payload))
+        return [r for r in responses if r is not None] or None
+    
+    async def handle_message(self, message: Any, session: Session, send: Send) -> Optional[Message]:
+        """Handle one message; notifications and client responses yield None."""
+        if not isinstance(message, dict) or message.get('jsonrpc') != '2.0':
+            return error_response(None, INVALID_REQUEST, 'Invalid Request')
+        is_request = 'id' in message
+        request_id = message.get('id')
+        method = message.get('method')
+        if method is None and ('result' in message or 'error' in message):
+            # This server sends no requests, so there is nothing to match a response to
+            return None
+        if not isinstance(method, str):
+            return error_response(request_id, INVALID_REQUEST, 'Invalid Request') if is_request else None
+        if not is_request:
+            if method == 'notifications/cancelled':
+                self._cancel(message.get('params'), session)
+            # notifications/initialized, ...: nothing to do
+            return None
+        
+        params = message.get('params', {})
+        if not isinstance(params, dict):
+            return error_response(request_id, INVALID_PARAMS, 'params must be an object')
+        handler = self.methods.get(method)
+        if handler is None:
+            return error_response(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+        
+        key = (session.session_id, request_id) if isinstance(request_id, (str, int)) else None
+        task = asyncio.ensure_future(handler(params, session, send))
+        if key is not None:
+            self.running[key] = task
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if task.cancelled() and not asyncio.current_task().cancelling():
+                # Cancelled by the client's notifications/cancelled
+                return None
+            raise
+        except JSONRPCError as e:
+            return error_response(request_id, e.code, e.message, e.data)
+        except Exception as e:
+            logger.error(f"MCP {method} failed: {e}")
+            return error_response(request_id, INTERNAL_ERROR, str(e))
+        finally:
+            if key is not None and self.running.get(key) is task:
+                del self.running[key]
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+    
+    def _cancel(self, params: Any, session: Session):
+        """Cancel the session's request named by a notifications/cancelled."""
+        request_id = params.get('requestId') if isinstance(params, dict) else None
+        if not isinstance(request_id, (str, int)):
+            return
+        task = self.running.get((session.session_id, request_id))
+        if task is not None:
+            logger.info(
+                f"MCP request cancelled by client",
+                extra={'data': {'session_id': session.session_id, 'request_id': request_id, 'reason': params.get('reason')}}
+            )
+            task.cancel()
+    
+    async def _initialize(self, params: Dict[str, Any], session: Session, send: Send) -> Dict[str, Any]:
+        requested = params.get('protocolVersion')
+        session.protocol_version = requested if requested in PROTOCOL_VERSIONS else PROTOCOL_VERSIONS[0]
+        client_info = params.get('clientInfo')
+        session.client_info = client_info if isinstance(client_info, dict) else {}
+        logger.info(
+            f"MCP session initialized",
+            extra={'data': {
+                'session_id': session.session_id,
+                'agent_id': session.agent_id,
+                'protocol_version': session.protocol_version,
+                'client': session.client_info.get('name'),
+            }}
+        )
+        return {
+            'protocolVersion': session.protocol_version,
+            'capabilities': {'tools': {'listChanged': False}},
+            'serverInfo': SERVER_INFO,
+        }
+    
+    async def _ping(self, params: Dict[str, Any], session: Session, send: Send) -> Dict[str, Any]:
+        return {}
+    
+    async def _list_tools(self, params: Dict[str, Any], session: Session, send: Send) -> Dict[str, Any]:
+        return {'tools': self.registry.list_tools()}
+    
+    async def _call_tool(self, params: Dict[str, Any], session: Session, send: Send) -> Dict[str, Any]:
+        name = params.get('name')
+        arguments = params.get('arguments', {})
+        if not isinstance(name, str) or not isinstance(arguments, dict):
+            raise JSONRPCError(INVALID_PARAMS, 'tools/call needs a tool name and an arguments object')
+        if self.registry.get_tool(name) is None:
+            raise JSONRPCError(INVALID_PARAMS, f"Unknown tool: {name}")
+        
+        meta = params.get('_meta')
+        token = meta.get('progressToken') if isinstance(meta, dict) else None
+        progress = (
+            progress_reporter(ProgressNotifier(token, send, asyncio.get_running_loop()))
+            if token is not None else nullcontext()
+        )
+        
+        agent_id = session.agent_id
+        try:
+            ticket = await admission_controller.admit(agent_id)
+        except (RateLimitError, ServiceOverloadedError) as e:
+            raise JSONRPCError(SERVER_BUSY, e.message, {'retry_after': e.details.get('retry_after', 1)})
+        
+        start = time.perf_counter()
+        IN_FLIGHT.inc()
+        try:
+            logger.info(
+                f"Tool call: {name}",
+                extra={'data': {'agent_id': agent_id, 'session_id': session.session_id}}
+            )
+            with request_trace(name, agent_id), progress:
+                result = await self.registry.execute_tool(name, arguments, agent_id)
+            TOOL_CALLS.labels(tool=name, status=result.get('status', 'unknown')).inc()
+        except asyncio.CancelledError:
+            TOOL_CALLS.labels(tool=name, status='cancelled').inc()
+            raise
+        except PydanticValidationError as e:
+            TOOL_CALLS.labels(tool=name, status='invalid').inc()
+            raise JSONRPCError(INVALID_PARAMS, f"Invalid arguments for {name}", e.errors(include_url=False))
+        except Exception:
+            TOOL_CALLS.labels(tool=name, status='exception').inc()
+            raise
+        finally:
+            admission_controller.release(ticket)
+            IN_FLIGHT.dec()
+            TOOL_LATENCY.labels(tool=name).observe(time.perf_counter() - start)
+        
+        return {
+            'content': [{'type': 'text', 'text': dumps(result).decode()}],
+            'isError': result.get('status') != 'success',
+        }
+
+
+# Global MCP server
+mcp_server = MCPServer(tool_registry)
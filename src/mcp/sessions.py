@@ -0,0 +1,128 @@
+"""
+MCP sessions shared by the workers on a host.
+
+A session is created by 'initialize' and named by the Mcp-Session-Id header
+on every later request. Requests of one session may land on any uvicorn
+worker, so sessions are small JSON files under settings.mcp_session_dir; the
+file's mtime is the last time the session was used. Workers keep parsed
+sessions in memory and only stat the file on each request.
+"""
+import json
+import os
+import re
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from src.config import settings
+from src.utils.logger import logger
+
+SESSION_ID = re.compile(r'[0-9a-f]{32}')
+# Last-used times are written at most this often per session
+TOUCH_INTERVAL = 60
+# Expired session files are swept at most this often per worker
+PRUNE_INTERVAL = 300
+
+
+@dataclass
+class Session:
+    """An MCP client session."""
+    session_id: str
+    agent_id: str
+    protocol_version: str = ''
+    client_info: Dict[str, Any] = field(default_factory=dict)
+    created: float = field(default_factory=time.time)
+
+
+class SessionStore:
+    """MCP sessions in files, so any worker on the host can serve them."""
+    
+    def __init__(self, directory: Path, ttl_seconds: int):
+        self.directory = directory
+        self.ttl = ttl_seconds
+        # session id -> (session, mtime last seen)
+        self.sessions: Dict[str, Tuple[Session, float]] = {}
+        self._last_prune = 0.0
+    
+    def _path(self, session_id: str) -> Path:
+        return self.directory / f"{session_id}.json"
+    
+    def new(self, agent_id: str) -> Session:
+        """A session that exists once saved (after a successful initialize)."""
+        return Session(session_id=uuid.uuid4().hex, agent_id=agent_id)
+    
+    def save(self, session: Session):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(session.session_id)
+        part = path.with_suffix(f".{os.getpid()}.part")
+        part.write_text(json.dumps(asdict(session)))
+        os.replace(part, path)
+        self.sessions[session.session_id] = (session, path.stat().st_mtime)
+        self.prune()
+    
+    def get(self, session_id: str) -> Optional[Session]:
+        """Session by id, or None if it does not exist or has expired."""
+        if not SESSION_ID.fullmatch(session_id):
+            return None
+        path = self._path(session_id)
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            self.sessions.pop(session_id, None)
+            return None
+        
+        now = time.time()
+        if now - mtime > self.ttl:
+            self.close(session_id)
+            return None
+        
+        cached = self.sessions.get(session_id)
+        if cached is not None:
+            session = cached[0]
+        else:
+            try:
+                session = Session(**json.loads(path.read_text()))
+            except (OSError, ValueError, TypeError):
+                return None
+        
+        if now - mtime > TOUCH_INTERVAL:
+            os.utime(path)
+            mtime = now
+        self.sessions[session_id] = (session, mtime)
+        return session
+    
+    def close(self, session_id: str) -> bool:
+        """End a session; False if there was none."""
+        self.sessions.pop(session_id, None)
+        if not SESSION_ID.fullmatch(session_id):
+            return False
+        try:
+            self._path(session_id).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def prune(self):
+        """Delete expired sessions of any worker."""
+        now = time.time()
+        if now - self._last_prune < PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        removed = 0
+        for path in self.directory.glob('*.json'):
+            try:
+                if now - path.stat().st_mtime > self.ttl:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        for session_id, (_, mtime) in list(self.sessions.items()):
+            if now - mtime > self.ttl:
+                del self.sessions[session_id]
+        if removed:
+            logger.info(f"Pruned {removed} expired MCP sessions")
+
+
+# Global session store
+mcp_sessions = SessionStore(Path(settings.mcp_session_dir), settings.mcp_session_ttl_seconds)
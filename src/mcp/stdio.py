@@ -0,0 +1,62 @@
+"""
+MCP stdio transport: newline-delimited JSON-RPC on stdin and stdout.
+    
+    python -m src.mcp.stdio
+
+The process serves one session. Requests are handled concurrently and each
+response is written when it is ready; logs go to stderr.
+"""
+import asyncio
+import sys
+from src.mcp.server import PARSE_ERROR, MCPServer, Message, error_response, mcp_server
+from src.mcp.sessions import mcp_sessions
+from src.utils.serialization import dumps, loads
+
+# Longest accepted message line
+MAX_LINE_BYTES = 64 * 1024 * 1024
+STDIO_AGENT_ID = 'stdio'
+
+
+async def serve(server: MCPServer = mcp_server, agent_id: str = STDIO_AGENT_ID):
+    """Serve MCP on stdin/stdout until stdin closes."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=MAX_LINE_BYTES)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    
+    stdout = sys.stdout.buffer
+    
+    def send(message: Message):
+        # Only called on the event loop thread, so lines never interleave
+        stdout.write(dumps(message) + b'\n')
+        stdout.flush()
+    
+    session = mcp_sessions.new(agent_id)
+    
+    async def handle(line: bytes):
+        try:
+            payload = loads(line)
+        except ValueError:
+            send(error_response(None, PARSE_ERROR, 'Parse error'))
+            return
+        response = await server.handle(payload, session, send)
+        if response is not None:
+            send(response)
+    
+    tasks = set()
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        if not line.strip():
+            continue
+        task = asyncio.create_task(handle(line))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    
+    # stdin closed: finish what is in flight
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
@@ -0,0 +1,181 @@
+"""
+Parsed document cache.
+
+Two tiers:
+- an in-process LRU bounded by approximate size, for repeat reads within a worker
+- a host-local disk tier shared by all workers, so documents parsed by one
+  worker (or by the prefetcher) are warm in every worker
+
+Entries expire after cache_ttl_seconds. An entry may also carry a version
+(e.g. size and mtime of the source); lookups that pass a different version
+miss, so changed documents are never served stale.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+from src.config import settings
+from src.utils.logger import logger
+from src.utils.metrics import record_cache_lookup
+from src.utils.serialization import dumps
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is in requirements
+    _loads = json.loads
+
+
+# Disk entries are pruned after this many writes
+PRUNE_EVERY = 100
+
+
+@dataclass
+class CacheEntry:
+    """A cached parse result."""
+    result: Dict[str, Any]
+    expires: float
+    version: Optional[str]
+    size: int
+
+
+def cache_key(source: str, credentials_path: str = '', parse_options: Optional[Dict[str, Any]] = None) -> str:
+    """Stable key for a document read with given credentials and parser options."""
+    material = json.dumps([source, credentials_path, parse_options or {}], sort_keys=True, default=str)
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class DocumentCache:
+    """Memory LRU in front of a shared on-disk cache of parse results."""
+    
+    def __init__(self, directory: Path, ttl_seconds: int, max_memory_bytes: int, max_disk_bytes: int):
+        self.directory = directory
+        self.ttl = ttl_seconds
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.memory_bytes = 0
+        self._writes = 0
+    
+    async def get(self, key: str, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Cached result for key, or None if missing, expired or a different version."""
+        if not settings.cache_enabled:
+            return None
+        
+        now = time.time()
+        entry = self.memory.get(key)
+        if entry is not None and entry.expires > now and (version is None or entry.version == version):
+            self.memory.move_to_end(key)
+            record_cache_lookup(True)
+            return entry.result
+        
+        entry = await asyncio.to_thread(self._read_disk, key)
+        if entry is not None and entry.expires > now and (version is None or entry.version == version):
+            self._remember(key, entry)
+            record_cache_lookup(True)
+            return entry.result
+        
+        record_cache_lookup(False)
+        return None
+    
+    async def fresh(self, key: str, version: Optional[str] = None, min_ttl: float = 0) -> bool:
+        """Whether key is cached with at least min_ttl seconds left (not counted as a lookup)."""
+        now = time.time() + min_ttl
+        entry = self.memory.get(key)
+        if entry is None:
+            entry = await asyncio.to_thread(self._read_disk, key)
+        return entry is not None and entry.expires > now and (version is None or entry.version == version)
+    
+    async def put(self, key: str, result: Dict[str, Any], version: Optional[str] = None):
+        """Store a parse result in both tiers."""
+        if not settings.cache_enabled:
+            return
+        
+        expires = time.time() + self.ttl
+        body = dumps({'expires': expires, 'version': version, 'result': result})
+        entry = CacheEntry(result=result, expires=expires, version=version, size=len(body))
+        self._remember(key, entry)
+        try:
+            await asyncio.to_thread(self._write_disk, key, body)
+        except OSError as e:
+            logger.warning(f"Document cache write failed: {e}")
+    
+    def _remember(self, key: str, entry: CacheEntry):
+        """Insert into the memory tier, evicting least recently used entries."""
+        previous = self.memory.pop(key, None)
+        if previous is not None:
+            self.memory_bytes -= previous.size
+        if entry.size > self.max_memory_bytes:
+            return
+        self.memory[key] = entry
+        self.memory_bytes += entry.size
+        while self.memory_bytes > self.max_memory_bytes:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= evicted.size
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+    
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        try:
+            body = self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            data = _loads(body)
+        except ValueError:
+            return None
+        return CacheEntry(result=data['result'], expires=data['expires'], version=data['version'], size=len(body))
+    
+    def _write_disk(self, key: str, body: bytes):
+        """Write atomically so concurrent readers never see partial entries."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        
+        self._writes += 1
+        if self._writes % PRUNE_EVERY == 0:
+            self.prune()
+    
+    def prune(self):
+        """Delete expired disk entries, then the least recently written until under the size cap."""
+        now = time.time()
+        entries = []
+        total = 0
+        for path in self.directory.glob('*.json'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime + self.ttl < now:
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+# Global document cache
+document_cache = DocumentCache(
+    Path(settings.cache_dir),
+    ttl_seconds=settings.cache_ttl_seconds,
+    max_memory_bytes=settings.cache_max_memory_mb * 1024 * 1024,
+    max_disk_bytes=settings.cache_max_disk_mb * 1024 * 1024,
+)
@@ -0,0 +1,108 @@
+"""
+Content-hashed chunks of parsed documents.
+
+Chunks follow the document's own structure so that an edit changes as few
+chunk hashes as possible:
+
+- page: one chunk per page (PDF) or sheet (spreadsheets)
+- section: one chunk per heading and the paragraphs under it (DOCX, markdown)
+- chars: paragraphs packed into chunks of about chunk_size characters
+
+For 'chars', a chunk may end early after a paragraph whose hash picks it as
+a boundary, so boundaries depend on content rather than offsets and inserting
+text only changes the chunks around the edit. Documents without pages or
+headings fall back to 'chars'.
+"""
+import hashlib
+from typing import Any, Dict, List, Literal
+from src.services.diff import Paragraph, split_paragraphs
+
+ChunkMode = Literal['page', 'section', 'chars']
+
+# In 'chars' mode roughly one paragraph in BOUNDARY_EVERY ends a chunk once
+# it is at least half full
+BOUNDARY_EVERY = 4
+
+
+def content_hash(text: str) -> str:
+    """Hash identifying chunk content."""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _group(paragraphs: List[Paragraph], key) -> List[List[Paragraph]]:
+    groups: List[List[Paragraph]] = []
+    current = None
+    for paragraph in paragraphs:
+        value = key(paragraph)
+        if not groups or value != current:
+            groups.append([])
+            current = value
+        groups[-1].append(paragraph)
+    return groups
+
+
+def _pack(paragraphs: List[Paragraph], chunk_size: int) -> List[List[Paragraph]]:
+    """Pack paragraphs into chunks with content-defined boundaries."""
+    groups: List[List[Paragraph]] = [[]]
+    size = 0
+    for paragraph in paragraphs:
+        if groups[-1] and size + len(paragraph.text) > chunk_size:
+            groups.append([])
+            size = 0
+        groups[-1].append(paragraph)
+        size += len(paragraph.text) + 2
+        boundary = int(content_hash(paragraph.text)[:8], 16) % BOUNDARY_EVERY == 0
+        if boundary and size >= chunk_size // 2:
+            groups.append([])
+            size = 0
+    return [group for group in groups if group]
+
+
+def chunk_document(content: str, mode: ChunkMode = 'chars', chunk_size: int = 4000) -> List[Dict[str, Any]]:
+    """
+    Split parsed content into hashed chunks.
+    
+    Args:
+        content: Parsed document content
+        mode: 'page', 'section' or 'chars'
+        chunk_size: Target chunk size in characters for 'chars'
+    
+    Returns:
+        Chunks in document order with id, hash, location and content
+    """
+    paragraphs = split_paragraphs(content)
+    
+    groups = None
+    if mode == 'page' and any(p.page is not None or p.sheet is not None for p in paragraphs):
+        groups = _group(paragraphs, lambda p: (p.page, p.sheet))
+    elif mode == 'section' and any(p.section is not None for p in paragraphs):
+        groups = _group(paragraphs, lambda p: p.section if p.text.startswith('#') else None)
+        # Paragraphs belong to the heading above them
+        merged: List[List[Paragraph]] = []
+        for group in groups:
+            if merged and not group[0].text.startswith('#'):
+                merged[-1].extend(group)
+            else:
+                merged.append(group)
+        groups = merged
+    if groups is None:
+        mode = 'chars'
+        groups = _pack(paragraphs, chunk_size)
+    
+    chunks = []
+    for index, group in enumerate(groups, 1):
+        text = '\n\n'.join(p.text for p in group)
+        first = group[0]
+        location: Dict[str, Any] = {'paragraphs': [first.index, group[-1].index]}
+        for key in ('page', 'sheet', 'section'):
+            value = getattr(first, key)
+            if value is not None:
+                location[key] = value
+        chunks.append({
+            'id': f"{mode}-{index}",
+            'hash': content_hash(text),
+            'location': location,
+            'chars': len(text),
+            'content': text,
+        })
+    return chunks
@@ -0,0 +1,262 @@
+"""
+Credential resolution for document sources.
+
+Tools pass a credentials_path (e.g. 'smb/fileserver'); the provider resolves
+it against the configured secret store and caches the result in memory:
+
+- Lookups of a cached path are served without a round trip.
+- Once REFRESH_AT of a secret's lease has elapsed, the next lookup triggers a
+  background renewal (or re-read) while the cached value keeps being served.
+- Concurrent lookups of a path that is not cached share a single fetch.
+
+Secrets without a lease (KV) are cached for credentials_cache_ttl_seconds.
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+import httpx
+from src.config import settings
+from src.utils.errors import NotFoundError, SourceConnectionError, UnauthorizedError
+from src.utils.logger import logger
+from src.utils.metrics import CREDENTIAL_LOOKUPS
+
+# Fraction of a lease after which the secret is renewed in the background
+REFRESH_AT = 0.75
+
+
+@dataclass
+class Secret:
+    """A secret read from the store, with its lease."""
+    data: Dict[str, Any]
+    lease_seconds: float
+    lease_id: str = ''
+    renewable: bool = False
+
+
+@dataclass
+class CachedSecret:
+    """A cached secret and when to renew and drop it (time.monotonic())."""
+    secret: Secret
+    refresh_at: float
+    expires: float
+
+
+class VaultClient:
+    """Minimal Vault HTTP client: token or Kubernetes auth, KV v2 and dynamic reads, lease renewal."""
+    
+    def __init__(
+        self,
+        endpoint: str,
+        token: Optional[str] = None,
+        role: str = '',
+        auth_mount: str = 'kubernetes',
+        kv_mount: str = 'secret',
+        k8s_token_path: str = '',
+        timeout: float = 5.0
+    ):
+        self.endpoint = endpoint.rstrip('/')
+        self.static_token = token
+        self.role = role
+        self.auth_mount = auth_mount
+        self.kv_mount = kv_mount.strip('/')
+        self.k8s_token_path = k8s_token_path
+        self.timeout = timeout
+        self._token: Optional[str] = token
+        self._token_expires = float('inf')
+        self._login_lock: Optional[asyncio.Lock] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pid: Optional[int] = None
+    
+    def _http(self) -> httpx.AsyncClient:
+        """Pooled client, recreated after fork so workers never share connections."""
+        if self._pid != os.getpid():
+            self._client = httpx.AsyncClient(base_url=self.endpoint, timeout=self.timeout)
+            self._login_lock = asyncio.Lock()
+            self._pid = os.getpid()
+        return self._client
+    
+    async def read(self, path: str) -> Secret:
+        """Read the secret at a credentials path."""
+        path = path.strip('/')
+        if self.kv_mount:
+            body = await self._request('GET', f"/v1/{self.kv_mount}/data/{path}")
+            data = body['data']['data']
+        else:
+            body = await self._request('GET', f"/v1/{path}")
+            data = body['data']
+        return Secret(
+            data=data,
+            lease_seconds=body.get('lease_duration') or 0,
+            lease_id=body.get('lease_id') or '',
+            renewable=bool(body.get('renewable')),
+        )
+    
+    async def renew(self, secret: Secret) -> Secret:
+        """Extend a secret's lease by its original duration."""
+        body = await self._request(
+            'PUT',
+            '/v1/sys/leases/renew',
+            {'lease_id': secret.lease_id, 'increment': int(secret.lease_seconds)}
+        )
+        return Secret(
+            data=secret.data,
+            lease_seconds=body.get('lease_duration') or 0,
+            lease_id=body.get('lease_id') or secret.lease_id,
+            renewable=bool(body.get('renewable')),
+        )
+    
+    async def _request(self, method: str, url: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        client = self._http()
+        for attempt in range(2):
+            token = await self._client_token()
+            try:
+                response = await client.request(method, url, json=payload, headers={'X-Vault-Token': token})
+            except httpx.HTTPError as e:
+                raise SourceConnectionError(f"Secret store unreachable: {e}")
+            
+            # An expired login token is refreshed once; static tokens are not retried
+            if response.status_code == 403 and attempt == 0 and not self.static_token:
+                self._token = None
+                continue
+            if response.status_code == 404:
+                raise NotFoundError(f"Secret not found: {url}")
+            if response.status_code in (401, 403):
+                raise UnauthorizedError(f"Secret store denied access to {url}")
+            if response.status_code >= 400:
+                raise SourceConnectionError(f"Secret store error {response.status_code} for {url}")
+            return response.json()
+        raise UnauthorizedError(f"Secret store denied access to {url}")
+    
+    async def _client_token(self) -> str:
+        """Static token, or a Kubernetes login token renewed before it expires."""
+        if self.static_token:
+            return self.static_token
+        async with self._login_lock:
+            if self._token and time.monotonic() < self._token_expires:
+                return self._token
+            try:
+                jwt = Path(self.k8s_token_path).read_text().strip()
+            except OSError as e:
+                raise UnauthorizedError(f"No Vault token and no service account token: {e}")
+            try:
+                response = await self._client.post(
+                    f"/v1/auth/{self.auth_mount}/login",
+                    json={'role': self.role, 'jwt': jwt}
+                )
+            except httpx.HTTPError as e:
+                raise SourceConnectionError(f"Secret store unreachable: {e}")
+            if response.status_code >= 400:
+                raise UnauthorizedError(f"Vault login failed with status {response.status_code}")
+            auth = response.json()['auth']
+            self._token = auth['client_token']
+            lease = auth.get('lease_duration') or 0
+            self._token_expires = time.monotonic() + lease * REFRESH_AT if lease else float('inf')
+            return self._token
+
+
+class CredentialProvider:
+    """In-memory, lease-aware cache in front of a secret store."""
+    
+    def __init__(self, default_ttl: float):
+        self.default_ttl = default_ttl
+        self.cache: Dict[str, CachedSecret] = {}
+        self._backend: Optional[VaultClient] = None
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._refreshing: Set[str] = set()
+        self._background: Set[asyncio.Task] = set()
+    
+    def backend(self) -> VaultClient:
+        """Client for the configured secret provider."""
+        if self._backend is None:
+            if settings.secret_provider != 'vault':
+                raise SourceConnectionError(f"Secret provider '{settings.secret_provider}' is not supported")
+            self._backend = VaultClient(
+                settings.secret_endpoint,
+                token=settings.vault_token,
+                role=settings.vault_role,
+                auth_mount=settings.vault_auth_mount,
+                kv_mount=settings.vault_kv_mount,
+                k8s_token_path=settings.vault_k8s_token_path,
+                timeout=settings.secret_timeout_seconds,
+            )
+        return self._backend
+    
+    async def get(self, path: str) -> Dict[str, Any]:
+        """
+        Resolve a credentials path.
+        
+        Args:
+            path: Secret path; '' means the source needs no credentials
+        
+        Returns:
+            Secret key/value pairs
+        
+        Raises:
+            NotFoundError: No secret at path
+            UnauthorizedError: The server may not read the secret
+            SourceConnectionError: Secret store unreachable
+        """
+        if not path:
+            return {}
+        
+        now = time.monotonic()
+        entry = self.cache.get(path)
+        if entry is not None and now < entry.expires:
+            if now >= entry.refresh_at and path not in self._refreshing:
+                self._refreshing.add(path)
+                task = asyncio.create_task(self._refresh(path, entry))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            CREDENTIAL_LOOKUPS.labels(result='hit').inc()
+            return entry.secret.data
+        
+        task = self._pending.get(path)
+        if task is None:
+            CREDENTIAL_LOOKUPS.labels(result='miss').inc()
+            task = asyncio.create_task(self._load(path))
+            self._pending[path] = task
+            task.add_done_callback(lambda _: self._pending.pop(path, None))
+        else:
+            CREDENTIAL_LOOKUPS.labels(result='coalesced').inc()
+        # Shielded so one cancelled caller does not fail the others sharing the fetch
+        return (await asyncio.shield(task)).data
+    
+    def invalidate(self, path: str):
+        """Drop a cached secret, e.g. after the source rejected it."""
+        self.cache.pop(path, None)
+    
+    async def _load(self, path: str) -> Secret:
+        secret = await self.backend().read(path)
+        self._store(path, secret)
+        return secret
+    
+    async def _refresh(self, path: str, entry: CachedSecret):
+        """Renew the lease if possible, otherwise re-read; keep the old value on failure."""
+        try:
+            secret = None
+            if entry.secret.renewable and entry.secret.lease_id:
+                try:
+                    secret = await self.backend().renew(entry.secret)
+                except Exception as e:
+                    logger.info(f"Lease renewal failed for {path}, re-reading: {e}")
+            if secret is None or secret.lease_seconds < entry.secret.lease_seconds * (1 - REFRESH_AT):
+                # Not renewable, or near its max TTL: fetch a new secret
+                secret = await self.backend().read(path)
+            self._store(path, secret)
+        except Exception as e:
+            CREDENTIAL_LOOKUPS.labels(result='refresh_failed').inc()
+            logger.warning(f"Credential refresh failed for {path}: {e}")
+        finally:
+            self._refreshing.discard(path)
+    
+    def _store(self, path: str, secret: Secret):
+        lease = secret.lease_seconds or self.default_ttl
+        now = time.monotonic()
+        self.cache[path] = CachedSecret(secret=secret, refresh_at=now + lease * REFRESH_AT, expires=now + lease)
+
+
+# Global credential provider
+credential_provider = CredentialProvider(default_ttl=settings.credentials_cache_ttl_seconds)
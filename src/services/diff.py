@@ -0,0 +1,179 @@
+"""
+Paragraph- and line-level diff of parsed documents.
+
+Both documents are split into paragraphs (blocks separated by blank lines)
+and the paragraph sequences are matched first. Only paragraphs that differ are
+diffed line by line, and only from their first to their last differing line,
+so a small edit to a long paragraph (a document without blank lines is a
+single one) is cheap. Line matching is quadratic in the worst case, so
+changed runs longer than MAX_MATCHED_LINES are reported as one replacement
+instead of being matched.
+
+Each paragraph is tagged with where it sits, taken from the markers the
+parsers emit: '[Page N]' (PDF), '[Sheet: name]' (spreadsheets) and markdown
+headings (DOCX sections).
+"""
+import re
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional
+
+PAGE_OR_SHEET = re.compile(r'\[(?:Page (\d+)|Sheet: ([^\]\n]*))\]\n?')
+HEADING = re.compile(r'#{1,6} (.+)')
+
+HUNK_TYPES = {'replace': 'changed', 'delete': 'removed', 'insert': 'added'}
+
+# Longest run of changed lines (old plus new) matched line by line
+MAX_MATCHED_LINES = 4000
+
+
+@dataclass
+class Paragraph:
+    """A paragraph of a document and where it is."""
+    text: str
+    index: int
+    page: Optional[int] = None
+    sheet: Optional[str] = None
+    section: Optional[str] = None
+
+
+def split_paragraphs(content: str) -> List[Paragraph]:
+    """Split parsed content into located paragraphs (page/sheet markers are not content)."""
+    paragraphs = []
+    page = sheet = section = None
+    for block in content.split('\n\n'):
+        marker = PAGE_OR_SHEET.match(block)
+        if marker:
+            if marker.group(1):
+                page = int(marker.group(1))
+            else:
+                sheet = marker.group(2)
+            block = block[marker.end():]
+        block = block.strip()
+        if not block:
+            continue
+        heading = HEADING.match(block)
+        if heading:
+            section = heading.group(1).strip()
+        paragraphs.append(Paragraph(block, len(paragraphs) + 1, page, sheet, section))
+    return paragraphs
+
+
+def _location(paragraphs: List[Paragraph], start: int, end: int) -> Dict[str, Any]:
+    """Location of paragraphs[start:end]; for an empty range, the paragraph it follows."""
+    location: Dict[str, Any] = {'paragraphs': [start + 1, end] if end > start else []}
+    anchor = paragraphs[start] if end > start else (paragraphs[start - 1] if start else None)
+    if anchor is not None:
+        for key in ('page', 'sheet', 'section'):
+            value = getattr(anchor, key)
+            if value is not None:
+                location[key] = value
+        if end == start:
+            location['after_paragraph'] = anchor.index
+    return location
+
+
+def _line_diff(old: List[Paragraph], new: List[Paragraph], context: int) -> List[str]:
+    """Changed lines of two paragraph runs, prefixed '-', '+' or ' ' (context)."""
+    old_lines = '\n'.join(p.text for p in old).split('\n') if old else []
+    new_lines = '\n'.join(p.text for p in new).split('\n') if new else []
+    
+    # Unchanged leading and trailing lines need no matching
+    prefix = 0
+    limit = min(len(old_lines), len(new_lines))
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    old_changed = old_lines[prefix:len(old_lines) - suffix]
+    new_changed = new_lines[prefix:len(new_lines) - suffix]
+    if not old_changed and not new_changed:
+        # Only the paragraph breaks moved
+        return []
+    
+    lines = [f" {line}" for line in old_lines[max(prefix - context, 0):prefix]]
+    if len(old_changed) + len(new_changed) > MAX_MATCHED_LINES:
+        lines.extend(f"-{line}" for line in old_changed)
+        lines.extend(f"+{line}" for line in new_changed)
+    else:
+        matcher = SequenceMatcher(None, old_changed, new_changed, autojunk=False)
+        for group in matcher.get_grouped_opcodes(context):
+            for tag, i1, i2, j1, j2 in group:
+                if tag == 'equal':
+                    lines.extend(f" {line}" for line in old_changed[i1:i2])
+                    continue
+                lines.extend(f"-{line}" for line in old_changed[i1:i2])
+                lines.extend(f"+{line}" for line in new_changed[j1:j2])
+    if context:
+        lines.extend(f" {line}" for line in old_lines[len(old_lines) - suffix:][:context])
+    return lines
+
+
+def diff_documents(old_content: str, new_content: str, max_hunks: int = 200, context_lines: int = 0) -> Dict[str, Any]:
+    """
+    Diff two parsed documents.
+    
+    Args:
+        old_content: Parsed content of the earlier version
+        new_content: Parsed content of the later version
+        max_hunks: Hunks to return; the summary always covers the whole diff
+        context_lines: Unchanged lines to include around changed lines
+    
+    Returns:
+        Summary counts and the changed hunks with their locations
+    """
+    old = split_paragraphs(old_content)
+    new = split_paragraphs(new_content)
+    old_texts = [p.text for p in old]
+    new_texts = [p.text for p in new]
+    
+    # Unchanged leading and trailing paragraphs need no matching
+    prefix = 0
+    limit = min(len(old_texts), len(new_texts))
+    while prefix < limit and old_texts[prefix] == new_texts[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_texts[-1 - suffix] == new_texts[-1 - suffix]:
+        suffix += 1
+    
+    matcher = SequenceMatcher(
+        None,
+        old_texts[prefix:len(old_texts) - suffix],
+        new_texts[prefix:len(new_texts) - suffix],
+        autojunk=False
+    )
+    
+    hunks = []
+    counts = {'changed': 0, 'added': 0, 'removed': 0}
+    removed_paragraphs = added_paragraphs = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        i1, i2, j1, j2 = i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix
+        kind = HUNK_TYPES[tag]
+        counts[kind] += 1
+        removed_paragraphs += i2 - i1
+        added_paragraphs += j2 - j1
+        if len(hunks) < max_hunks:
+            hunks.append({
+                'type': kind,
+                'old': _location(old, i1, i2),
+                'new': _location(new, j1, j2),
+                'lines': _line_diff(old[i1:i2], new[j1:j2], context_lines),
+            })
+    
+    total = sum(counts.values())
+    return {
+        'summary': {
+            'identical': total == 0,
+            'hunks': total,
+            **{f"{kind}_hunks": count for kind, count in counts.items()},
+            'paragraphs_removed': removed_paragraphs,
+            'paragraphs_added': added_paragraphs,
+            'old_paragraphs': len(old),
+            'new_paragraphs': len(new),
+        },
+        'hunks': hunks,
+        'truncated': total > len(hunks),
+    }
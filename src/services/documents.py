@@ -0,0 +1,107 @@
+"""Shared document loading: download, size check, parse and cache."""
+from pathlib import Path
+from typing import Any, Dict, Optional
+from src.config import settings
+from src.services.cache import cache_key, document_cache
+from src.services.parsers import parser_registry
+from src.services.readers import reader_registry
+from src.utils.errors import DocumentTooLargeError
+from src.utils.progress import progress_stage, report_progress
+from src.utils.tracing import span
+
+
+def source_version(source: str) -> Optional[str]:
+    """Cheap change fingerprint for local files; None where only a download would tell."""
+    if reader_registry.get_protocol(source) != 'local':
+        return None
+    path = Path(source[len('file://'):] if source.startswith('file://') else source)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+async def load_document(
+    source: str,
+    credentials: Dict[str, Any],
+    credentials_path: str = '',
+    parse_options: Optional[Dict[str, Any]] = None,
+    version: Optional[str] = None,
+    refresh: bool = False
+) -> Dict[str, Any]:
+    """
+    Read and parse a document, serving it from the document cache when possible.
+    
+    Args:
+        source: Document URI
+        credentials: Resolved source credentials
+        credentials_path: Credentials path the read was authorised with (part of the cache key)
+        parse_options: Format-specific parser options
+        version: Change fingerprint from a listing, for sources that cannot be checked cheaply
+        refresh: Skip the cache lookup and re-parse
+    
+    Returns:
+        Parse result
+    """
+    parse_options = parse_options or {}
+    key = cache_key(source, credentials_path, parse_options)
+    version = source_version(source) or version
+    
+    if not refresh:
+        with span('document.cache_lookup'):
+            cached = await document_cache.get(key, version)
+        if cached is not None:
+            return cached
+    
+    file_path = await download_document(source, credentials)
+    return await parse_document(file_path, key, version, parse_options)
+
+
+async def download_document(source: str, credentials: Dict[str, Any]) -> Path:
+    """
+    Download a document and check it against max_document_size_mb.
+    
+    Raises:
+        DocumentTooLargeError: The document exceeds the size limit
+    """
+    report_progress(0.0, message="Downloading")
+    file_path = await reader_registry.read_document(source, credentials)
+    
+    # Check size limit
+    with span('read_document.size_check'):
+        file_size = file_path.stat().st_size
+        max_size = settings.max_document_size_mb * 1024 * 1024
+        if file_size > max_size:
+            raise DocumentTooLargeError(
+                f"Document size {file_size} exceeds limit {max_size}"
+            )
+    return file_path
+
+
+async def parse_document(
+    file_path: Path,
+    key: str,
+    version: Optional[str],
+    parse_options: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Parse a downloaded document and store the result in the document cache.
+    
+    Args:
+        file_path: Downloaded document
+        key: Document cache key (see cache_key)
+        version: Change fingerprint stored with the entry
+        parse_options: Format-specific parser options
+    
+    Returns:
+        Parse result
+    """
+    # The parser reports pages/sheets within this stage
+    report_progress(0.2, message="Parsing")
+    with progress_stage(0.2, 0.95):
+        result = await parser_registry.parse_document(file_path, **(parse_options or {}))
+    
+    await document_cache.put(key, result, version)
+    report_progress(1.0, message="Parsed")
+    return result
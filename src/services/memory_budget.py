@@ -0,0 +1,126 @@
+"""
+Per-worker memory budget for document parses.
+
+max_document_size_mb caps the download, not what a parse expands it to: a
+compressed workbook or a layout-analysed PDF can need many times its file
+size. Before a parse starts its peak memory is estimated from format and
+size, and the parse is admitted only while the estimates of the parses
+running in this worker fit in worker_memory_budget_mb. Parses that would not
+fit wait for others to finish, up to memory_wait_seconds.
+
+The factors are deliberately rough upper estimates; compare them with
+policy_reader_parser_peak_rss_delta_bytes to tune them.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from src.config import settings
+from src.utils.errors import DocumentTooLargeError, ServiceOverloadedError
+from src.utils.logger import logger
+from src.utils.metrics import ADMISSION_REJECTIONS, MEMORY_RESERVED
+
+MB = 1024 * 1024
+
+# Estimated peak parse memory per byte of input, by format
+MEMORY_FACTORS: Dict[str, float] = {
+    'pdf': 6,
+    'docx': 15,
+    'doc': 15,
+    'xlsx': 12,
+    # xlrd holds each legacy workbook sheet in memory whole
+    'xls': 40,
+    'csv': 3,
+    'txt': 3,
+    'md': 3,
+    'markdown': 3,
+    'json': 3,
+    'yaml': 3,
+    'yml': 3,
+}
+PDF_LAYOUT_FACTOR = 30
+DEFAULT_FACTOR = 10
+# Interpreter and parser-library overhead of any parse
+BASE_PARSE_BYTES = 16 * MB
+
+
+def estimate_parse_memory(doc_format: str, file_size: int, options: Optional[Dict[str, Any]] = None) -> int:
+    """Estimated peak memory in bytes of parsing a document."""
+    factor = MEMORY_FACTORS.get(doc_format, DEFAULT_FACTOR)
+    if doc_format == 'pdf' and (options or {}).get('engine', settings.pdf_engine) == 'layout':
+        factor = PDF_LAYOUT_FACTOR
+    return BASE_PARSE_BYTES + int(file_size * factor)
+
+
+class MemoryBudget:
+    """Admits parses while their estimated memory fits the worker budget."""
+    
+    def __init__(self, budget_bytes: int, wait_seconds: float):
+        self.budget = budget_bytes
+        self.wait_seconds = wait_seconds
+        self.reserved = 0
+        self._released: Optional[asyncio.Event] = None
+    
+    async def acquire(self, cost: int, doc_format: str):
+        """
+        Reserve cost bytes, waiting for running parses to release budget.
+        
+        Raises:
+            DocumentTooLargeError: The estimate alone exceeds the budget
+            ServiceOverloadedError: Budget did not free up within memory_wait_seconds
+        """
+        if cost > self.budget:
+            ADMISSION_REJECTIONS.labels(reason='memory_too_large').inc()
+            raise DocumentTooLargeError(
+                f"Parsing this {doc_format} document needs an estimated {cost // MB} MB, "
+                f"more than the worker memory budget of {self.budget // MB} MB",
+                {'estimated_bytes': cost, 'budget_bytes': self.budget}
+            )
+        
+        if self.reserved + cost > self.budget:
+            logger.info(
+                f"Parse waiting for memory budget",
+                extra={'data': {'format': doc_format, 'estimated_bytes': cost, 'reserved_bytes': self.reserved}}
+            )
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.wait_seconds
+            while self.reserved + cost > self.budget:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    ADMISSION_REJECTIONS.labels(reason='memory_timeout').inc()
+                    raise ServiceOverloadedError(
+                        f"Server busy: no memory budget for a {cost // MB} MB parse within {self.wait_seconds}s",
+                        {'retry_after': 1}
+                    )
+                if self._released is None:
+                    self._released = asyncio.Event()
+                try:
+                    await asyncio.wait_for(self._released.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+        
+        self.reserved += cost
+        MEMORY_RESERVED.inc(cost)
+    
+    def release(self, cost: int):
+        """Return cost bytes and wake waiting parses."""
+        self.reserved -= cost
+        MEMORY_RESERVED.dec(cost)
+        if self._released is not None:
+            released, self._released = self._released, None
+            released.set()
+    
+    @asynccontextmanager
+    async def reserve(self, cost: int, doc_format: str) -> AsyncIterator[None]:
+        """Hold cost bytes of budget for the duration of the block."""
+        await self.acquire(cost, doc_format)
+        try:
+            yield
+        finally:
+            self.release(cost)
+    
+    def status(self) -> Dict[str, int]:
+        return {'budget_bytes': self.budget, 'reserved_bytes': self.reserved}
+
+
+# Global memory budget
+memory_budget = MemoryBudget(settings.worker_memory_budget_mb * MB, settings.memory_wait_seconds)
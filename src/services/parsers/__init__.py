@@ -1,47 +1,108 @@
 """Parser registry and factory."""
+import importlib
+import time
 from pathlib import Path
 from typing import Dict, Any, Optional
+from src.config import settings
+from src.services.memory_budget import estimate_parse_memory, memory_budget
 from src.services.parsers.base import BaseParser
-from src.services.parsers.pdf_parser import PDFParser
-from src.services.parsers.docx_parser import DOCXParser
-from src.services.parsers.excel_parser import ExcelParser
-from src.services.parsers.csv_parser import CSVParser
-from src.services.parsers.text_parser import TextParser
+from src.services.scheduler import parse_scheduler
+from src.utils.deadline import deadline_timeout, run_in_thread
 from src.utils.errors import UnsupportedFormatError
 from src.utils.logger import logger
+from src.utils.memory import rss_monitor
+from src.utils.metrics import PARSER_INPUT_BYTES, PARSER_LATENCY, PARSER_PEAK_RSS, observe_latency
+from src.utils.redaction import redact_text
+from src.utils.tracing import span
+
+
+# Parser modules are imported on first use so that workers only pay for the
+# libraries (pandas, pdfplumber, ...) of formats they actually parse.
+# Entries: (module, class name, supported extensions)
+PARSER_SPECS: list[tuple[str, str, tuple[str, ...]]] = [
+    ('src.services.parsers.pdf_parser', 'PDFParser', ('.pdf',)),
+    ('src.services.parsers.docx_parser', 'DOCXParser', ('.docx', '.doc')),
+    ('src.services.parsers.excel_parser', 'ExcelParser', ('.xlsx', '.xls')),
+    ('src.services.parsers.csv_parser', 'CSVParser', ('.csv',)),
+    ('src.services.parsers.text_parser', 'TextParser', ('.txt', '.md', '.markdown', '.json', '.yaml', '.yml')),
+]
 
 
 class ParserRegistry:
     """Registry of document parsers."""
     
     def __init__(self):
-        self.parsers: list[BaseParser] = [
-            PDFParser(),
-            DOCXParser(),
-            ExcelParser(),
-            CSVParser(),
-            TextParser(),
-        ]
+        self.specs = PARSER_SPECS
+        self.parsers: Dict[str, BaseParser] = {}
+        self.import_timings: Dict[str, float] = {}
+    
+    def _load_parser(self, module_name: str, class_name: str) -> BaseParser:
+        """Import parser module and instantiate its parser on first use."""
+        parser = self.parsers.get(class_name)
+        if parser is None:
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.import_timings[module_name] = elapsed_ms
+            logger.info(f"Loaded parser {class_name} in {elapsed_ms:.1f} ms")
+            
+            parser = getattr(module, class_name)()
+            self.parsers[class_name] = parser
+        return parser
     
     def get_parser(self, file_extension: str) -> BaseParser:
         """Get parser for file format."""
-        for parser in self.parsers:
-            if parser.supports_format(file_extension):
-                return parser
+        extension = file_extension.lower()
+        for module_name, class_name, extensions in self.specs:
+            if extension in extensions:
+                return self._load_parser(module_name, class_name)
         raise UnsupportedFormatError(f"No parser for format: {file_extension}")
     
-    async def parse_document(self, file_path: Path) -> Dict[str, Any]:
+    def preload(self):
+        """Import all parser modules eagerly (e.g. before forking workers)."""
+        for module_name, class_name, _ in self.specs:
+            self._load_parser(module_name, class_name)
+    
+    def supported_formats(self) -> list[str]:
+        """List supported file extensions without importing any parser."""
+        return [ext for _, _, extensions in self.specs for ext in extensions]
+    
+    async def parse_document(self, file_path: Path, **options: Any) -> Dict[str, Any]:
         """Parse document using appropriate parser."""
         extension = file_path.suffix
         logger.info(f"Parsing document: {file_path.name} (format: {extension})")
         
         parser = self.get_parser(extension)
-        result = await parser.parse(file_path)
+        doc_format = extension.lower().lstrip('.')
+        file_size = file_path.stat().st_size
+        
+        # Admit the parse only if its estimated memory fits this worker's budget
+        estimate = estimate_parse_memory(doc_format, file_size, options)
+        async with deadline_timeout('parse'):
+            # Memory first: a parse waiting for memory must not hold a slot that
+            # small documents (which get slots ahead of large ones) could use
+            async with memory_budget.reserve(estimate, doc_format), \
+                    parse_scheduler.slot(doc_format, file_size, options) as lane:
+                with span(
+                    'parser.parse_document', format=doc_format, lane=lane, estimated_memory_bytes=estimate
+                ) as parse_span, \
+                        observe_latency(PARSER_LATENCY, format=doc_format), \
+                        rss_monitor.track() as usage:
+                    result = await parser.parse(file_path, **options)
+            if usage is not None:
+                PARSER_PEAK_RSS.labels(format=doc_format).observe(usage.peak_delta)
+                if parse_span is not None:
+                    parse_span.attributes['peak_rss_delta_bytes'] = usage.peak_delta
+            
+            if settings.pii_redaction_enabled and settings.pii_redact_document_content:
+                with span('parser.redact'):
+                    result['content'] = await run_in_thread(redact_text, result['content'])
         
         # Add file info
         result['file_name'] = file_path.name
         result['file_path'] = str(file_path)
-        result['file_size'] = file_path.stat().st_size
+        result['file_size'] = file_size
+        PARSER_INPUT_BYTES.labels(format=doc_format).observe(result['file_size'])
         
         return result
 
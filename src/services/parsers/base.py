@@ -1,28 +1,57 @@
 """Base parser interface."""
+import functools
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 from pathlib import Path
+from src.config import settings
+from src.services.parsers.isolation import run_in_subprocess
+from src.utils.deadline import run_in_thread
+from src.utils.errors import DocumentParseError, MCPError
+from src.utils.logger import logger
 
 
 class BaseParser(ABC):
     """Base document parser interface."""
     
-    @abstractmethod
-    async def parse(self, file_path: Path) -> Dict[str, Any]:
+    # Format name used in log lines and parse errors
+    format_name = 'document'
+    
+    async def parse(self, file_path: Path, **options: Any) -> Dict[str, Any]:
         """
         Parse document and extract content.
         
+        parse_sync runs in a child process for documents of at least
+        parse_subprocess_min_mb, so a cancelled parse can be killed, and in a
+        thread otherwise.
+        
         Args:
             file_path: Path to document file
-            
+            **options: Format-specific parse options (row windows, etc.)
+        
         Returns:
             Dictionary containing:
                 - content: Extracted text content
                 - metadata: Document metadata (author, date, etc.)
         """
-        pass
+        try:
+            logger.info(f"Parsing {self.format_name}: {file_path.name}")
+            if settings.parse_subprocess_enabled and \
+                    file_path.stat().st_size >= settings.parse_subprocess_min_mb * 1024 * 1024:
+                return await run_in_subprocess(self.parse_sync, file_path, options)
+            return await run_in_thread(functools.partial(self.parse_sync, file_path, **options))
+        
+        except MCPError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to parse {self.format_name} {file_path}: {e}")
+            raise DocumentParseError(f"{self.format_name} parse error: {e}")
     
     @abstractmethod
-    def supports_format(self, file_extension: str) -> bool:
-        """Check if parser supports this format."""
+    def parse_sync(self, file_path: Path, **options: Any) -> Dict[str, Any]:
+        """
+        Parse document (blocking).
+        
+        Long loops call check_cancelled() between pages, sheets or rows so a
+        cancelled parse stops early.
+        """
         pass
@@ -1,42 +1,89 @@
 """CSV document parser."""
+import csv
 from pathlib import Path
 from typing import Dict, Any
-import pandas as pd
 from src.services.parsers.base import BaseParser
-from src.utils.logger import logger
-from src.utils.errors import DocumentParseError
+from src.services.parsers.encoding import detect_file_encoding
+from src.services.parsers.tabular import TableWriter, row_window
+from src.utils.deadline import check_cancelled
+
+
+SNIFF_CHARS = 64 * 1024
+SNIFF_DELIMITERS = ',;\t|'
+# Rows streamed between cancellation checks
+CANCEL_CHECK_ROWS = 1000
 
 
 class CSVParser(BaseParser):
-    """Parse CSV files."""
+    """
+    Parse CSV files.
     
-    async def parse(self, file_path: Path) -> Dict[str, Any]:
-        """Parse CSV document."""
-        try:
-            logger.info(f"Parsing CSV: {file_path.name}")
-            
-            # Read CSV
-            df = pd.read_csv(file_path)
-            
-            # Convert to readable format
-            content = df.to_string(index=False)
-            
-            metadata = {
-                'rows': len(df),
-                'columns': list(df.columns),
-                'column_count': len(df.columns),
-            }
+    Rows are streamed through the csv module, so memory is bounded by the
+    rendered output rather than the file size.
+    
+    Options:
+        start_row: First data row to emit (0-based, header excluded)
+        max_rows: Maximum number of data rows to emit
+        table_format: 'tsv' (default) or 'markdown'
+        encoding: Override detected encoding
+        delimiter: Override sniffed delimiter
+    """
+    
+    format_name = 'CSV'
+    
+    def parse_sync(self, file_path: Path, **options: Any) -> Dict[str, Any]:
+        """Stream CSV rows into compact table text."""
+        start_row, max_rows = row_window(options)
+        writer = TableWriter(options.get('table_format', 'tsv'))
+        encoding = options.get('encoding') or detect_file_encoding(file_path)
+        
+        with open(file_path, 'r', encoding=encoding, errors='replace', newline='') as f:
+            dialect = self._sniff_dialect(f.read(SNIFF_CHARS))
+            delimiter = options.get('delimiter') or dialect.delimiter
+            f.seek(0)
             
-            return {
-                'content': content,
-                'metadata': metadata,
-                'format': 'csv'
-            }
+            reader = csv.reader(f, dialect, delimiter=delimiter)
+            columns = next(reader, [])
+            writer.header(columns)
             
-        except Exception as e:
-            logger.error(f"Failed to parse CSV {file_path}: {e}")
-            raise DocumentParseError(f"CSV parse error: {e}")
+            end_row = start_row + max_rows if max_rows is not None else None
+            rows = 0
+            for row in reader:
+                if not row:
+                    continue
+                if rows % CANCEL_CHECK_ROWS == 0:
+                    check_cancelled()
+                if rows >= start_row and (end_row is None or rows < end_row):
+                    writer.row(row)
+                rows += 1
+        
+        rows_returned = max(0, min(rows, end_row if end_row is not None else rows) - start_row)
+        if rows_returned < rows:
+            writer.text(f"[Showing {rows_returned} of {rows} rows starting at row {start_row}]")
+        
+        metadata = {
+            'rows': rows,
+            'columns': columns,
+            'column_count': len(columns),
+            'encoding': encoding,
+            'delimiter': delimiter,
+            'start_row': start_row,
+            'rows_returned': rows_returned,
+        }
+        
+        return {
+            'content': writer.getvalue(),
+            'metadata': metadata,
+            'format': 'csv'
+        }
     
-    def supports_format(self, file_extension: str) -> bool:
-        """Check if format is supported."""
-        return file_extension.lower() in ['.csv']
+    @staticmethod
+    def _sniff_dialect(sample: str) -> type[csv.Dialect]:
+        """Infer the CSV dialect from a sample, defaulting to Excel CSV."""
+        # Only sniff complete lines
+        if '\n' in sample:
+            sample = sample[:sample.rfind('\n')]
+        try:
+            return csv.Sniffer().sniff(sample, delimiters=SNIFF_DELIMITERS)
+        except csv.Error:
+            return csv.excel
@@ -1,47 +1,239 @@
 """DOCX document parser."""
+import re
+import zipfile
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any
-import docx
+from typing import Dict, Any, List, Optional
+from xml.etree import ElementTree
 from src.services.parsers.base import BaseParser
-from src.utils.logger import logger
-from src.utils.errors import DocumentParseError
+from src.services.parsers.tabular import TableWriter
+from src.utils.deadline import check_cancelled
+
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_BODY = f'{W}body'
+W_P = f'{W}p'
+W_TBL = f'{W}tbl'
+W_TR = f'{W}tr'
+W_TC = f'{W}tc'
+W_T = f'{W}t'
+W_TAB = f'{W}tab'
+W_BR = f'{W}br'
+W_CR = f'{W}cr'
+W_PPR = f'{W}pPr'
+W_PSTYLE = f'{W}pStyle'
+W_OUTLINE = f'{W}outlineLvl'
+W_SECTPR = f'{W}sectPr'
+W_TCPR = f'{W}tcPr'
+W_GRIDSPAN = f'{W}gridSpan'
+W_VAL = f'{W}val'
+
+CORE_PROPERTIES = {
+    'title': '{http://purl.org/dc/elements/1.1/}title',
+    'author': '{http://purl.org/dc/elements/1.1/}creator',
+    'created': '{http://purl.org/dc/terms/}created',
+    'modified': '{http://purl.org/dc/terms/}modified',
+}
+
+# Core properties holding W3CDTF dates
+DATE_PROPERTIES = ('created', 'modified')
+
+HEADING_STYLE = re.compile(r'^heading\s*(\d)$', re.IGNORECASE)
 
 
 class DOCXParser(BaseParser):
-    """Parse Microsoft Word documents."""
+    """
+    Parse Microsoft Word documents.
     
-    async def parse(self, file_path: Path) -> Dict[str, Any]:
-        """Parse DOCX document."""
-        try:
-            logger.info(f"Parsing DOCX: {file_path.name}")
-            
-            doc = docx.Document(file_path)
-            
-            # Extract text content
-            paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
-            content = '\n\n'.join(paragraphs)
+    word/document.xml is streamed with an incremental XML parser and each
+    top-level paragraph or table is released once emitted, so memory stays
+    flat regardless of document size.
+    
+    Options:
+        table_format: 'markdown' (default) or 'tsv'
+    """
+    
+    format_name = 'DOCX'
+    
+    def parse_sync(self, file_path: Path, **options: Any) -> Dict[str, Any]:
+        """Extract paragraphs and tables in document order."""
+        table_format = options.get('table_format', 'markdown')
+        TableWriter(table_format)  # Validate before doing any work
+        
+        with zipfile.ZipFile(file_path) as archive:
+            names = set(archive.namelist())
+            heading_styles = self._read_heading_styles(archive, names)
+            metadata = self._read_core_properties(archive, names)
             
-            # Extract metadata
-            core_props = doc.core_properties
-            metadata = {
-                'title': core_props.title or '',
-                'author': core_props.author or '',
-                'created': str(core_props.created) if core_props.created else '',
-                'modified': str(core_props.modified) if core_props.modified else '',
-                'paragraphs': len(doc.paragraphs),
-                'sections': len(doc.sections),
-            }
+            blocks: List[str] = []
+            paragraphs = sections = tables = 0
+            paragraph_depth = table_depth = 0
+            body = None
             
-            return {
-                'content': content,
-                'metadata': metadata,
-                'format': 'docx'
-            }
+            with archive.open('word/document.xml') as document:
+                for event, elem in ElementTree.iterparse(document, events=('start', 'end')):
+                    tag = elem.tag
+                    if event == 'start':
+                        if tag == W_P:
+                            paragraph_depth += 1
+                        elif tag == W_TBL:
+                            table_depth += 1
+                        elif tag == W_BODY:
+                            body = elem
+                        continue
+                    
+                    if tag == W_SECTPR:
+                        sections += 1
+                    elif tag == W_P:
+                        paragraph_depth -= 1
+                        # Nested paragraphs (text boxes, table cells) are
+                        # emitted as part of their outermost block
+                        if paragraph_depth or table_depth:
+                            continue
+                        paragraphs += 1
+                        text = self._paragraph_text(elem)
+                        if text.strip():
+                            level = self._heading_level(elem, heading_styles)
+                            blocks.append(f"{'#' * level} {text}" if level else text)
+                    elif tag == W_TBL:
+                        table_depth -= 1
+                        if table_depth or paragraph_depth:
+                            continue
+                        tables += 1
+                        table = self._table_text(elem, table_format)
+                        if table:
+                            blocks.append(table)
+                    else:
+                        continue
+                    
+                    # Drop finished top-level blocks to keep memory flat
+                    if body is not None and not paragraph_depth and not table_depth:
+                        body.clear()
+                        check_cancelled()
+        
+        metadata.update({
+            'paragraphs': paragraphs,
+            'sections': sections,
+            'tables': tables,
+        })
+        
+        return {
+            'content': '\n\n'.join(blocks),
+            'metadata': metadata,
+            'format': 'docx'
+        }
+    
+    @staticmethod
+    def _paragraph_text(paragraph: ElementTree.Element) -> str:
+        """Concatenate the runs of a paragraph."""
+        parts = []
+        for node in paragraph.iter():
+            tag = node.tag
+            if tag == W_T:
+                if node.text:
+                    parts.append(node.text)
+            elif tag == W_TAB:
+                parts.append('\t')
+            elif tag == W_BR or tag == W_CR:
+                parts.append('\n')
+        return ''.join(parts)
+    
+    @staticmethod
+    def _heading_level(paragraph: ElementTree.Element, heading_styles: Dict[str, int]) -> int:
+        """Return the heading level of a paragraph, or 0 for body text."""
+        properties = paragraph.find(W_PPR)
+        if properties is None:
+            return 0
+        outline = properties.find(W_OUTLINE)
+        if outline is not None:
+            level = int(outline.get(W_VAL, '9'))
+            if level < 9:
+                return level + 1
+        style = properties.find(W_PSTYLE)
+        if style is not None:
+            return heading_styles.get(style.get(W_VAL, ''), 0)
+        return 0
+    
+    def _table_text(self, table: ElementTree.Element, table_format: str) -> str:
+        """Render a table with its first row as the header."""
+        writer = TableWriter(table_format)
+        for index, row in enumerate(table.iterfind(W_TR)):
+            cells = []
+            for cell in row.iterfind(W_TC):
+                text = ' '.join(
+                    t for t in (self._paragraph_text(p) for p in cell.iter(W_P)) if t.strip()
+                )
+                cells.append(text)
+                # Keep columns aligned across horizontally merged cells
+                span = cell.find(f'{W_TCPR}/{W_GRIDSPAN}')
+                if span is not None:
+                    cells.extend([''] * (int(span.get(W_VAL, '1')) - 1))
+            if index == 0:
+                writer.header(cells)
+            else:
+                writer.row(cells)
+        return writer.getvalue()
+    
+    @staticmethod
+    def _read_heading_styles(archive: zipfile.ZipFile, names: set) -> Dict[str, int]:
+        """Map paragraph style IDs to heading levels using word/styles.xml."""
+        heading_styles: Dict[str, int] = {}
+        if 'word/styles.xml' not in names:
+            return heading_styles
+        
+        with archive.open('word/styles.xml') as f:
+            styles = ElementTree.parse(f).getroot()
+        for style in styles.iterfind(f'{W}style'):
+            if style.get(f'{W}type') != 'paragraph':
+                continue
+            style_id = style.get(f'{W}styleId', '')
+            name = style.find(f'{W}name')
+            name = name.get(W_VAL, '') if name is not None else ''
+            outline = style.find(f'{W_PPR}/{W_OUTLINE}')
             
-        except Exception as e:
-            logger.error(f"Failed to parse DOCX {file_path}: {e}")
-            raise DocumentParseError(f"DOCX parse error: {e}")
+            match = HEADING_STYLE.match(name) or HEADING_STYLE.match(style_id)
+            if match:
+                heading_styles[style_id] = int(match.group(1))
+            elif name.lower() == 'title':
+                heading_styles[style_id] = 1
+            elif outline is not None and int(outline.get(W_VAL, '9')) < 9:
+                heading_styles[style_id] = int(outline.get(W_VAL)) + 1
+        return heading_styles
     
-    def supports_format(self, file_extension: str) -> bool:
-        """Check if format is supported."""
-        return file_extension.lower() in ['.docx', '.doc']
+    @staticmethod
+    def _read_core_properties(archive: zipfile.ZipFile, names: set) -> Dict[str, Any]:
+        """Read title/author/dates from docProps/core.xml."""
+        metadata = {key: '' for key in CORE_PROPERTIES}
+        if 'docProps/core.xml' not in names:
+            return metadata
+        
+        with archive.open('docProps/core.xml') as f:
+            properties = ElementTree.parse(f).getroot()
+        for key, tag in CORE_PROPERTIES.items():
+            node: Optional[ElementTree.Element] = properties.find(tag)
+            if node is not None and node.text:
+                text = node.text.strip()
+                metadata[key] = DOCXParser._format_date(text) if key in DATE_PROPERTIES else text
+        return metadata
+    
+    @staticmethod
+    def _format_date(w3cdtf: str) -> str:
+        """
+        Format a W3CDTF date as python-docx core properties did: str() of a
+        naive UTC datetime, e.g. '2024-01-02 03:04:05'.
+        """
+        try:
+            value = datetime.fromisoformat(w3cdtf)
+        except ValueError:
+            # Year or year-month only
+            for template in ('%Y-%m', '%Y'):
+                try:
+                    value = datetime.strptime(w3cdtf, template)
+                    break
+                except ValueError:
+                    continue
+            else:
+                return w3cdtf
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return str(value.replace(microsecond=0))
@@ -0,0 +1,59 @@
+"""Text encoding detection for parsers."""
+import codecs
+from pathlib import Path
+
+
+# Longest BOMs first: the UTF-32 LE BOM starts with the UTF-16 LE BOM
+BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+SAMPLE_BYTES = 64 * 1024
+
+
+def detect_encoding(sample: bytes) -> str:
+    """
+    Detect text encoding from a leading byte sample.
+    
+    Checks for a BOM first, then BOM-less UTF-16 (NUL bytes on one side of
+    each code unit), then strict UTF-8. Anything else is treated as cp1252,
+    falling back to latin-1 which accepts every byte.
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    
+    if not sample:
+        return 'utf-8'
+    
+    # BOM-less UTF-16: ASCII-heavy text has NULs in every other byte
+    even_nuls = sample[0::2].count(0)
+    odd_nuls = sample[1::2].count(0)
+    half = len(sample) / 2
+    if odd_nuls > half * 0.3 and even_nuls < half * 0.05:
+        return 'utf-16-le'
+    if even_nuls > half * 0.3 and odd_nuls < half * 0.05:
+        return 'utf-16-be'
+    
+    # The sample may end mid-character, so decode it incrementally
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    try:
+        sample.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def detect_file_encoding(file_path: Path) -> str:
+    """Detect text encoding of a file from its first bytes."""
+    with open(file_path, 'rb') as f:
+        return detect_encoding(f.read(SAMPLE_BYTES))
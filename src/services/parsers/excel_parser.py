@@ -1,47 +1,183 @@
 """Excel document parser."""
 from pathlib import Path
-from typing import Dict, Any
-import pandas as pd
+from typing import Dict, Any, Iterator, List, Optional
+import openpyxl
+from src.config import settings
 from src.services.parsers.base import BaseParser
-from src.utils.logger import logger
-from src.utils.errors import DocumentParseError
+from src.services.parsers.tabular import TableWriter, row_window
+from src.utils.deadline import check_cancelled
+from src.utils.errors import ValidationError
+from src.utils.progress import report_progress
+
+
+# Rows streamed between cancellation checks
+CANCEL_CHECK_ROWS = 1000
 
 
 class ExcelParser(BaseParser):
-    """Parse Excel spreadsheets."""
+    """
+    Parse Excel spreadsheets.
+    
+    .xlsx workbooks are opened with openpyxl in read-only mode, so sheets
+    are streamed row by row and unrequested sheets are never loaded. Legacy
+    .xls workbooks are read with xlrd, which loads one requested sheet at a
+    time; rows are converted only up to the end of the row window. The same
+    options apply to both.
+    
+    Options:
+        sheets: Sheet names or 0-based indices to parse (default: all)
+        list_sheets: Only list sheet names, without reading any sheet
+        start_row: First data row per sheet (0-based, header excluded)
+        max_rows: Maximum number of data rows per sheet
+        max_cells: Stop after this many cells (default: excel_max_cells)
+        table_format: 'tsv' (default) or 'markdown'
+    """
     
-    async def parse(self, file_path: Path) -> Dict[str, Any]:
-        """Parse Excel document."""
+    format_name = 'Excel'
+    
+    def parse_sync(self, file_path: Path, **options: Any) -> Dict[str, Any]:
+        """Stream the requested sheets and rows into compact table text."""
+        start_row, max_rows = row_window(options)
+        max_cells = options.get('max_cells', settings.excel_max_cells)
+        if not isinstance(max_cells, int) or max_cells < 1:
+            raise ValidationError(f"max_cells must be a positive integer: {max_cells!r}")
+        writer = TableWriter(options.get('table_format', 'tsv'))
+        
+        legacy = file_path.suffix.lower() == '.xls'
+        if legacy:
+            # openpyxl cannot read .xls
+            import xlrd
+            workbook = xlrd.open_workbook(file_path, on_demand=True)
+        else:
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
         try:
-            logger.info(f"Parsing Excel: {file_path.name}")
-            
-            # Read all sheets
-            excel_file = pd.ExcelFile(file_path)
-            sheets_content = []
-            
-            for sheet_name in excel_file.sheet_names:
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                
-                # Convert to readable format
-                sheet_content = f"[Sheet: {sheet_name}]\n"
-                sheet_content += df.to_string(index=False)
-                sheets_content.append(sheet_content)
-            
+            sheet_names = workbook.sheet_names() if legacy else workbook.sheetnames
             metadata = {
-                'sheets': excel_file.sheet_names,
-                'sheet_count': len(excel_file.sheet_names),
+                'sheets': sheet_names,
+                'sheet_count': len(sheet_names),
             }
+            if options.get('list_sheets'):
+                return {
+                    'content': '\n'.join(sheet_names),
+                    'metadata': metadata,
+                    'format': 'xlsx'
+                }
             
-            return {
-                'content': '\n\n'.join(sheets_content),
-                'metadata': metadata,
-                'format': 'xlsx'
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to parse Excel {file_path}: {e}")
-            raise DocumentParseError(f"Excel parse error: {e}")
+            cells = 0
+            selected = self._select_sheets(sheet_names, options.get('sheets'))
+            for done, sheet_name in enumerate(selected):
+                check_cancelled()
+                report_progress(done, len(selected), f"Parsing sheet {sheet_name}")
+                if writer.parts:
+                    writer.text('')
+                writer.text(f"[Sheet: {sheet_name}]")
+                rows = self._legacy_rows(workbook, sheet_name) if legacy else \
+                    workbook[sheet_name].iter_rows(values_only=True)
+                cells = self._write_sheet(rows, writer, start_row, max_rows, cells, max_cells)
+                if cells > max_cells:
+                    writer.text(f"[Truncated: cell budget of {max_cells} reached]")
+                    break
+        finally:
+            if legacy:
+                workbook.release_resources()
+            else:
+                workbook.close()
+        
+        return {
+            'content': writer.getvalue(),
+            'metadata': metadata,
+            'format': 'xlsx'
+        }
+    
+    def _write_sheet(
+        self,
+        rows: Iterator[tuple],
+        writer: TableWriter,
+        start_row: int,
+        max_rows: Optional[int],
+        cells: int,
+        max_cells: int
+    ) -> int:
+        """
+        Stream one sheet's rows (header first) into the writer.
+        
+        Returns:
+            Running cell count, or max_cells + 1 if the budget ran out
+        """
+        header = self._trim(next(rows, ()))
+        if cells + len(header) > max_cells:
+            return max_cells + 1
+        writer.header(header)
+        cells += len(header)
+        
+        end_row = start_row + max_rows if max_rows is not None else None
+        index = 0
+        for row in rows:
+            if end_row is not None and index >= end_row:
+                break
+            if index % CANCEL_CHECK_ROWS == 0:
+                check_cancelled()
+            values = self._trim(row)
+            if not values:
+                continue
+            if index >= start_row:
+                if cells + len(values) > max_cells:
+                    return max_cells + 1
+                writer.row(values)
+                cells += len(values)
+            index += 1
+        
+        return cells
+    
+    @staticmethod
+    def _select_sheets(sheet_names: List[str], requested: Optional[Any]) -> List[str]:
+        """Resolve requested sheet names/indices against the workbook."""
+        if requested is None:
+            return sheet_names
+        if isinstance(requested, (str, int)):
+            requested = [requested]
+        
+        selected = []
+        for sheet in requested:
+            if isinstance(sheet, int) and 0 <= sheet < len(sheet_names):
+                selected.append(sheet_names[sheet])
+            elif isinstance(sheet, str) and sheet in sheet_names:
+                selected.append(sheet)
+            else:
+                raise ValidationError(f"Sheet not found: {sheet!r}", {'sheets': sheet_names})
+        return selected
+    
+    @staticmethod
+    def _trim(row: tuple) -> tuple:
+        """Drop trailing empty cells that read-only mode pads rows with."""
+        end = len(row)
+        while end and (row[end - 1] is None or row[end - 1] == ''):
+            end -= 1
+        return row[:end]
+    
+    @classmethod
+    def _legacy_rows(cls, workbook: Any, sheet_name: str) -> Iterator[tuple]:
+        """Rows of a legacy .xls sheet, converted one at a time as they are read."""
+        sheet = workbook.sheet_by_name(sheet_name)
+        try:
+            for index in range(sheet.nrows):
+                yield tuple(cls._legacy_value(cell, workbook.datemode) for cell in sheet.row(index))
+        finally:
+            workbook.unload_sheet(sheet_name)
     
-    def supports_format(self, file_extension: str) -> bool:
-        """Check if format is supported."""
-        return file_extension.lower() in ['.xlsx', '.xls']
+    @staticmethod
+    def _legacy_value(cell: Any, datemode: int) -> Any:
+        """xlrd cell value as openpyxl would give it: None when empty, ints, dates and bools typed."""
+        import xlrd
+        
+        if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+            return None
+        if cell.ctype == xlrd.XL_CELL_NUMBER:
+            return int(cell.value) if cell.value.is_integer() else cell.value
+        if cell.ctype == xlrd.XL_CELL_DATE:
+            return xlrd.xldate_as_datetime(cell.value, datemode)
+        if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+            return bool(cell.value)
+        if cell.ctype == xlrd.XL_CELL_ERROR:
+            return xlrd.error_text_from_code.get(cell.value)
+        return cell.value
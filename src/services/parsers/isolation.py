@@ -0,0 +1,117 @@
+"""
+Parsing in a killable child process.
+
+A parse thread can only stop at its next check_cancelled(), and a single
+library call (loading a workbook, laying out a PDF page) can run for a long
+time without one. Large documents are therefore parsed in a child process;
+when the request is cancelled the child is killed and its memory returned
+at once.
+
+Children are not forked from the worker itself: it runs threads (the
+executor, the log listener, the RSS monitor, trace exporters), and a lock
+one of them holds at fork time would deadlock the child. They come from a
+fork server, a fresh single-threaded process started on first use, which
+has the third-party parser libraries imported so children start quickly.
+
+The child sends progress and the result back over a pipe, so progress
+notifications and the parse result look the same as for a thread parse.
+"""
+import asyncio
+import contextvars
+import multiprocessing
+import resource
+import signal
+from multiprocessing import forkserver
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from src.utils.errors import DocumentParseError
+from src.utils.logger import stop_log_listener
+from src.utils.memory import current_rss, rss_monitor
+from src.utils.metrics import ABANDONED_WORK
+from src.utils.progress import progress_reporter, report_progress
+
+ParseFunc = Callable[..., Dict[str, Any]]
+
+# Imported once in the fork server. Only libraries that start no threads on
+# import: the application's own modules set up the log listener.
+FORKSERVER_PRELOAD = ['openpyxl', 'pdfplumber', 'pypdfium2', 'xlrd']
+
+_context = multiprocessing.get_context('forkserver')
+_context.set_forkserver_preload(FORKSERVER_PRELOAD)
+
+
+def start_fork_server():
+    """Start this process's fork server now rather than on the first large parse (takes about a second)."""
+    forkserver.ensure_running()
+
+
+def _child(func: ParseFunc, file_path: Path, options: Dict[str, Any], connection: Connection):
+    """Parse in the child and send ('progress', fraction, message)..., then ('result', result, peak_delta) or ('error', exc)."""
+    # The worker's handlers would only flag a server that does not run here
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    try:
+        start = current_rss()
+        with progress_reporter(lambda fraction, message: connection.send(('progress', fraction, message))):
+            result = func(file_path, **options)
+        peak = _peak_rss()
+        connection.send(('result', result, peak - start if peak and start else None))
+    except BaseException as e:
+        try:
+            connection.send(('error', e))
+        except Exception:
+            # The exception could not be pickled
+            connection.send(('error', DocumentParseError(str(e))))
+    finally:
+        connection.close()
+        stop_log_listener()
+
+
+def _peak_rss() -> Optional[int]:
+    """Highest RSS of this process in bytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _receive(connection: Connection, process: multiprocessing.Process) -> Tuple[Dict[str, Any], Optional[int]]:
+    """Relay the child's progress until its result arrives (blocking)."""
+    try:
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                process.join()
+                raise DocumentParseError(f"Parse process exited with code {process.exitcode}")
+            if message[0] == 'progress':
+                report_progress(message[1], message=message[2])
+            elif message[0] == 'result':
+                return message[1], message[2]
+            else:
+                raise message[1]
+    finally:
+        connection.close()
+        process.join()
+
+
+async def run_in_subprocess(func: ParseFunc, file_path: Path, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run func(file_path, **options) in a child process, killed if the caller is cancelled."""
+    receiver, sender = _context.Pipe(duplex=False)
+    process = _context.Process(
+        target=_child, args=(func, file_path, options, sender), name=f"parse-{file_path.name}", daemon=True
+    )
+    process.start()
+    # Only the child may hold the write end, or EOF never arrives when it dies
+    sender.close()
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(None, contextvars.copy_context().run, _receive, receiver, process)
+    try:
+        result, peak_delta = await asyncio.shield(future)
+    except asyncio.CancelledError:
+        process.kill()
+        ABANDONED_WORK.labels(kind='process').inc()
+        # The relay thread sees EOF and fails; retrieve that so it is not reported
+        future.add_done_callback(lambda finished: finished.cancelled() or finished.exception())
+        raise
+    if peak_delta is not None:
+        rss_monitor.record_child(peak_delta)
+    return result
@@ -0,0 +1,74 @@
+"""Compact row rendering for tabular parsers."""
+from typing import Any, Dict, Iterable, List, Optional
+from src.utils.errors import ValidationError
+
+
+TABLE_FORMATS = ('tsv', 'markdown')
+
+
+def _cell_text(value: Any) -> str:
+    """Render a single cell value on one line."""
+    if value is None:
+        return ''
+    text = value if isinstance(value, str) else str(value)
+    if '\n' in text or '\r' in text or '\t' in text:
+        text = ' '.join(text.split())
+    return text
+
+
+class TableWriter:
+    """Render table rows incrementally as TSV or Markdown."""
+    
+    def __init__(self, table_format: str = 'tsv'):
+        if table_format not in TABLE_FORMATS:
+            raise ValidationError(
+                f"Unsupported table_format: {table_format} (expected one of {TABLE_FORMATS})"
+            )
+        self.table_format = table_format
+        self.parts: List[str] = []
+        self.width = 0
+    
+    def header(self, columns: Iterable[Any]):
+        """Write the header row."""
+        cells = [_cell_text(c) for c in columns]
+        self.width = len(cells)
+        if self.table_format == 'markdown':
+            self.parts.append(self._markdown_line(cells))
+            self.parts.append('|' + ' --- |' * max(self.width, 1) + '\n')
+        else:
+            self.parts.append('\t'.join(cells) + '\n')
+    
+    def row(self, values: Iterable[Any]):
+        """Write a data row."""
+        cells = [_cell_text(v) for v in values]
+        if self.table_format == 'markdown':
+            # Markdown tables need every row padded to the header width
+            if len(cells) < self.width:
+                cells.extend([''] * (self.width - len(cells)))
+            self.parts.append(self._markdown_line(cells))
+        else:
+            self.parts.append('\t'.join(cells) + '\n')
+    
+    def text(self, line: str):
+        """Write a free-form line (sheet titles, truncation notes)."""
+        self.parts.append(line + '\n')
+    
+    def getvalue(self) -> str:
+        """Return everything written so far."""
+        return ''.join(self.parts).rstrip('\n')
+    
+    @staticmethod
+    def _markdown_line(cells: List[str]) -> str:
+        escaped = [c.replace('|', '\\|') for c in cells]
+        return '| ' + ' | '.join(escaped) + ' |\n'
+
+
+def row_window(options: Dict[str, Any]) -> tuple[int, Optional[int]]:
+    """Validate and return (start_row, max_rows) parse options."""
+    start_row = options.get('start_row', 0)
+    max_rows = options.get('max_rows')
+    if not isinstance(start_row, int) or start_row < 0:
+        raise ValidationError(f"start_row must be a non-negative integer: {start_row!r}")
+    if max_rows is not None and (not isinstance(max_rows, int) or max_rows < 0):
+        raise ValidationError(f"max_rows must be a non-negative integer: {max_rows!r}")
+    return start_row, max_rows
@@ -1,43 +1,163 @@
 """Text document parser."""
+import codecs
+import mmap
 from pathlib import Path
-from typing import Dict, Any
-import aiofiles
+from typing import Dict, Any, Optional
 from src.services.parsers.base import BaseParser
-from src.utils.logger import logger
-from src.utils.errors import DocumentParseError
+from src.services.parsers.encoding import detect_encoding, SAMPLE_BYTES
+from src.utils.errors import ValidationError
+
+
+SCAN_CHUNK_BYTES = 8 * 1024 * 1024
+
+# BOMs each BOM-aware codec may carry, with the explicit codec to decode as
+BOM_CODECS = {
+    'utf-8': [(codecs.BOM_UTF8, 'utf-8')],
+    'utf-8-sig': [(codecs.BOM_UTF8, 'utf-8')],
+    'utf-16': [(codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be')],
+    'utf-32': [(codecs.BOM_UTF32_LE, 'utf-32-le'), (codecs.BOM_UTF32_BE, 'utf-32-be')],
+}
+BOMLESS_DEFAULTS = {'utf-8-sig': 'utf-8', 'utf-16': 'utf-16-le', 'utf-32': 'utf-32-le'}
 
 
 class TextParser(BaseParser):
-    """Parse plain text and markdown files."""
+    """
+    Parse plain text and markdown files.
     
-    async def parse(self, file_path: Path) -> Dict[str, Any]:
-        """Parse text document."""
-        try:
-            logger.info(f"Parsing text file: {file_path.name}")
-            
-            # Read file content
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
-            
-            # Get file stats
-            stats = file_path.stat()
-            
-            metadata = {
-                'size_bytes': stats.st_size,
-                'lines': len(content.splitlines()),
-                'encoding': 'utf-8',
-            }
+    The file is memory-mapped: line counts come from a chunked byte scan
+    and a requested line range is located by byte offset, so only the
+    returned lines are ever decoded.
+    
+    Options:
+        start_line: First line to return (1-based, default 1)
+        end_line: Last line to return, inclusive (default: end of file)
+        encoding: Override detected encoding
+    """
+    
+    format_name = 'Text'
+    
+    def parse_sync(self, file_path: Path, **options: Any) -> Dict[str, Any]:
+        """Decode the requested line range of a memory-mapped file."""
+        start_line, end_line = self._line_window(options)
+        ranged = start_line > 1 or end_line is not None
+        
+        size = file_path.stat().st_size
+        if size == 0:
+            return self._result(file_path, '', size, 0, options.get('encoding') or 'utf-8')
+        
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            encoding = options.get('encoding') or detect_encoding(mm[:SAMPLE_BYTES])
+            codec, offset = self._resolve_codec(encoding, mm)
+            newline = '\n'.encode(codec)
             
-            return {
-                'content': content,
-                'metadata': metadata,
-                'format': file_path.suffix.lstrip('.')
-            }
+            lines = self._count_lines(mm, offset, codec, newline)
             
-        except Exception as e:
-            logger.error(f"Failed to parse text {file_path}: {e}")
-            raise DocumentParseError(f"Text parse error: {e}")
+            if ranged:
+                begin = self._line_offset(mm, offset, start_line - 1, newline)
+                end = (
+                    self._line_offset(mm, begin, end_line - start_line + 1, newline)
+                    if end_line is not None else size
+                )
+                content = mm[begin:end].decode(codec, errors='replace')
+            else:
+                content = mm[offset:].decode(codec, errors='replace')
+        
+        result = self._result(file_path, content, size, lines, encoding)
+        if ranged:
+            result['metadata']['start_line'] = start_line
+            result['metadata']['end_line'] = min(end_line or lines, lines)
+        return result
+    
+    @staticmethod
+    def _result(file_path: Path, content: str, size: int, lines: int, encoding: str) -> Dict[str, Any]:
+        """Build the parser result for decoded text."""
+        metadata = {
+            'size_bytes': size,
+            'lines': lines,
+            'encoding': encoding,
+        }
+        
+        return {
+            'content': content,
+            'metadata': metadata,
+            'format': file_path.suffix.lstrip('.')
+        }
+    
+    @staticmethod
+    def _line_window(options: Dict[str, Any]) -> tuple[int, Optional[int]]:
+        """Validate and return (start_line, end_line) parse options."""
+        start_line = options.get('start_line', 1)
+        end_line = options.get('end_line')
+        if not isinstance(start_line, int) or start_line < 1:
+            raise ValidationError(f"start_line must be a positive integer: {start_line!r}")
+        if end_line is not None and (not isinstance(end_line, int) or end_line < start_line):
+            raise ValidationError(f"end_line must be an integer >= start_line: {end_line!r}")
+        return start_line, end_line
+    
+    @staticmethod
+    def _resolve_codec(encoding: str, mm: mmap.mmap) -> tuple[str, int]:
+        """
+        Resolve an encoding to a BOM-less codec and the content offset.
+        
+        BOM-aware codecs (utf-8-sig, utf-16, utf-32) are mapped to their
+        explicit-endian form so byte offsets can be decoded independently.
+        """
+        name = codecs.lookup(encoding).name
+        for bom, codec in BOM_CODECS.get(name, []):
+            if mm[:len(bom)] == bom:
+                return codec, len(bom)
+        return BOMLESS_DEFAULTS.get(name, name), 0
+    
+    @staticmethod
+    def _count_lines(mm: mmap.mmap, offset: int, codec: str, newline: bytes) -> int:
+        """Count lines the way str.splitlines() does for '\\n' endings."""
+        size = len(mm)
+        if size <= offset:
+            return 0
+        
+        count = 0
+        if len(newline) == 1:
+            # Single-byte newline cannot occur inside a multi-byte sequence
+            for pos in range(offset, size, SCAN_CHUNK_BYTES):
+                count += mm[pos:pos + SCAN_CHUNK_BYTES].count(newline)
+        else:
+            # Wide encodings: decode chunk by chunk so matches stay aligned
+            decoder = codecs.getincrementaldecoder(codec)(errors='replace')
+            for pos in range(offset, size, SCAN_CHUNK_BYTES):
+                count += decoder.decode(mm[pos:pos + SCAN_CHUNK_BYTES]).count('\n')
+        
+        if mm[size - len(newline):] != newline:
+            count += 1
+        return count
     
-    def supports_format(self, file_extension: str) -> bool:
-        """Check if format is supported."""
-        return file_extension.lower() in ['.txt', '.md', '.markdown', '.json', '.yaml', '.yml']
+    @staticmethod
+    def _line_offset(mm: mmap.mmap, start: int, skip: int, newline: bytes) -> int:
+        """Return the byte offset just past the next `skip` newlines from start."""
+        pos = start
+        width = len(newline)
+        size = len(mm)
+        if not skip:
+            return start
+        
+        if width == 1:
+            # Skip whole chunks with a vectorised count first
+            while pos < size:
+                chunk = mm[pos:pos + SCAN_CHUNK_BYTES]
+                found = chunk.count(newline)
+                if found >= skip:
+                    break
+                skip -= found
+                pos += len(chunk)
+            else:
+                return size
+        
+        while skip:
+            index = mm.find(newline, pos)
+            # Wide newlines must start on a code unit boundary
+            while index != -1 and (index - start) % width:
+                index = mm.find(newline, index + 1)
+            if index == -1:
+                return size
+            pos = index + width
+            skip -= 1
+        return pos
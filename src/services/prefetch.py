@@ -0,0 +1,161 @@
+"""
+Background prefetch of configured sources into the document cache.
+
+One worker per host runs the crawler (an flock on a file in the cache
+directory decides which; if that worker exits another takes over on its
+next tick). Each cycle lists every configured location and re-reads
+documents that are new, changed, or close to expiring, so common reads are
+warm before an agent asks for them.
+"""
+import asyncio
+import fcntl
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from src.config import settings
+from src.services.cache import cache_key, document_cache
+from src.services.credentials import credential_provider
+from src.services.documents import download_document, parse_document, source_version
+from src.services.readers import reader_registry
+from src.utils.logger import logger, log_metrics
+
+# Entries are refreshed once less than this fraction of their TTL remains
+REFRESH_AHEAD = 0.2
+
+
+class Prefetcher:
+    """Periodic crawler that keeps configured sources warm in the document cache."""
+    
+    def __init__(
+        self,
+        sources: Dict[str, str],
+        interval_seconds: int,
+        concurrency_per_source: int,
+        cpu_budget: float,
+        lock_path: Path
+    ):
+        self.sources = sources
+        self.interval = interval_seconds
+        self.concurrency = concurrency_per_source
+        self.cpu_budget = cpu_budget
+        self.lock_path = lock_path
+        self._lock_fd: Optional[int] = None
+        self._parse_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the crawler on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name='prefetch')
+    
+    async def stop(self):
+        """Cancel the crawler and give up the host lock."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+    
+    def _acquire_host_lock(self) -> bool:
+        """Whether this process is (or just became) the host's prefetcher."""
+        if self._lock_fd is not None:
+            return True
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        logger.info("Prefetcher active in this worker", extra={'data': {'pid': os.getpid()}})
+        return True
+    
+    async def _run(self):
+        while True:
+            if self._acquire_host_lock():
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logger.error(f"Prefetch cycle failed: {e}")
+            await asyncio.sleep(self.interval)
+    
+    async def run_once(self) -> Dict[str, int]:
+        """Crawl every configured source once."""
+        start = time.perf_counter()
+        counts = await asyncio.gather(*(
+            self._crawl(source, credentials_path)
+            for source, credentials_path in self.sources.items()
+        ))
+        totals = {
+            'listed': sum(c['listed'] for c in counts),
+            'fetched': sum(c['fetched'] for c in counts),
+            'failed': sum(c['failed'] for c in counts),
+        }
+        log_metrics('prefetch.cycle_ms', round((time.perf_counter() - start) * 1000, 1), **totals)
+        await asyncio.to_thread(document_cache.prune)
+        return totals
+    
+    async def _crawl(self, source: str, credentials_path: str) -> Dict[str, int]:
+        counts = {'listed': 0, 'fetched': 0, 'failed': 0}
+        try:
+            credentials = await credential_provider.get(credentials_path)
+            files = await reader_registry.list_documents(source, credentials)
+        except Exception as e:
+            logger.warning(f"Prefetch listing failed for {source}: {e}")
+            counts['failed'] += 1
+            return counts
+        
+        max_size = settings.max_document_size_mb * 1024 * 1024
+        files = [f for f in files if f.get('size', 0) <= max_size]
+        counts['listed'] = len(files)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def fetch(entry: Dict[str, Any]):
+            version = source_version(entry['path']) or f"{entry.get('size')}:{entry.get('modified')}"
+            key = cache_key(entry['path'], credentials_path, {})
+            min_ttl = settings.cache_ttl_seconds * REFRESH_AHEAD
+            if await document_cache.fresh(key, version, min_ttl=min_ttl):
+                return
+            try:
+                async with semaphore:
+                    file_path = await download_document(entry['path'], credentials)
+                await self._parse(file_path, key, version)
+                counts['fetched'] += 1
+            except Exception as e:
+                counts['failed'] += 1
+                logger.warning(f"Prefetch failed for {entry['path']}: {e}")
+        
+        await asyncio.gather(*(fetch(entry) for entry in files))
+        return counts
+    
+    async def _parse(self, file_path: Path, key: str, version: str):
+        """
+        Parse and cache one downloaded document within the CPU budget.
+        
+        Downloads run concurrency_per_source at a time per source, but parses
+        run one at a time, each followed by an idle period in proportion to
+        its duration, so the crawler spends at most cpu_budget of one core
+        parsing.
+        """
+        async with self._parse_lock:
+            start = time.perf_counter()
+            await parse_document(file_path, key, version)
+            busy = time.perf_counter() - start
+            await asyncio.sleep(busy * (1 / self.cpu_budget - 1))
+
+
+# Global prefetcher
+prefetcher = Prefetcher(
+    settings.prefetch_sources,
+    interval_seconds=settings.prefetch_interval_seconds,
+    concurrency_per_source=settings.prefetch_concurrency_per_source,
+    cpu_budget=settings.prefetch_cpu_budget,
+    lock_path=Path(settings.cache_dir) / "prefetch.lock",
+)
@@ -0,0 +1,247 @@
+"""
+Admission control for tool calls: per-agent rate limits and a host-wide
+concurrency limit.
+
+State lives in files under settings.rate_limit_state_dir so that every
+uvicorn worker on the host enforces the same limits:
+
+- Token buckets are records in a memory-mapped table, updated under an
+  exclusive flock held for a few microseconds.
+- Concurrency slots are lock files; a request holds an flock on one slot
+  while it runs. The kernel drops the lock if a worker dies, so crashed
+  workers cannot leak slots.
+"""
+import asyncio
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Optional, Set
+from src.config import settings
+from src.utils.errors import RateLimitError, ServiceOverloadedError
+from src.utils.logger import logger
+from src.utils.metrics import ADMISSION_REJECTIONS, QUEUED_REQUESTS
+
+
+# (agent key hash, tokens, last update as time.monotonic())
+BUCKET = struct.Struct('<Qdd')
+BUCKET_SLOTS = 4096
+BUCKET_PROBES = 8
+
+
+class TokenBucketTable:
+    """Fixed-size open-addressing table of token buckets in a shared file."""
+    
+    def __init__(self, path: Path, rate_per_second: float, capacity: float, slots: int = BUCKET_SLOTS):
+        self.path = path
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.slots = slots
+        self._pid: Optional[int] = None
+        self._fd = -1
+        self._map: Optional[mmap.mmap] = None
+    
+    def _open(self):
+        """Map the table; reopened after fork so each process has its own descriptor."""
+        if self._pid == os.getpid():
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        size = BUCKET.size * self.slots
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        self._pid = os.getpid()
+    
+    def take(self, key: str) -> float:
+        """
+        Take one token for key.
+        
+        Returns:
+            0 if the request is allowed, else seconds until a token is available
+        """
+        self._open()
+        key_hash = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            now = time.monotonic()
+            offset, found = self._find(key_hash, now)
+            if found:
+                _, tokens, updated = BUCKET.unpack_from(self._map, offset)
+                # A clock earlier than the record means the host rebooted
+                elapsed = now - updated if now >= updated else self.capacity / self.rate
+                tokens = min(self.capacity, tokens + elapsed * self.rate)
+            else:
+                tokens = self.capacity
+            
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            BUCKET.pack_into(self._map, offset, key_hash, tokens, now)
+            return wait
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+    
+    def _find(self, key_hash: int, now: float) -> tuple[int, bool]:
+        """Offset of key's bucket, or of the slot to reuse for it."""
+        refill_seconds = self.capacity / self.rate
+        reusable = None
+        oldest = None
+        for probe in range(BUCKET_PROBES):
+            offset = ((key_hash + probe) % self.slots) * BUCKET.size
+            stored, _, updated = BUCKET.unpack_from(self._map, offset)
+            if stored == key_hash:
+                return offset, True
+            # Empty slots and buckets that would have refilled completely are free
+            if reusable is None and (stored == 0 or not 0 <= now - updated < refill_seconds):
+                reusable = offset
+            if oldest is None or updated < oldest[1]:
+                oldest = (offset, updated)
+        return (reusable if reusable is not None else oldest[0]), False
+
+
+class ConcurrencyLimiter:
+    """Host-wide cap on concurrent requests with a bounded per-worker wait queue."""
+    
+    def __init__(self, state_dir: Path, limit: int, max_queued: int, queue_timeout: float):
+        self.state_dir = state_dir
+        self.limit = limit
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.queued = 0
+        self._pid: Optional[int] = None
+        self._fds: list[int] = []
+        self._held: Set[int] = set()
+        self._released = asyncio.Event()
+    
+    def _open(self):
+        """Open slot files; flock is per open file, so each process needs its own."""
+        if self._pid == os.getpid():
+            return
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self._fds = [
+            os.open(self.state_dir / f"slot-{index}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+            for index in range(self.limit)
+        ]
+        self._held = set()
+        self._pid = os.getpid()
+    
+    def try_acquire(self) -> Optional[int]:
+        """Lock a free slot without waiting."""
+        self._open()
+        # Start at a per-process offset so workers rarely probe the same slots
+        start = self._pid % self.limit
+        for step in range(self.limit):
+            index = (start + step) % self.limit
+            if index in self._held:
+                continue
+            try:
+                fcntl.flock(self._fds[index], fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            self._held.add(index)
+            return index
+        return None
+    
+    async def acquire(self) -> int:
+        """Lock a slot, waiting up to queue_timeout in the local queue."""
+        slot = self.try_acquire()
+        if slot is not None:
+            return slot
+        
+        if self.queued >= self.max_queued:
+            ADMISSION_REJECTIONS.labels(reason='queue_full').inc()
+            raise ServiceOverloadedError("Server busy: request queue is full", {'retry_after': 1})
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.queue_timeout
+        delay = 0.005
+        self.queued += 1
+        QUEUED_REQUESTS.inc()
+        try:
+            while True:
+                released = self._released
+                slot = self.try_acquire()
+                if slot is not None:
+                    return slot
+                
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    ADMISSION_REJECTIONS.labels(reason='queue_timeout').inc()
+                    raise ServiceOverloadedError(
+                        f"Server busy: no capacity within {self.queue_timeout}s",
+                        {'retry_after': 1}
+                    )
+                
+                # Local releases wake waiters at once; other workers' are seen by polling
+                try:
+                    await asyncio.wait_for(released.wait(), min(delay, remaining))
+                except asyncio.TimeoutError:
+                    delay = min(delay * 2, 0.05)
+        finally:
+            self.queued -= 1
+            QUEUED_REQUESTS.dec()
+    
+    def release(self, slot: int):
+        """Unlock a slot and wake local waiters."""
+        fcntl.flock(self._fds[slot], fcntl.LOCK_UN)
+        self._held.discard(slot)
+        released, self._released = self._released, asyncio.Event()
+        released.set()
+
+
+class AdmissionController:
+    """Applies the per-agent rate limit, then the concurrency limit."""
+    
+    def __init__(self):
+        state_dir = Path(settings.rate_limit_state_dir)
+        self.buckets = TokenBucketTable(
+            state_dir / "buckets.bin",
+            rate_per_second=settings.rate_limit_per_minute / 60,
+            capacity=settings.rate_limit_burst,
+        ) if settings.rate_limit_enabled else None
+        self.limiter = ConcurrencyLimiter(
+            state_dir,
+            settings.max_concurrent_requests,
+            settings.max_queued_requests,
+            settings.queue_timeout_seconds,
+        ) if settings.max_concurrent_requests else None
+    
+    async def admit(self, agent_id: str) -> Optional[int]:
+        """
+        Admit a request or raise.
+        
+        Returns:
+            Ticket to pass to release()
+        
+        Raises:
+            RateLimitError: Agent is over its rate limit
+            ServiceOverloadedError: No capacity and queue full or timed out
+        """
+        if self.buckets is not None:
+            wait = self.buckets.take(agent_id)
+            if wait > 0:
+                ADMISSION_REJECTIONS.labels(reason='rate_limited').inc()
+                logger.warning(
+                    f"Rate limit exceeded for agent {agent_id}",
+                    extra={'data': {'agent_id': agent_id, 'retry_after': round(wait, 3)}}
+                )
+                raise RateLimitError("Rate limit exceeded", {'retry_after': wait})
+        
+        if self.limiter is not None:
+            return await self.limiter.acquire()
+        return None
+    
+    def release(self, ticket: Optional[int]):
+        """Release the concurrency slot held by an admitted request."""
+        if ticket is not None:
+            self.limiter.release(ticket)
+
+
+# Global admission controller
+admission_controller = AdmissionController()
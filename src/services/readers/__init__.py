@@ -1,50 +1,167 @@
 """Reader registry and factory."""
+import importlib
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional
+from urllib.parse import urlparse
+from src.config import settings
 from src.services.readers.base import BaseReader
-from src.services.readers.local_reader import LocalReader
-from src.services.readers.smb_reader import SMBReader
-from src.services.readers.git_reader import GitReader
-from src.services.readers.http_reader import HTTPReader
-from src.services.readers.s3_reader import S3Reader
-from src.utils.errors import UnsupportedFormatError
+from src.services.readers.resilience import CircuitBreakers, NotFoundCache
+from src.utils.deadline import deadline_timeout
+from src.utils.errors import CircuitOpenError, NotFoundError, SourceConnectionError, UnsupportedFormatError
 from src.utils.logger import logger
+from src.utils.metrics import FAST_FAILURES, READER_BYTES, READER_ERRORS, READER_LATENCY, observe_latency
+from src.utils.tracing import span
+
+
+# Reader modules are imported on first use so that workers only pay for the
+# client libraries (boto3, GitPython, smbprotocol, ...) of sources they touch.
+# Entries: (protocol, module, class name, URI prefixes, settings flag)
+READER_SPECS: list[tuple[str, str, str, tuple[str, ...], Optional[str]]] = [
+    ('s3', 'src.services.readers.s3_reader', 'S3Reader', ('s3://',), 's3_enabled'),
+    ('git', 'src.services.readers.git_reader', 'GitReader', ('git://',), 'git_enabled'),
+    ('smb', 'src.services.readers.smb_reader', 'SMBReader', ('smb://', '\\\\'), 'smb_enabled'),
+    ('http', 'src.services.readers.http_reader', 'HTTPReader', ('http://', 'https://'), None),
+    ('local', 'src.services.readers.local_reader', 'LocalReader', ('file://',), None),  # Fallback for local paths
+]
+
+
+def source_host(uri: str) -> str:
+    """Host (and port, if given) of a source URI, or the server of a UNC path."""
+    if uri.startswith('\\\\'):
+        return uri[2:].split('\\', 1)[0].lower()
+    parsed = urlparse(uri)
+    host = (parsed.hostname or '').lower()
+    return f"{host}:{parsed.port}" if parsed.port else host
 
 
 class ReaderRegistry:
     """Registry of document source readers."""
     
     def __init__(self):
-        self.readers: list[BaseReader] = [
-            S3Reader(),
-            GitReader(),
-            SMBReader(),
-            HTTPReader(),
-            LocalReader(),  # Fallback for local paths
+        # Disabled sources are dropped up front and never imported
+        self.specs = [
+            spec for spec in READER_SPECS
+            if spec[4] is None or getattr(settings, spec[4])
         ]
+        self.readers: Dict[str, BaseReader] = {}
+        self.import_timings: Dict[str, float] = {}
+        self.breakers = CircuitBreakers(settings.circuit_failure_threshold, settings.circuit_reset_seconds)
+        self.not_found = NotFoundCache(settings.not_found_cache_seconds)
+    
+    def _load_reader(self, module_name: str, class_name: str) -> BaseReader:
+        """Import reader module and instantiate its reader on first use."""
+        reader = self.readers.get(class_name)
+        if reader is None:
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.import_timings[module_name] = elapsed_ms
+            logger.info(f"Loaded reader {class_name} in {elapsed_ms:.1f} ms")
+            
+            reader = getattr(module, class_name)()
+            self.readers[class_name] = reader
+        return reader
+    
+    def get_protocol(self, uri: str) -> str:
+        """Get protocol name of the reader handling a URI."""
+        for protocol, _, _, prefixes, flag in READER_SPECS:
+            if uri.startswith(prefixes):
+                if flag is not None and not getattr(settings, flag):
+                    raise UnsupportedFormatError(f"Source protocol disabled: {protocol}")
+                return protocol
+        if '://' not in uri:
+            return 'local'
+        raise UnsupportedFormatError(f"No reader for protocol: {uri}")
     
     def get_reader(self, uri: str) -> BaseReader:
         """Get reader for protocol."""
-        for reader in self.readers:
-            if reader.supports_protocol(uri):
-                return reader
+        protocol = self.get_protocol(uri)
+        for name, module_name, class_name, _, _ in self.specs:
+            if name == protocol:
+                return self._load_reader(module_name, class_name)
         raise UnsupportedFormatError(f"No reader for protocol: {uri}")
     
+    def preload(self):
+        """Import all enabled reader modules eagerly (e.g. before forking workers)."""
+        for _, module_name, class_name, _, _ in self.specs:
+            self._load_reader(module_name, class_name)
+    
+    def enabled_protocols(self) -> list[str]:
+        """List enabled protocols without importing any reader."""
+        return [spec[0] for spec in self.specs]
+    
+    @contextmanager
+    def _guarded(self, protocol: str, uri: str) -> Iterator[None]:
+        """
+        Fail fast for remote sources known to be missing or down.
+        
+        Connection failures count against the (protocol, host) circuit
+        breaker; any other outcome shows the host is answering. Not-found
+        results are remembered for not_found_cache_seconds.
+        """
+        if protocol == 'local':
+            yield
+            return
+        
+        breaker = self.breakers.get(protocol, source_host(uri))
+        try:
+            self.not_found.check(uri)
+            probe = breaker.before_call()
+        except NotFoundError:
+            FAST_FAILURES.labels(protocol=protocol, reason='not_found').inc()
+            raise
+        except CircuitOpenError:
+            FAST_FAILURES.labels(protocol=protocol, reason='circuit_open').inc()
+            raise
+        
+        try:
+            yield
+        except NotFoundError as e:
+            self.not_found.remember(uri, e)
+            breaker.record_success(probe)
+            raise
+        except SourceConnectionError:
+            breaker.record_failure(probe)
+            raise
+        except Exception:
+            breaker.record_success(probe)
+            raise
+        except BaseException:
+            breaker.record_neutral(probe)
+            raise
+        breaker.record_success(probe)
+    
     async def read_document(self, uri: str, credentials: Dict[str, Any]) -> Path:
         """Read document from any source."""
         logger.info(f"Reading document from: {uri}")
         
+        protocol = self.get_protocol(uri)
         reader = self.get_reader(uri)
-        file_path = await reader.read_file(uri, credentials)
+        # Outside the guard: running out of time says nothing about the host
+        async with deadline_timeout('download'):
+            with self._guarded(protocol, uri):
+                try:
+                    with span('reader.read_document', protocol=protocol), \
+                            observe_latency(READER_LATENCY, protocol=protocol):
+                        file_path = await reader.read_file(uri, credentials)
+                except Exception:
+                    READER_ERRORS.labels(protocol=protocol).inc()
+                    raise
         
+        READER_BYTES.labels(protocol=protocol).inc(file_path.stat().st_size)
         return file_path
     
     async def list_documents(self, uri: str, credentials: Dict[str, Any]) -> List[Dict[str, Any]]:
         """List documents at location."""
         logger.info(f"Listing documents at: {uri}")
         
+        protocol = self.get_protocol(uri)
         reader = self.get_reader(uri)
-        files = await reader.list_files(uri, credentials)
+        async with deadline_timeout('list'):
+            with self._guarded(protocol, uri), span('reader.list_documents', protocol=protocol):
+                files = await reader.list_files(uri, credentials)
         
         return files
 
@@ -34,8 +34,3 @@ class BaseReader(ABC):
             List of file metadata dictionaries
         """
         pass
-    
-    @abstractmethod
-    def supports_protocol(self, uri: str) -> bool:
-        """Check if reader supports this protocol."""
-        pass
@@ -1,20 +1,81 @@
 """Git repository reader."""
+import asyncio
+import base64
+import fcntl
+import os
+import shutil
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse
-import tempfile
 import git
+from src.config import settings
 from src.services.readers.base import BaseReader
+from src.services.readers.resilience import with_retries
 from src.utils.logger import logger
-from src.utils.errors import SourceConnectionError, NotFoundError
+from src.utils.errors import MCPError, SourceConnectionError, NotFoundError
+from src.utils.deadline import run_in_thread
+
+# git's own stderr for failures that retrying cannot fix
+PERMANENT_ERRORS = (
+    'not found',
+    'authentication failed',
+    'could not read username',
+    'permission denied',
+    'does not exist',
+    'does not appear to be a git repository',
+    'remote branch',
+)
+
+
+def _retryable(error: BaseException) -> bool:
+    """Network failures and timeouts are worth retrying; missing repos and bad credentials are not."""
+    if isinstance(error, git.GitCommandError):
+        stderr = str(error.stderr).lower()
+        return not any(message in stderr for message in PERMANENT_ERRORS)
+    return isinstance(error, OSError)
 
 
 class GitReader(BaseReader):
     """Read documents from Git repositories."""
     
-    def __init__(self, temp_dir: Path = Path("/tmp/policy-reader")):
+    def __init__(
+        self,
+        temp_dir: Path = Path("/tmp/policy-reader"),
+        remote_template: str = "https://{host}/{org}/{repo}"
+    ):
         self.temp_dir = temp_dir
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        # Clone URL for git://host/org/repo/...; overridable for mirrors and local repos
+        self.remote_template = remote_template
+        # Queue this worker's reads of a checkout without each holding a thread;
+        # _sync's flock serialises them with the other workers on the host
+        self._repo_locks: Dict[Path, asyncio.Lock] = {}
+    
+    def _env(self, repo_url: str, credentials: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """
+        Abort transfers that stall instead of hanging the request, and
+        authenticate to repo_url.
+        
+        The token goes in an http.extraHeader set through the environment, so
+        it never appears in the remote URL (and with it log lines, git's
+        errors and the clone's .git/config) or on git's command line.
+        """
+        env = {
+            'GIT_HTTP_LOW_SPEED_LIMIT': '1000',
+            'GIT_HTTP_LOW_SPEED_TIME': str(settings.git_read_timeout_seconds),
+            'GIT_TERMINAL_PROMPT': '0',
+        }
+        token = (credentials or {}).get('token')
+        if token:
+            username = credentials.get('username', 'x-access-token')
+            basic = base64.b64encode(f"{username}:{token}".encode()).decode()
+            env.update({
+                'GIT_CONFIG_COUNT': '1',
+                # Scoped to the remote so redirects elsewhere do not receive it
+                'GIT_CONFIG_KEY_0': f"http.{repo_url}.extraHeader",
+                'GIT_CONFIG_VALUE_0': f"Authorization: Basic {basic}",
+            })
+        return env
     
     async def read_file(self, path: str, credentials: Dict[str, Any]) -> Path:
         """
@@ -33,31 +94,23 @@ class GitReader(BaseReader):
             path_parts = parsed.path.strip('/').split('/')
             
             # Reconstruct repo URL
-            repo_url = f"https://{parsed.hostname}/{path_parts[0]}/{path_parts[1]}"
+            repo_url = self.remote_template.format(
+                host=parsed.hostname, org=path_parts[0], repo=path_parts[1]
+            )
             branch = path_parts[2] if len(path_parts) > 2 else 'main'
             file_path = '/'.join(path_parts[3:]) if len(path_parts) > 3 else ''
             
+            env = self._env(repo_url, credentials)
+            
             # Clone repository to temp directory
             repo_dir = self.temp_dir / f"repo_{parsed.hostname}_{path_parts[0]}_{path_parts[1]}"
             
-            if repo_dir.exists():
-                logger.info(f"Using existing clone: {repo_dir}")
-                repo = git.Repo(repo_dir)
-                repo.remotes.origin.pull()
-            else:
-                logger.info(f"Cloning repository: {repo_url}")
-                
-                # Prepare credentials
-                if credentials:
-                    token = credentials.get('token')
-                    if token:
-                        repo_url = repo_url.replace('https://', f'https://{token}@')
-                
-                repo = git.Repo.clone_from(
-                    repo_url,
-                    repo_dir,
-                    branch=branch,
-                    depth=1  # Shallow clone
+            lock = self._repo_locks.setdefault(repo_dir, asyncio.Lock())
+            async with lock:
+                await with_retries(
+                    'git',
+                    lambda: run_in_thread(self._sync, repo_url, repo_dir, branch, env),
+                    _retryable
                 )
             
             # Get file path
@@ -67,11 +120,57 @@ class GitReader(BaseReader):
             
             logger.info(f"Found file: {target_file}")
             return target_file
-            
+        
+        except MCPError:
+            raise
         except Exception as e:
             logger.error(f"Git read failed for {path}: {e}")
             raise SourceConnectionError(f"Git error: {e}")
     
+    def _sync(self, repo_url: str, repo_dir: Path, branch: str, env: Dict[str, str]):
+        """
+        Pull an existing clone or make a shallow one (blocking).
+        
+        Every worker on the host shares repo_dir, so this holds an flock on
+        a lock file beside it; the kernel drops it if the worker dies.
+        """
+        fd = os.open(repo_dir.with_suffix('.lock'), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            self._sync_locked(repo_url, repo_dir, branch, env)
+        finally:
+            os.close(fd)
+    
+    def _sync_locked(self, repo_url: str, repo_dir: Path, branch: str, env: Dict[str, str]):
+        timeout = settings.git_operation_timeout_seconds
+        if repo_dir.exists():
+            logger.info(f"Using existing clone: {repo_dir}")
+            repo = git.Repo(repo_dir)
+            origin = repo.remotes.origin
+            if origin.url != repo_url:
+                # Older clones kept the token in the remote URL
+                origin.set_url(repo_url)
+            with repo.git.custom_environment(**env):
+                origin.pull(kill_after_timeout=timeout)
+            return
+        
+        logger.info(f"Cloning repository: {repo_url}")
+        try:
+            # Run through Git.execute: Repo.clone_from does not honour kill_after_timeout
+            git.Git().clone(
+                f'--branch={branch}',
+                '--depth=1',  # Shallow clone
+                '--',
+                repo_url,
+                str(repo_dir),
+                env=env,
+                kill_after_timeout=timeout
+            )
+        except BaseException:
+            # A partial clone would be mistaken for a good one on the next read
+            shutil.rmtree(repo_dir, ignore_errors=True)
+            raise
+    
     async def list_files(self, path: str, credentials: Dict[str, Any]) -> List[Dict[str, Any]]:
         """List files in Git repository directory."""
         logger.info(f"Listing Git directory: {path}")
@@ -79,7 +178,3 @@ class GitReader(BaseReader):
         # Clone repo and list files
         # Implementation similar to read_file
         return []
-    
-    def supports_protocol(self, uri: str) -> bool:
-        """Check if protocol is supported."""
-        return uri.startswith('git://')
@@ -1,11 +1,31 @@
 """HTTP/REST API reader."""
+import os
+import uuid
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse
 import httpx
+from src.config import settings
 from src.services.readers.base import BaseReader
+from src.services.readers.resilience import hedged, with_retries
 from src.utils.logger import logger
-from src.utils.errors import SourceConnectionError
+from src.utils.errors import (
+    DocumentTooLargeError,
+    MCPError,
+    NotFoundError,
+    SourceConnectionError,
+    UnauthorizedError,
+)
+
+CHUNK_SIZE = 256 * 1024
+
+
+def _retryable(error: BaseException) -> bool:
+    """Timeouts, dropped connections, throttling and server errors are worth retrying."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
 
 
 class HTTPReader(BaseReader):
@@ -14,6 +34,21 @@ class HTTPReader(BaseReader):
     def __init__(self, temp_dir: Path = Path("/tmp/policy-reader")):
         self.temp_dir = temp_dir
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pid: Optional[int] = None
+    
+    def _http(self) -> httpx.AsyncClient:
+        """Pooled client, recreated after fork so workers never share connections."""
+        if self._pid != os.getpid():
+            self._client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=httpx.Timeout(
+                    settings.http_read_timeout_seconds,
+                    connect=settings.http_connect_timeout_seconds
+                ),
+            )
+            self._pid = os.getpid()
+        return self._client
     
     async def read_file(self, path: str, credentials: Dict[str, Any]) -> Path:
         """Download file from HTTP endpoint."""
@@ -28,29 +63,63 @@ class HTTPReader(BaseReader):
                 elif 'token' in credentials:
                     headers['Authorization'] = f"Bearer {credentials['token']}"
             
-            # Download file
-            async with httpx.AsyncClient() as client:
-                response = await client.get(path, headers=headers, follow_redirects=True)
-                response.raise_for_status()
-                
-                # Determine filename
-                content_disposition = response.headers.get('content-disposition', '')
-                if 'filename=' in content_disposition:
-                    filename = content_disposition.split('filename=')[1].strip('"')
-                else:
-                    filename = Path(urlparse(path).path).name or 'downloaded_file'
-                
-                # Save to temp file
-                temp_file = self.temp_dir / filename
-                temp_file.write_bytes(response.content)
-                
-                logger.info(f"Downloaded {path} to {temp_file}")
-                return temp_file
-                
+            temp_file = await with_retries(
+                'http',
+                lambda: hedged('http', lambda: self._download(path, headers)),
+                _retryable
+            )
+            
+            logger.info(f"Downloaded {path} to {temp_file}")
+            return temp_file
+        
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            if status in (404, 410):
+                raise NotFoundError(f"Document not found: {path}")
+            if status in (401, 403):
+                raise UnauthorizedError(f"Access denied to {path} (HTTP {status})")
+            logger.error(f"HTTP download failed for {path}: {e}")
+            raise SourceConnectionError(f"HTTP error: {e}")
+        except MCPError:
+            raise
         except Exception as e:
             logger.error(f"HTTP download failed for {path}: {e}")
             raise SourceConnectionError(f"HTTP error: {e}")
     
+    async def _download(self, path: str, headers: Dict[str, str]) -> Path:
+        """One download attempt, streamed to a part file and moved into place when complete."""
+        max_size = settings.max_document_size_mb * 1024 * 1024
+        async with self._http().stream('GET', path, headers=headers) as response:
+            response.raise_for_status()
+            
+            length = response.headers.get('content-length')
+            if length and length.isdigit() and int(length) > max_size:
+                raise DocumentTooLargeError(f"Document size {length} exceeds limit {max_size}")
+            
+            # Determine filename
+            content_disposition = response.headers.get('content-disposition', '')
+            if 'filename=' in content_disposition:
+                filename = content_disposition.split('filename=')[1].strip('"')
+            else:
+                filename = Path(urlparse(path).path).name or 'downloaded_file'
+            
+            # Save to temp file
+            temp_file = self.temp_dir / filename
+            part = temp_file.with_name(f"{temp_file.name}.{uuid.uuid4().hex}.part")
+            try:
+                size = 0
+                with open(part, 'wb') as f:
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > max_size:
+                            raise DocumentTooLargeError(f"Document size exceeds limit {max_size}")
+                        f.write(chunk)
+                os.replace(part, temp_file)
+            except BaseException:
+                part.unlink(missing_ok=True)
+                raise
+            return temp_file
+    
     async def list_files(self, path: str, credentials: Dict[str, Any]) -> List[Dict[str, Any]]:
         """List files via REST API."""
         logger.info(f"Listing HTTP endpoint: {path}")
@@ -58,7 +127,3 @@ class HTTPReader(BaseReader):
         # This would depend on the specific API
         # Many REST APIs have list/directory endpoints
         return []
-    
-    def supports_protocol(self, uri: str) -> bool:
-        """Check if protocol is supported."""
-        return uri.startswith('http://') or uri.startswith('https://')
@@ -46,7 +46,3 @@ class LocalReader(BaseReader):
                 })
         
         return files
-    
-    def supports_protocol(self, uri: str) -> bool:
-        """Check if protocol is supported."""
-        return uri.startswith('file://') or not '://' in uri
@@ -0,0 +1,268 @@
+"""
+Retries and hedging shared by the remote readers.
+
+Readers wrap each idempotent fetch as:
+    
+    await with_retries(protocol, lambda: hedged(protocol, attempt), retryable)
+
+- with_retries retries transient failures (as judged by the reader's
+  retryable predicate) with full-jitter exponential backoff.
+- hedged starts a second attempt once the first has run longer than the
+  configured percentile of recent latencies for the protocol, and returns
+  whichever finishes first. It is a no-op unless reader_hedge_enabled.
+
+Attempts must be safe to run concurrently and to abandon: each writes to its
+own part file and only the winner is moved into place.
+
+ReaderRegistry adds two fail-fast layers in front of the readers: a circuit
+breaker per (protocol, host) and a short-lived cache of not-found documents.
+"""
+import asyncio
+import math
+import random
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+from src.config import settings
+from src.utils.deadline import time_remaining
+from src.utils.errors import CircuitOpenError, NotFoundError
+from src.utils.logger import logger
+from src.utils.metrics import CIRCUIT_TRANSITIONS, READER_HEDGES, READER_RETRIES
+
+T = TypeVar('T')
+
+# Recent successful read latencies kept per protocol
+LATENCY_WINDOW = 200
+# Reads observed before hedging starts for a protocol
+MIN_HEDGE_SAMPLES = 20
+# Not-found entries remembered per worker
+NOT_FOUND_CACHE_SIZE = 10000
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Bounded retries with full-jitter exponential backoff."""
+    attempts: int
+    base_delay: float
+    max_delay: float
+    
+    def backoff(self, retry: int) -> float:
+        """Delay before the given retry (1 = first retry)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+
+def retry_policy() -> RetryPolicy:
+    """Retry policy from settings."""
+    return RetryPolicy(
+        attempts=settings.reader_retry_attempts,
+        base_delay=settings.reader_retry_base_delay_seconds,
+        max_delay=settings.reader_retry_max_delay_seconds,
+    )
+
+
+async def with_retries(
+    protocol: str,
+    call: Callable[[], Awaitable[T]],
+    retryable: Callable[[BaseException], bool],
+    policy: Optional[RetryPolicy] = None
+) -> T:
+    """Run call, retrying failures that retryable accepts."""
+    policy = policy or retry_policy()
+    for attempt in range(1, policy.attempts + 1):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt == policy.attempts or not retryable(e):
+                raise
+            delay = policy.backoff(attempt)
+            remaining = time_remaining()
+            if remaining is not None and delay >= remaining:
+                # No time left for another attempt before the request deadline
+                raise
+            READER_RETRIES.labels(protocol=protocol).inc()
+            logger.warning(
+                f"{protocol} read failed (attempt {attempt}/{policy.attempts}), retrying in {delay:.2f}s: {e}"
+            )
+            await asyncio.sleep(delay)
+
+
+class LatencyTracker:
+    """Sliding window of read latencies per protocol."""
+    
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self.samples: Dict[str, Deque[float]] = {}
+    
+    def observe(self, protocol: str, seconds: float):
+        samples = self.samples.get(protocol)
+        if samples is None:
+            samples = self.samples[protocol] = deque(maxlen=self.window)
+        samples.append(seconds)
+    
+    def percentile(self, protocol: str, pct: float) -> Optional[float]:
+        """Nearest-rank percentile, or None until MIN_HEDGE_SAMPLES reads are seen."""
+        samples = self.samples.get(protocol)
+        if not samples or len(samples) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+latency_tracker = LatencyTracker()
+
+
+def hedge_delay(protocol: str) -> Optional[float]:
+    """Seconds to wait before hedging a read, or None to not hedge."""
+    if not settings.reader_hedge_enabled:
+        return None
+    threshold = latency_tracker.percentile(protocol, settings.reader_hedge_percentile)
+    if threshold is None:
+        return None
+    return max(threshold, settings.reader_hedge_min_delay_ms / 1000)
+
+
+async def hedged(protocol: str, attempt: Callable[[], Awaitable[T]]) -> T:
+    """Run attempt, racing a second copy against it if it is slow."""
+    start = time.monotonic()
+    delay = hedge_delay(protocol)
+    primary = asyncio.ensure_future(attempt())
+    tasks = {primary: 'primary'}
+    try:
+        if delay is not None:
+            await asyncio.wait({primary}, timeout=delay)
+            if not primary.done():
+                tasks[asyncio.ensure_future(attempt())] = 'hedge'
+        
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if len(tasks) > 1:
+                        READER_HEDGES.labels(protocol=protocol, winner=tasks[task]).inc()
+                    latency_tracker.observe(protocol, time.monotonic() - start)
+                    return task.result()
+        # Every attempt failed; report the first one's error
+        raise primary.exception()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one source host.
+    
+    closed: calls pass; circuit_failure_threshold failures in a row open it.
+    open: calls fail fast with CircuitOpenError for circuit_reset_seconds.
+    half_open: one probe call passes while the rest keep failing fast; its
+    success closes the circuit, its failure re-opens it.
+    """
+    
+    def __init__(self, protocol: str, host: str, failure_threshold: int, reset_seconds: float):
+        self.protocol = protocol
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+    
+    def before_call(self) -> bool:
+        """
+        Admit a call or raise CircuitOpenError.
+        
+        Returns:
+            True if the call is the half-open probe
+        """
+        if self.state == 'closed':
+            return False
+        retry_after = self.opened_at + self.reset_seconds - time.monotonic()
+        if self.state == 'open' and retry_after <= 0:
+            self._transition('half_open')
+        if self.state == 'half_open' and not self.probing:
+            self.probing = True
+            return True
+        raise CircuitOpenError(
+            f"{self.protocol} source {self.host} is unavailable after repeated failures",
+            {'retry_after': max(retry_after, 1)}
+        )
+    
+    def record_success(self, probe: bool):
+        if probe:
+            self.probing = False
+        self.failures = 0
+        if self.state != 'closed':
+            self._transition('closed')
+    
+    def record_failure(self, probe: bool):
+        if probe:
+            self.probing = False
+        self.failures += 1
+        if self.state == 'half_open' or (self.state == 'closed' and self.failures >= self.failure_threshold):
+            self.opened_at = time.monotonic()
+            self._transition('open')
+    
+    def record_neutral(self, probe: bool):
+        """The call ended without telling us whether the host is healthy (e.g. cancelled)."""
+        if probe:
+            self.probing = False
+    
+    def _transition(self, state: str):
+        self.state = state
+        CIRCUIT_TRANSITIONS.labels(protocol=self.protocol, state=state).inc()
+        log = logger.warning if state == 'open' else logger.info
+        log(
+            f"Circuit for {self.protocol} source {self.host} is now {state}",
+            extra={'data': {'protocol': self.protocol, 'host': self.host, 'failures': self.failures}}
+        )
+
+
+class CircuitBreakers:
+    """Circuit breakers keyed by (protocol, host), created on first use."""
+    
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+    
+    def get(self, protocol: str, host: str) -> CircuitBreaker:
+        breaker = self.breakers.get((protocol, host))
+        if breaker is None:
+            breaker = CircuitBreaker(protocol, host, self.failure_threshold, self.reset_seconds)
+            self.breakers[(protocol, host)] = breaker
+        return breaker
+
+
+class NotFoundCache:
+    """Remembers documents that were reported missing, so repeats fail without a round trip."""
+    
+    def __init__(self, ttl_seconds: float, max_entries: int = NOT_FOUND_CACHE_SIZE):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+    
+    def check(self, uri: str):
+        """Raise the cached NotFoundError for uri, if any."""
+        entry = self.entries.get(uri)
+        if entry is None:
+            return
+        expires, message = entry
+        if time.monotonic() >= expires:
+            del self.entries[uri]
+            return
+        raise NotFoundError(message, {'cached': True})
+    
+    def remember(self, uri: str, error: NotFoundError):
+        if self.ttl <= 0:
+            return
+        self.entries.pop(uri, None)
+        self.entries[uri] = (time.monotonic() + self.ttl, error.message)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def forget(self, uri: str):
+        self.entries.pop(uri, None)
@@ -1,11 +1,30 @@
 """S3 bucket reader."""
+import hashlib
+import os
+import threading
+import uuid
 from pathlib import Path
 from typing import List, Dict, Any
 from urllib.parse import urlparse
 import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+from src.config import settings
 from src.services.readers.base import BaseReader
+from src.services.readers.resilience import hedged, with_retries
 from src.utils.logger import logger
-from src.utils.errors import SourceConnectionError, NotFoundError
+from src.utils.errors import MCPError, SourceConnectionError, NotFoundError, UnauthorizedError
+from src.utils.deadline import cancellation_checker, run_in_thread
+
+RETRYABLE_CODES = {'Throttling', 'ThrottlingException', 'SlowDown', 'RequestTimeout', 'InternalError'}
+
+
+def _retryable(error: BaseException) -> bool:
+    """Network errors, timeouts, throttling and 5xx responses are worth retrying."""
+    if isinstance(error, ClientError):
+        status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+        return status >= 500 or error.response.get('Error', {}).get('Code') in RETRYABLE_CODES
+    return isinstance(error, BotoCoreError) and not isinstance(error, NoCredentialsError)
 
 
 class S3Reader(BaseReader):
@@ -14,6 +33,40 @@ class S3Reader(BaseReader):
     def __init__(self, temp_dir: Path = Path("/tmp/policy-reader")):
         self.temp_dir = temp_dir
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self._clients: Dict[tuple, Any] = {}
+        self._clients_lock = threading.Lock()
+    
+    def _client(self, credentials: Dict[str, Any]):
+        """
+        S3 client for a set of credentials.
+        
+        Clients are expensive to build and thread-safe to use, so one is kept
+        per credentials (and per process). botocore's own retries are turned
+        off; retries are applied per download by with_retries.
+        """
+        secret = credentials.get('secret_access_key') or ''
+        key = (
+            os.getpid(),
+            credentials.get('access_key_id'),
+            hashlib.sha256(secret.encode()).hexdigest(),
+            credentials.get('region', 'us-east-1'),
+        )
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = boto3.session.Session().client(
+                    's3',
+                    aws_access_key_id=credentials.get('access_key_id'),
+                    aws_secret_access_key=credentials.get('secret_access_key'),
+                    region_name=credentials.get('region', 'us-east-1'),
+                    config=Config(
+                        connect_timeout=settings.s3_connect_timeout_seconds,
+                        read_timeout=settings.s3_read_timeout_seconds,
+                        retries={'total_max_attempts': 1},
+                    ),
+                )
+                self._clients[key] = client
+            return client
     
     async def read_file(self, path: str, credentials: Dict[str, Any]) -> Path:
         """
@@ -29,27 +82,55 @@ class S3Reader(BaseReader):
             bucket = parsed.hostname
             key = parsed.path.lstrip('/')
             
-            # Create S3 client
-            s3_client = boto3.client(
-                's3',
-                aws_access_key_id=credentials.get('access_key_id'),
-                aws_secret_access_key=credentials.get('secret_access_key'),
-                region_name=credentials.get('region', 'us-east-1')
-            )
+            s3_client = self._client(credentials)
             
             # Download file
             filename = Path(key).name
             temp_file = self.temp_dir / filename
             
-            s3_client.download_file(bucket, key, str(temp_file))
+            await with_retries(
+                's3',
+                lambda: hedged('s3', lambda: self._download(s3_client, bucket, key, temp_file)),
+                _retryable
+            )
             
             logger.info(f"Downloaded s3://{bucket}/{key} to {temp_file}")
             return temp_file
-            
+        
+        except ClientError as e:
+            code = e.response.get('Error', {}).get('Code')
+            if code in ('404', 'NoSuchKey', 'NoSuchBucket'):
+                raise NotFoundError(f"Document not found: {path}")
+            if code in ('403', 'AccessDenied'):
+                raise UnauthorizedError(f"Access denied to {path}")
+            logger.error(f"S3 read failed for {path}: {e}")
+            raise SourceConnectionError(f"S3 error: {e}")
+        except MCPError:
+            raise
         except Exception as e:
             logger.error(f"S3 read failed for {path}: {e}")
             raise SourceConnectionError(f"S3 error: {e}")
     
+    async def _download(self, s3_client, bucket: str, key: str, temp_file: Path) -> Path:
+        """One download attempt to a part file, moved into place when complete."""
+        part = temp_file.with_name(f"{temp_file.name}.{uuid.uuid4().hex}.part")
+        try:
+            await run_in_thread(
+                self._fetch, s3_client, bucket, key, part,
+                on_abandon=lambda: part.unlink(missing_ok=True)
+            )
+        except Exception:
+            part.unlink(missing_ok=True)
+            raise
+        os.replace(part, temp_file)
+        return temp_file
+    
+    @staticmethod
+    def _fetch(s3_client, bucket: str, key: str, part: Path):
+        """Blocking download, stopped at the next chunk once the request is cancelled."""
+        check = cancellation_checker()
+        s3_client.download_file(bucket, key, str(part), Callback=lambda _: check())
+    
     async def list_files(self, path: str, credentials: Dict[str, Any]) -> List[Dict[str, Any]]:
         """List files in S3 bucket/prefix."""
         logger.info(f"Listing S3 path: {path}")
@@ -59,15 +140,14 @@ class S3Reader(BaseReader):
             bucket = parsed.hostname
             prefix = parsed.path.lstrip('/')
             
-            s3_client = boto3.client(
+            s3_client = self._client(credentials)
+            
+            response = await with_retries(
                 's3',
-                aws_access_key_id=credentials.get('access_key_id'),
-                aws_secret_access_key=credentials.get('secret_access_key'),
-                region_name=credentials.get('region', 'us-east-1')
+                lambda: run_in_thread(lambda: s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)),
+                _retryable
             )
             
-            response = s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-            
             files = []
             for obj in response.get('Contents', []):
                 files.append({
@@ -78,11 +158,7 @@ class S3Reader(BaseReader):
                 })
             
             return files
-            
+        
         except Exception as e:
             logger.error(f"S3 list failed for {path}: {e}")
             raise SourceConnectionError(f"S3 error: {e}")
-    
-    def supports_protocol(self, uri: str) -> bool:
-        """Check if protocol is supported."""
-        return uri.startswith('s3://')
@@ -1,16 +1,73 @@
 """SMB/CIFS file share reader."""
+import asyncio
+import os
+import time
+import uuid
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse
-import tempfile
 from smbprotocol.connection import Connection
+from smbprotocol.exceptions import (
+    AccessDenied,
+    BadNetworkName,
+    LogonFailure,
+    ObjectNameNotFound,
+    ObjectPathNotFound,
+    SMBAuthenticationError,
+    SMBConnectionClosed,
+    SMBException,
+)
 from smbprotocol.session import Session
 from smbprotocol.tree import TreeConnect
-from smbprotocol.open import Open, CreateDisposition, FileAttributes
-from smbprotocol.file_info import FileStandardInformation
+from smbprotocol.open import (
+    CreateDisposition,
+    CreateOptions,
+    FileAttributes,
+    FilePipePrinterAccessMask,
+    ImpersonationLevel,
+    Open,
+    ShareAccess,
+)
+from src.config import settings
 from src.services.readers.base import BaseReader
+from src.services.readers.resilience import with_retries
 from src.utils.logger import logger
-from src.utils.errors import SourceConnectionError, NotFoundError
+from src.utils.errors import MCPError, SourceConnectionError, NotFoundError, UnauthorizedError
+from src.utils.deadline import check_cancelled, run_in_thread
+
+
+class SMBStalledError(TimeoutError):
+    """An SMB transfer made no progress within smb_read_timeout_seconds."""
+    pass
+
+
+def _retryable(error: BaseException) -> bool:
+    """Stalls, dropped connections and failed TCP connects are worth retrying."""
+    if isinstance(error, (SMBStalledError, SMBConnectionClosed)):
+        return True
+    if isinstance(error, OSError) and not isinstance(error, SMBException):
+        return True
+    # smbprotocol reports connect failures as ValueError from the socket error
+    return isinstance(error, ValueError) and isinstance(error.__cause__, OSError)
+
+
+class SMBTransfer:
+    """Progress of one blocking download, watched from the event loop."""
+    
+    def __init__(self):
+        self.connection: Optional[Connection] = None
+        self.last_progress = time.monotonic()
+    
+    def tick(self):
+        self.last_progress = time.monotonic()
+    
+    def abort(self):
+        """Close the connection so the blocked worker thread fails instead of waiting forever."""
+        if self.connection is not None:
+            try:
+                self.connection.disconnect(close=True)
+            except Exception:
+                pass
 
 
 class SMBReader(BaseReader):
@@ -32,46 +89,114 @@ class SMBReader(BaseReader):
             share = share_path[1] if len(share_path) > 1 else ''
             file_path = share_path[2] if len(share_path) > 2 else ''
             
-            username = credentials.get('username')
-            password = credentials.get('password')
-            domain = credentials.get('domain', '')
-            
-            # Connect to SMB server
-            connection = Connection(uuid.uuid4(), server, 445)
-            connection.connect()
+            temp_file = self.temp_dir / Path(file_path).name
+            await with_retries(
+                'smb',
+                lambda: self._download(server, share, file_path, credentials, temp_file),
+                _retryable
+            )
             
+            logger.info(f"Downloaded {path} to {temp_file}")
+            return temp_file
+        
+        except (ObjectNameNotFound, ObjectPathNotFound, BadNetworkName):
+            raise NotFoundError(f"Document not found: {path}")
+        except (AccessDenied, LogonFailure, SMBAuthenticationError) as e:
+            raise UnauthorizedError(f"Access denied to {path}: {e}")
+        except MCPError:
+            raise
+        except Exception as e:
+            logger.error(f"SMB read failed for {path}: {e}")
+            raise SourceConnectionError(f"SMB error: {e}")
+    
+    async def _download(
+        self,
+        server: str,
+        share: str,
+        file_path: str,
+        credentials: Dict[str, Any],
+        temp_file: Path
+    ) -> Path:
+        """One download attempt in a worker thread, aborted if it stops making progress."""
+        transfer = SMBTransfer()
+        part = temp_file.with_name(f"{temp_file.name}.{uuid.uuid4().hex}.part")
+        task = asyncio.ensure_future(run_in_thread(
+            self._fetch, transfer, server, share, file_path, credentials, part,
+            on_abandon=lambda: part.unlink(missing_ok=True)
+        ))
+        timeout = settings.smb_read_timeout_seconds
+        try:
+            while not task.done():
+                idle = time.monotonic() - transfer.last_progress
+                if idle >= timeout:
+                    transfer.abort()
+                    raise SMBStalledError(f"No progress from {server} for {timeout:.0f}s")
+                await asyncio.wait({task}, timeout=timeout - idle)
+            task.result()
+        except BaseException:
+            # Drop the connection too, so a cancelled thread is not left blocked on a read
+            transfer.abort()
+            task.cancel()
+            part.unlink(missing_ok=True)
+            raise
+        os.replace(part, temp_file)
+        return temp_file
+    
+    def _fetch(
+        self,
+        transfer: SMBTransfer,
+        server: str,
+        share: str,
+        file_path: str,
+        credentials: Dict[str, Any],
+        part: Path
+    ):
+        """Blocking download of one file to part."""
+        username = credentials.get('username')
+        password = credentials.get('password')
+        domain = credentials.get('domain', '')
+        
+        # Connect to SMB server
+        connection = Connection(uuid.uuid4(), server, 445)
+        transfer.connection = connection
+        connection.connect(timeout=settings.smb_connect_timeout_seconds)
+        try:
+            transfer.tick()
             session = Session(connection, username, password, domain)
             session.connect()
+            transfer.tick()
             
             tree = TreeConnect(session, f"\\\\{server}\\{share}")
             tree.connect()
+            transfer.tick()
             
             # Open and read file
-            file_open = Open(tree, file_path)
+            file_open = Open(tree, file_path.replace('/', '\\'))
             file_open.create(
+                ImpersonationLevel.Impersonation,
+                FilePipePrinterAccessMask.GENERIC_READ,
                 FileAttributes.FILE_ATTRIBUTE_NORMAL,
-                None,
-                CreateDisposition.FILE_OPEN
+                ShareAccess.FILE_SHARE_READ,
+                CreateDisposition.FILE_OPEN,
+                CreateOptions.FILE_NON_DIRECTORY_FILE
             )
-            
-            # Read file content
-            content = file_open.read(0, file_open.end_of_file)
-            
-            # Save to temp file
-            temp_file = self.temp_dir / Path(file_path).name
-            temp_file.write_bytes(content)
-            
-            file_open.close()
-            tree.disconnect()
-            session.disconnect()
+            try:
+                # Read in chunks of the negotiated maximum, writing as we go
+                chunk_size = connection.max_read_size
+                offset = 0
+                with open(part, 'wb') as f:
+                    while offset < file_open.end_of_file:
+                        data = file_open.read(offset, min(chunk_size, file_open.end_of_file - offset))
+                        if not data:
+                            break
+                        f.write(data)
+                        offset += len(data)
+                        transfer.tick()
+                        check_cancelled()
+            finally:
+                file_open.close()
+        finally:
             connection.disconnect()
-            
-            logger.info(f"Downloaded {path} to {temp_file}")
-            return temp_file
-            
-        except Exception as e:
-            logger.error(f"SMB read failed for {path}: {e}")
-            raise SourceConnectionError(f"SMB error: {e}")
     
     async def list_files(self, path: str, credentials: Dict[str, Any]) -> List[Dict[str, Any]]:
         """List files in SMB directory."""
@@ -80,7 +205,3 @@ class SMBReader(BaseReader):
         # Implementation similar to read_file but enumerate directory
         # Simplified for brevity
         return []
-    
-    def supports_protocol(self, uri: str) -> bool:
-        """Check if protocol is supported."""
-        return uri.startswith('smb://') or uri.startswith('\\\\')
@@ -0,0 +1,165 @@
+"""
+Size-aware scheduling of document parses.
+
+A worker runs at most parse_slots parses at once. Parses waiting for a slot
+queue in lanes by their weighted size (downloaded file size times a rough
+per-format work factor), so a 2 KB markdown read does not wait behind a
+300-page PDF:
+
+- A freed slot goes to the waiting lanes by smooth weighted round robin
+  (small 4 : medium 2 : large 1), so large parses keep making progress
+  while small ones keep low latency.
+- Large parses hold at most parse_large_lane_slots slots and medium ones
+  all but one, so some capacity is always left for smaller documents.
+
+Within a lane parses start in arrival order.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+from src.config import settings
+from src.utils.metrics import PARSE_QUEUE_DEPTH, PARSE_QUEUE_WAIT, PARSES_RUNNING
+from src.utils.tracing import span
+
+MB = 1024 * 1024
+
+# Rough parse work per byte of input, relative to streaming CSV
+WORK_FACTORS: Dict[str, float] = {
+    'pdf': 4,
+    'docx': 2,
+    'doc': 2,
+    'xlsx': 3,
+    'xls': 4,
+    'csv': 1,
+}
+PDF_LAYOUT_WORK_FACTOR = 20
+DEFAULT_WORK_FACTOR = 1
+
+
+def estimate_parse_work(doc_format: str, file_size: int, options: Optional[Dict[str, Any]] = None) -> int:
+    """Weighted size in bytes used to pick a parse's lane."""
+    factor = WORK_FACTORS.get(doc_format, DEFAULT_WORK_FACTOR)
+    if doc_format == 'pdf' and (options or {}).get('engine', settings.pdf_engine) == 'layout':
+        factor = PDF_LAYOUT_WORK_FACTOR
+    return int(file_size * factor)
+
+
+@dataclass
+class Lane:
+    """Parses of one size class: their slot limit, share of freed slots and queue."""
+    name: str
+    weight: int
+    limit: int
+    running: int = 0
+    # Smooth weighted round robin credit
+    credit: int = 0
+    waiters: Deque[asyncio.Future] = field(default_factory=deque)
+
+
+class ParseScheduler:
+    """Hands out parse slots to lanes of small, medium and large parses."""
+    
+    def __init__(self, slots: int, small_max_bytes: int, large_min_bytes: int, large_slots: int):
+        self.slots = slots
+        self.small_max_bytes = small_max_bytes
+        self.large_min_bytes = large_min_bytes
+        self.running = 0
+        self.lanes: List[Lane] = [
+            Lane('small', weight=4, limit=slots),
+            Lane('medium', weight=2, limit=max(slots - 1, 1)),
+            Lane('large', weight=1, limit=min(large_slots or max(slots // 2, 1), slots)),
+        ]
+    
+    def lane_for(self, work: int) -> Lane:
+        small, medium, large = self.lanes
+        if work <= self.small_max_bytes:
+            return small
+        return large if work >= self.large_min_bytes else medium
+    
+    async def acquire(self, lane: Lane):
+        """Wait for a slot for a parse in lane."""
+        if self.running < self.slots and lane.running < lane.limit and not lane.waiters:
+            self._start(lane)
+            return
+        
+        waiter = asyncio.get_running_loop().create_future()
+        lane.waiters.append(waiter)
+        PARSE_QUEUE_DEPTH.labels(lane=lane.name).inc()
+        start = time.perf_counter()
+        try:
+            with span('parser.queue', lane=lane.name):
+                await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as the parse was cancelled
+                self.release(lane)
+            elif waiter in lane.waiters:
+                lane.waiters.remove(waiter)
+                PARSE_QUEUE_DEPTH.labels(lane=lane.name).dec()
+            raise
+        PARSE_QUEUE_WAIT.labels(lane=lane.name).observe(time.perf_counter() - start)
+    
+    def release(self, lane: Lane):
+        """Free a slot and start the next waiting parse."""
+        lane.running -= 1
+        self.running -= 1
+        PARSES_RUNNING.labels(lane=lane.name).dec()
+        self._dispatch()
+    
+    @asynccontextmanager
+    async def slot(self, doc_format: str, file_size: int, options: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Hold a parse slot for the duration of the block; yields the lane name."""
+        lane = self.lane_for(estimate_parse_work(doc_format, file_size, options))
+        await self.acquire(lane)
+        try:
+            yield lane.name
+        finally:
+            self.release(lane)
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            'slots': self.slots,
+            'running': self.running,
+            'lanes': {
+                lane.name: {'running': lane.running, 'limit': lane.limit, 'queued': len(lane.waiters)}
+                for lane in self.lanes
+            },
+        }
+    
+    def _start(self, lane: Lane):
+        lane.running += 1
+        self.running += 1
+        PARSES_RUNNING.labels(lane=lane.name).inc()
+    
+    def _dispatch(self):
+        while self.running < self.slots:
+            ready = [lane for lane in self.lanes if lane.waiters and lane.running < lane.limit]
+            if not ready:
+                return
+            # Smooth weighted round robin: every ready lane earns its weight,
+            # the richest is served and pays back the total
+            for lane in ready:
+                lane.credit += lane.weight
+            lane = max(ready, key=lambda candidate: candidate.credit)
+            lane.credit -= sum(candidate.weight for candidate in ready)
+            
+            waiter = lane.waiters.popleft()
+            PARSE_QUEUE_DEPTH.labels(lane=lane.name).dec()
+            if waiter.done():
+                # Cancelled while queued
+                continue
+            self._start(lane)
+            waiter.set_result(None)
+
+
+# Global parse scheduler
+parse_scheduler = ParseScheduler(
+    settings.parse_slots or os.cpu_count() or 1,
+    int(settings.parse_small_lane_max_mb * MB),
+    int(settings.parse_large_lane_min_mb * MB),
+    settings.parse_large_lane_slots
+)
@@ -1,6 +1,7 @@
 """Tool registry."""
 from typing import Dict, Any, Callable
-from src.tools.policy import read_document, list_documents
+from src.tools.policy import read_document, list_documents, diff_documents
+from src.utils.deadline import deadline_scope
 
 
 class ToolRegistry:
@@ -23,6 +24,12 @@ class ToolRegistry:
             list_documents.list_documents,
             list_documents.TOOL_METADATA
         )
+        
+        self.register_tool(
+            diff_documents.TOOL_METADATA['name'],
+            diff_documents.diff_documents,
+            diff_documents.TOOL_METADATA
+        )
     
     def register_tool(self, name: str, handler: Callable, metadata: Dict[str, Any]):
         """Register a tool."""
@@ -49,7 +56,9 @@ class ToolRegistry:
             }
         
         handler = tool['handler']
-        return await handler(arguments, agent_id)
+        # request_timeout_seconds, unless the transport set the client's deadline
+        with deadline_scope():
+            return await handler(arguments, agent_id)
 
 
 # Global tool registry
@@ -1,4 +1,4 @@
 """Init file for policy tools."""
-from src.tools.policy import read_document, list_documents
+from src.tools.policy import read_document, list_documents, diff_documents
 
-__all__ = ['read_document', 'list_documents']
+__all__ = ['read_document', 'list_documents', 'diff_documents']
@@ -0,0 +1,130 @@
+"""MCP tool: Diff two versions of a policy document."""
+import asyncio
+from typing import Dict, Any
+from pydantic import BaseModel, Field
+from src.services.credentials import credential_provider
+from src.services.diff import diff_documents as compute_diff
+from src.services.documents import load_document
+from src.utils.logger import logger, log_audit
+from src.utils.tracing import span
+
+
+class DiffDocumentsInput(BaseModel):
+    """Input parameters for policy-diff-documents tool."""
+    
+    old_source: str = Field(
+        ...,
+        description="URI of the earlier version (file://, smb://, git://, s3://, https://)"
+    )
+    new_source: str = Field(
+        ...,
+        description="URI of the later version"
+    )
+    credentials_path: str = Field(
+        default="",
+        description="Vault path to credentials for both sources"
+    )
+    parse_options: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Format-specific parser options applied to both documents"
+    )
+    max_hunks: int = Field(
+        default=200,
+        ge=1,
+        le=5000,
+        description="Most changed hunks to return (the summary always covers the whole diff)"
+    )
+    context_lines: int = Field(
+        default=0,
+        ge=0,
+        le=20,
+        description="Unchanged lines to include around each change"
+    )
+    
+    class Config:
+        extra = 'forbid'
+
+
+async def diff_documents(params: Dict[str, Any], agent_id: str) -> Dict[str, Any]:
+    """
+    Compare two versions of a policy document server-side.
+    
+    Both documents are parsed through the document cache and only the
+    changed paragraphs are returned, with page, sheet or section locations.
+    
+    Args:
+        params: Tool input parameters
+        agent_id: Requesting agent identifier
+    
+    Returns:
+        Diff summary and changed hunks
+    """
+    # Validate input
+    validated = DiffDocumentsInput(**params)
+    
+    logger.info(
+        f"Diffing policy documents",
+        extra={'data': {
+            'old_source': validated.old_source,
+            'new_source': validated.new_source,
+            'agent_id': agent_id
+        }}
+    )
+    
+    try:
+        # Get credentials from Vault
+        with span('diff_documents.credentials'):
+            credentials = await credential_provider.get(validated.credentials_path)
+        
+        # Read both versions concurrently, from the document cache where possible
+        old, new = await asyncio.gather(*(
+            load_document(
+                source,
+                credentials,
+                credentials_path=validated.credentials_path,
+                parse_options=validated.parse_options
+            )
+            for source in (validated.old_source, validated.new_source)
+        ))
+        
+        with span('diff_documents.diff'):
+            diff = await asyncio.to_thread(
+                compute_diff,
+                old['content'],
+                new['content'],
+                validated.max_hunks,
+                validated.context_lines
+            )
+        
+        # Audit log
+        log_audit(
+            'documents.diffed',
+            agent_id=agent_id,
+            old_source=validated.old_source,
+            new_source=validated.new_source,
+            hunks=diff['summary']['hunks']
+        )
+        
+        return {
+            'status': 'success',
+            'data': {
+                'old': {'source': validated.old_source, 'format': old['format']},
+                'new': {'source': validated.new_source, 'format': new['format']},
+                **diff
+            }
+        }
+    
+    except Exception as e:
+        logger.error(f"Failed to diff documents: {e}")
+        return {
+            'status': 'error',
+            'error': str(e)
+        }
+
+
+# Tool metadata for MCP registration
+TOOL_METADATA = {
+    'name': 'policy-diff-documents',
+    'description': 'Compare two versions of a policy document and return only the changed sections',
+    'inputSchema': DiffDocumentsInput.model_json_schema(),
+}
@@ -1,6 +1,7 @@
 """MCP tool: List policy documents."""
 from typing import Dict, Any, List
 from pydantic import BaseModel, Field
+from src.services.credentials import credential_provider
 from src.services.readers import reader_registry
 from src.utils.logger import logger, log_audit
 
@@ -46,10 +47,7 @@ async def list_documents(params: Dict[str, Any], agent_id: str) -> Dict[str, Any
     
     try:
         # Get credentials from Vault
-        credentials = {}
-        if validated.credentials_path:
-            # TODO: Integrate with Vault
-            credentials = {}
+        credentials = await credential_provider.get(validated.credentials_path)
         
         # List documents
         files = await reader_registry.list_documents(validated.source, credentials)
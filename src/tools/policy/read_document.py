@@ -1,12 +1,13 @@
 """MCP tool: Read policy document."""
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List, Literal, Optional
 from pydantic import BaseModel, Field
 from pathlib import Path
-from src.services.readers import reader_registry
-from src.services.parsers import parser_registry
+from src.services.chunking import chunk_document
+from src.services.credentials import credential_provider
+from src.services.documents import load_document
 from src.utils.logger import logger, log_audit
-from src.utils.errors import ValidationError, DocumentTooLargeError
-from src.config import settings
+from src.utils.tracing import span, current_timings
 
 
 class ReadDocumentInput(BaseModel):
@@ -24,6 +25,38 @@ class ReadDocumentInput(BaseModel):
         default="auto",
         description="Document format (auto, pdf, docx, xlsx, csv, txt)"
     )
+    parse_options: Dict[str, Any] = Field(
+        default_factory=dict,
+        description=(
+            "Format-specific parser options, e.g. "
+            "{'start_row': 0, 'max_rows': 500, 'table_format': 'markdown'} for CSV"
+        )
+    )
+    include_timings: bool = Field(
+        default=False,
+        description="Return per-stage timings (download, size check, parse) in the result"
+    )
+    chunking: Optional[Literal['page', 'section', 'chars']] = Field(
+        default=None,
+        description=(
+            "Return content as hashed chunks per page, per section or per ~chunk_size "
+            "characters instead of a single string"
+        )
+    )
+    chunk_size: int = Field(
+        default=4000,
+        ge=500,
+        le=100000,
+        description="Target chunk size in characters when chunking is 'chars'"
+    )
+    known_hashes: List[str] = Field(
+        default_factory=list,
+        max_length=100000,
+        description=(
+            "Hashes of chunks the caller already has; their content is omitted "
+            "and only new or changed chunks are returned in full"
+        )
+    )
     
     class Config:
         extra = 'forbid'
@@ -57,25 +90,17 @@ async def read_document(params: Dict[str, Any], agent_id: str) -> Dict[str, Any]
     )
     
     try:
-        # Get credentials from Vault (simplified for this example)
-        credentials = {}
-        if validated.credentials_path:
-            # TODO: Integrate with Vault
-            credentials = {}
+        # Get credentials from Vault (cached in memory, renewed before lease expiry)
+        with span('read_document.credentials'):
+            credentials = await credential_provider.get(validated.credentials_path)
         
-        # Download document
-        file_path = await reader_registry.read_document(validated.source, credentials)
-        
-        # Check size limit
-        file_size = file_path.stat().st_size
-        max_size = settings.max_document_size_mb * 1024 * 1024
-        if file_size > max_size:
-            raise DocumentTooLargeError(
-                f"Document size {file_size} exceeds limit {max_size}"
-            )
-        
-        # Parse document
-        result = await parser_registry.parse_document(file_path)
+        # Download and parse, or serve from the document cache
+        result = await load_document(
+            validated.source,
+            credentials,
+            credentials_path=validated.credentials_path,
+            parse_options=validated.parse_options
+        )
         
         # Audit log
         log_audit(
@@ -83,13 +108,20 @@ async def read_document(params: Dict[str, Any], agent_id: str) -> Dict[str, Any]
             agent_id=agent_id,
             source=validated.source,
             format=result['format'],
-            size=file_size
+            size=result['file_size']
         )
         
-        return {
+        if validated.chunking:
+            with span('read_document.chunk'):
+                result = await asyncio.to_thread(_chunked, result, validated)
+        
+        response = {
             'status': 'success',
             'data': result
         }
+        if validated.include_timings:
+            response['timings'] = current_timings()
+        return response
         
     except Exception as e:
         logger.error(f"Failed to read document: {e}")
@@ -99,6 +131,31 @@ async def read_document(params: Dict[str, Any], agent_id: str) -> Dict[str, Any]
         }
 
 
+def _chunked(result: Dict[str, Any], validated: ReadDocumentInput) -> Dict[str, Any]:
+    """Replace content with hashed chunks, leaving out chunks the caller already has."""
+    chunks = chunk_document(result['content'], validated.chunking, validated.chunk_size)
+    known = set(validated.known_hashes)
+    changed = 0
+    for chunk in chunks:
+        if chunk['hash'] in known:
+            chunk['unchanged'] = True
+            del chunk['content']
+        else:
+            changed += 1
+    current = {chunk['hash'] for chunk in chunks}
+    
+    data = {key: value for key, value in result.items() if key != 'content'}
+    data['chunking'] = chunks[0]['id'].rsplit('-', 1)[0] if chunks else validated.chunking
+    data['chunks'] = chunks
+    data['chunk_summary'] = {
+        'total': len(chunks),
+        'changed': changed,
+        'unchanged': len(chunks) - changed,
+        'removed_hashes': sorted(known - current),
+    }
+    return data
+
+
 # Tool metadata for MCP registration
 TOOL_METADATA = {
     'name': 'policy-read-document',
@@ -0,0 +1,146 @@
+"""
+Request deadlines and cancellation of blocking work.
+
+Every tool call runs under a deadline: request_timeout_seconds, or what the
+client asked for with X-Request-Timeout (capped at
+max_request_timeout_seconds). The deadline is a context variable, so it
+follows the call down into the reader and parser registries, which bound
+their awaits with deadline_timeout.
+
+A call is cancelled when its deadline passes or its client goes away; the
+awaits unwind at once. Work already handed to a thread cannot be
+interrupted, so run_in_thread flags it instead and blocking loops stop at
+their next check_cancelled().
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Iterator, Optional, TypeVar
+from src.config import settings
+from src.utils.errors import DeadlineExceededError, RequestCancelledError
+from src.utils.metrics import ABANDONED_WORK, DEADLINES_EXCEEDED
+
+T = TypeVar('T')
+
+# time.monotonic() by which the current request must finish
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar('request_deadline', default=None)
+# Set when the caller of the current run_in_thread call has given up
+_cancelled: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    'thread_cancelled', default=None
+)
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float] = None) -> Iterator[None]:
+    """
+    Run the block under a request deadline.
+    
+    Args:
+        timeout: Seconds from now, capped at max_request_timeout_seconds. When
+            None, an enclosing deadline is kept, or request_timeout_seconds applies.
+    """
+    enclosing = _deadline.get()
+    if timeout is None:
+        if enclosing is not None:
+            yield
+            return
+        timeout = settings.request_timeout_seconds
+    deadline = time.monotonic() + min(timeout, settings.max_request_timeout_seconds)
+    if enclosing is not None:
+        deadline = min(deadline, enclosing)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_remaining() -> Optional[float]:
+    """Seconds left until the request deadline, or None outside a request."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _exceeded(operation: str) -> DeadlineExceededError:
+    DEADLINES_EXCEEDED.labels(operation=operation).inc()
+    return DeadlineExceededError(
+        f"Request deadline exceeded during {operation}",
+        {'operation': operation}
+    )
+
+
+@asynccontextmanager
+async def deadline_timeout(operation: str) -> AsyncIterator[None]:
+    """
+    Cancel the block when the request deadline passes.
+    
+    Raises:
+        DeadlineExceededError: The deadline passed before or during the block
+    """
+    remaining = time_remaining()
+    if remaining is None:
+        yield
+        return
+    if remaining <= 0:
+        raise _exceeded(operation)
+    try:
+        async with asyncio.timeout(remaining):
+            yield
+    except TimeoutError:
+        raise _exceeded(operation) from None
+
+
+def _check(cancelled: Optional[threading.Event], deadline: Optional[float]):
+    if cancelled is not None and cancelled.is_set():
+        raise RequestCancelledError("Request cancelled")
+    if deadline is not None and time.monotonic() >= deadline:
+        raise DeadlineExceededError("Request deadline exceeded", {'operation': 'blocking call'})
+
+
+def check_cancelled():
+    """
+    Stop blocking work whose request is over (call between pages, rows, chunks).
+    
+    Raises:
+        RequestCancelledError: The awaiting caller gave up
+        DeadlineExceededError: The request deadline passed
+    """
+    _check(_cancelled.get(), _deadline.get())
+
+
+def cancellation_checker() -> Callable[[], None]:
+    """check_cancelled bound to the current request, for callbacks run on threads the call did not start."""
+    return functools.partial(_check, _cancelled.get(), _deadline.get())
+
+
+async def run_in_thread(func: Callable[..., T], *args, on_abandon: Optional[Callable[[], None]] = None) -> T:
+    """
+    Run blocking code (client libraries, parsers) off the event loop.
+    
+    Threads cannot be interrupted: if the caller gives up (cancellation,
+    deadline, lost hedge), the thread's check_cancelled() starts raising so
+    it stops at its next check, and on_abandon then cleans up after it, e.g.
+    by deleting its part file.
+    """
+    loop = asyncio.get_running_loop()
+    cancelled = threading.Event()
+    context = contextvars.copy_context()
+    context.run(_cancelled.set, cancelled)
+    future = loop.run_in_executor(None, functools.partial(context.run, func, *args))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        cancelled.set()
+        ABANDONED_WORK.labels(kind='thread').inc()
+        
+        def abandoned(finished: asyncio.Future):
+            # Retrieve the outcome so an abandoned failure is not reported as unhandled
+            if not finished.cancelled():
+                finished.exception()
+            if on_abandon is not None:
+                on_abandon()
+        future.add_done_callback(abandoned)
+        raise
@@ -31,6 +31,11 @@ class SourceConnectionError(MCPError):
     pass
 
 
+class CircuitOpenError(SourceConnectionError):
+    """Source host marked unavailable after repeated failures; details carry retry_after seconds."""
+    pass
+
+
 class DocumentParseError(MCPError):
     """Error parsing document."""
     pass
@@ -44,3 +49,23 @@ class DocumentTooLargeError(MCPError):
 class UnsupportedFormatError(MCPError):
     """Unsupported document format."""
     pass
+
+
+class RateLimitError(MCPError):
+    """Agent exceeded its request rate; details carry retry_after seconds."""
+    pass
+
+
+class ServiceOverloadedError(MCPError):
+    """Server at capacity and request queue full or timed out; details carry retry_after seconds."""
+    pass
+
+
+class DeadlineExceededError(MCPError):
+    """Request deadline passed before the work finished; details carry the operation."""
+    pass
+
+
+class RequestCancelledError(MCPError):
+    """Work abandoned because the request it was done for was cancelled."""
+    pass
@@ -0,0 +1,23 @@
+"""
+Who is calling: the agent id used for rate limits, audit logs and traces.
+
+Bearer tokens are not verified yet, so nothing in them can be trusted: a
+caller could put any subject in a token, and would get a fresh rate limit
+bucket with each one. Until signatures are checked, callers are identified
+by their address.
+"""
+from typing import Optional
+
+
+def agent_id_from_request(authorization: Optional[str], client_host: Optional[str]) -> str:
+    """
+    Agent id for a request.
+    
+    Args:
+        authorization: Authorization header value (unused until tokens are verified)
+        client_host: Address of the connecting client
+    
+    Returns:
+        'client:<address>'
+    """
+    return f"client:{client_host or 'unknown'}"
@@ -1,25 +1,34 @@
 """Structured logging with automatic PII redaction."""
+import atexit
+import copy
+import fcntl
 import logging
+import logging.handlers
 import json
-import re
-from typing import Any, Dict, Optional
-from datetime import datetime
+import os
+import queue
+import contextvars
+import time
+from typing import Any, Dict, Optional, Tuple
 from pathlib import Path
+from src.config import settings
+from src.utils.redaction import redact_text
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements
+    orjson = None
+
+
+# (request_id, agent_id) of the request being handled by the current task
+_request_context: contextvars.ContextVar[Optional[Tuple[str, str]]] = contextvars.ContextVar(
+    'request_context', default=None
+)
 
 
 class PIIRedactor:
     """Redact PII from log messages."""
     
-    PATTERNS = {
-        'password': re.compile(r'password[\"\']?\s*[:=]\s*[\"\'](.*?)[\"\']', re.IGNORECASE),
-        'api_key': re.compile(r'api[_-]?key[\"\']?\s*[:=]\s*[\"\'](.*?)[\"\']', re.IGNORECASE),
-        'token': re.compile(r'token[\"\']?\s*[:=]\s*[\"\'](.*?)[\"\']', re.IGNORECASE),
-        'secret': re.compile(r'secret[\"\']?\s*[:=]\s*[\"\'](.*?)[\"\']', re.IGNORECASE),
-        'credentials': re.compile(r'credentials[\"\']?\s*[:=]\s*[\"\'](.*?)[\"\']', re.IGNORECASE),
-        'ssn': re.compile(r'\b\d{3}-\d{2}-\d{4}\b'),
-        'credit_card': re.compile(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'),
-    }
-    
     @classmethod
     def redact(cls, data: Any) -> Any:
         """Redact PII from data."""
@@ -28,24 +37,41 @@ class PIIRedactor:
         elif isinstance(data, list):
             return [cls.redact(item) for item in data]
         elif isinstance(data, str):
-            result = data
-            for pattern in cls.PATTERNS.values():
-                result = pattern.sub('[REDACTED]', result)
-            return result
+            return redact_text(data)
         return data
 
 
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the request context of the logging task."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _request_context.get()
+        if context is not None:
+            record.request_id, record.agent_id = context
+        return True
+
+
 class JSONFormatter(logging.Formatter):
     """JSON log formatter with PII redaction."""
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.redactor = PIIRedactor()
+        self._second = None
+        self._second_prefix = ''
+    
+    def _timestamp(self, created: float) -> str:
+        """UTC ISO-8601 timestamp; the per-second prefix is cached."""
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._second_prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+        return f"{self._second_prefix}.{int((created - second) * 1_000_000):06d}"
     
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_data = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': self._timestamp(record.created),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
@@ -64,42 +90,236 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, 'agent_id'):
             log_data['agent_id'] = record.agent_id
         
-        # Add exception info if present
+        # Add exception info if present (pre-rendered when queued)
         if record.exc_info:
             log_data['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data['exception'] = record.exc_text
         
-        return json.dumps(log_data)
+        if orjson is not None:
+            return orjson.dumps(log_data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        return json.dumps(log_data, default=str)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the caller for long.
+    
+    When the queue is full, records below WARNING are dropped immediately;
+    WARNING and above wait up to block_seconds before being dropped. Drops
+    are counted and reported once the queue has room again. Audit records
+    (see log_audit) are never dropped: they wait for room however long it
+    takes.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, block_seconds: float = 0.05):
+        super().__init__(log_queue)
+        self.block_seconds = block_seconds
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Freeze message and traceback in the caller; formatting happens on the listener."""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        """Enqueue without blocking, applying the drop policy when full."""
+        try:
+            if self.dropped:
+                self._report_dropped()
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if getattr(record, 'audit', False):
+                self.queue.put(record)
+                return
+            if record.levelno >= logging.WARNING:
+                try:
+                    self.queue.put(record, timeout=self.block_seconds)
+                    return
+                except queue.Full:
+                    pass
+            self.dropped += 1
+    
+    def _report_dropped(self):
+        record = logging.LogRecord(
+            self.name or 'policy-reader', logging.WARNING, __file__, 0,
+            f"Log queue full: dropped {self.dropped} records", None, None
+        )
+        self.queue.put_nowait(record)
+        self.dropped = 0
+
+
+# Rotation period in seconds and rotated file suffix, for time-based rotation
+ROTATION_PERIODS = {
+    'daily': (86400, '%Y-%m-%d'),
+    'hourly': (3600, '%Y-%m-%d_%H'),
+}
+
+
+class SharedRotatingFileHandler(logging.handlers.WatchedFileHandler):
+    """
+    Rotating log file shared by every worker on the host.
+    
+    Each process appends through its own handler and reopens the file once
+    another process has rotated it. Rotation happens under an flock on a
+    lock file beside the log, and only if the file is still due once the
+    lock is held, so workers never rename a file another has just rotated.
+    Rotated files older than the retention period are deleted.
+    """
+    
+    def __init__(self, filename: Path, rotation: str, max_bytes: int, retention_days: int):
+        super().__init__(filename, delay=True)
+        self.rotation = rotation
+        self.max_bytes = max_bytes
+        self.retention_seconds = retention_days * 86400
+        self.lock_path = filename.with_name(f".{filename.name}.lock")
+        # time.time() from which a time-based rotation may be due
+        self.next_check = 0.0
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self._may_be_due():
+                self._rotate()
+        except Exception:
+            self.handleError(record)
+        super().emit(record)
+    
+    def _may_be_due(self) -> bool:
+        """Cheap pre-check without the lock."""
+        if self.rotation in ROTATION_PERIODS:
+            now = time.time()
+            if now < self.next_check:
+                return False
+            seconds = ROTATION_PERIODS[self.rotation][0]
+            self.next_check = (now // seconds + 1) * seconds
+            return True
+        try:
+            return os.stat(self.baseFilename).st_size >= self.max_bytes
+        except FileNotFoundError:
+            return False
+    
+    def _target(self, base: Path) -> Optional[Path]:
+        """Name to rotate base to, or None if it is not due (another process may have rotated it)."""
+        try:
+            stat = base.stat()
+        except FileNotFoundError:
+            return None
+        if self.rotation in ROTATION_PERIODS:
+            seconds, suffix = ROTATION_PERIODS[self.rotation]
+            # Due once the file was last written in an earlier period
+            if stat.st_mtime // seconds >= time.time() // seconds:
+                return None
+            stamp = time.strftime(suffix, time.gmtime(stat.st_mtime))
+        else:
+            if stat.st_size < self.max_bytes:
+                return None
+            stamp = time.strftime('%Y%m%d-%H%M%S', time.gmtime())
+        target = base.with_name(f"{base.name}.{stamp}")
+        suffix = 1
+        while target.exists():
+            target = base.with_name(f"{base.name}.{stamp}~{suffix}")
+            suffix += 1
+        return target
+    
+    def _rotate(self):
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            base = Path(self.baseFilename)
+            target = self._target(base)
+            if target is None:
+                return
+            base.rename(target)
+            
+            cutoff = time.time() - self.retention_seconds
+            for rotated in base.parent.glob(f"{base.name}.*"):
+                if rotated.stat().st_mtime < cutoff:
+                    rotated.unlink(missing_ok=True)
+        finally:
+            os.close(fd)
+        # The next emit sees the new inode and reopens
+
+
+def _file_handler(logs_dir: Path) -> logging.Handler:
+    """File handler honouring log_rotation and log_retention_days."""
+    return SharedRotatingFileHandler(
+        logs_dir / "app.log", settings.log_rotation, settings.log_max_bytes, settings.log_retention_days
+    )
 
 
 def setup_logger(name: str = "policy-reader") -> logging.Logger:
-    """Setup structured logger with PII redaction."""
+    """
+    Setup structured logger with PII redaction.
+    
+    Callers only enqueue records; a QueueListener thread formats them and
+    does the console/file I/O (including rotation), so slow disks never
+    stall the event loop.
+    """
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
+    logger.addFilter(RequestContextFilter())
     
     # Create logs directory
     logs_dir = Path("logs")
     logs_dir.mkdir(exist_ok=True)
     
+    formatter = JSONFormatter()
+    
     # Console handler
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(JSONFormatter())
-    logger.addHandler(console_handler)
+    console_handler.setFormatter(formatter)
     
     # File handler
-    file_handler = logging.FileHandler(logs_dir / "app.log")
-    file_handler.setFormatter(JSONFormatter())
-    logger.addHandler(file_handler)
+    file_handler = _file_handler(logs_dir)
+    file_handler.setFormatter(formatter)
+    
+    queue_handler = BoundedQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+    logger.addHandler(queue_handler)
+    _start_listener(queue_handler, console_handler, file_handler)
+    
+    # The listener thread does not survive fork: give each worker its own
+    os.register_at_fork(
+        after_in_child=lambda: _start_listener(queue_handler, console_handler, file_handler)
+    )
+    atexit.register(stop_log_listener)
     
     return logger
 
 
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _start_listener(queue_handler: BoundedQueueHandler, *handlers: logging.Handler):
+    """Start a listener writing queue_handler's records to handlers, on a fresh queue."""
+    global _listener
+    queue_handler.queue = queue.Queue(maxsize=settings.log_queue_size)
+    _listener = logging.handlers.QueueListener(
+        queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def stop_log_listener():
+    """Flush queued records and stop the listener (before exiting a process)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 # Global logger instance
 logger = setup_logger()
 
 
 def log_audit(event: str, **kwargs):
     """Log audit event."""
-    logger.info(f"AUDIT: {event}", extra={'data': kwargs})
+    logger.info(f"AUDIT: {event}", extra={'data': kwargs, 'audit': True})
 
 
 def log_metrics(metric_name: str, value: float, **labels):
@@ -107,7 +327,11 @@ def log_metrics(metric_name: str, value: float, **labels):
     logger.info(f"METRIC: {metric_name}={value}", extra={'data': labels})
 
 
-def set_request_context(request_id: str, agent_id: str):
-    """Set request context for logging."""
-    # This would be implemented with contextvars in production
-    pass
+def set_request_context(request_id: str, agent_id: str) -> contextvars.Token:
+    """Set request context for logging; returns a token for reset_request_context."""
+    return _request_context.set((request_id, agent_id))
+
+
+def reset_request_context(token: contextvars.Token):
+    """Restore the request context that was active before set_request_context."""
+    _request_context.reset(token)
@@ -0,0 +1,136 @@
+"""
+Process memory instrumentation: RSS sampling and tracemalloc snapshots.
+
+RSS is process-wide, so the peak growth recorded for a block that runs
+alongside other requests includes their allocations too; it is an upper
+bound per request and exact when requests do not overlap.
+"""
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
+from src.config import settings
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+TRACEMALLOC_GROUPINGS = ('lineno', 'filename', 'traceback')
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+@dataclass
+class RSSUsage:
+    """RSS at the start of a block and the highest RSS seen while it ran."""
+    start: int
+    peak: int
+    
+    @property
+    def peak_delta(self) -> int:
+        return max(self.peak - self.start, 0)
+
+
+class RSSMonitor:
+    """Samples RSS on a background thread while any tracked block is running."""
+    
+    def __init__(self, interval_seconds: float):
+        self.interval = interval_seconds
+        self.active: Dict[int, RSSUsage] = {}
+        self.lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> Optional[RSSUsage]:
+        rss = current_rss()
+        if rss is None:
+            return None
+        usage = RSSUsage(rss, rss)
+        with self.lock:
+            self.active[id(usage)] = usage
+            # Threads do not survive fork, so a worker may inherit a dead handle
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='rss-monitor', daemon=True)
+                self._thread.start()
+        return usage
+    
+    def stop(self, usage: Optional[RSSUsage]):
+        if usage is None:
+            return
+        rss = current_rss()
+        with self.lock:
+            self.active.pop(id(usage), None)
+            if rss is not None:
+                usage.peak = max(usage.peak, rss)
+    
+    def record_child(self, peak_delta: int):
+        """Count the peak RSS growth of a child process that worked for the tracked blocks."""
+        rss = current_rss()
+        if rss is None:
+            return
+        with self.lock:
+            for usage in self.active.values():
+                usage.peak = max(usage.peak, rss + peak_delta)
+    
+    @contextmanager
+    def track(self) -> Iterator[Optional[RSSUsage]]:
+        """Record peak RSS while the block runs (None where RSS cannot be read)."""
+        usage = self.start()
+        try:
+            yield usage
+        finally:
+            self.stop(usage)
+    
+    def _run(self):
+        while True:
+            rss = current_rss()
+            with self.lock:
+                if not self.active:
+                    self._thread = None
+                    return
+                for usage in self.active.values():
+                    if rss is not None and rss > usage.peak:
+                        usage.peak = rss
+            time.sleep(self.interval)
+
+
+def start_tracemalloc():
+    """Start tracing allocations if tracemalloc_enabled (once per worker process)."""
+    if settings.tracemalloc_enabled and not tracemalloc.is_tracing():
+        tracemalloc.start(settings.tracemalloc_frames)
+
+
+def top_allocations(limit: int = 20, group_by: str = 'lineno') -> Dict[str, Any]:
+    """Largest live allocation sites from a tracemalloc snapshot (slow; run off the event loop)."""
+    if not tracemalloc.is_tracing():
+        return {'tracing': False}
+    
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ))
+    traced, peak = tracemalloc.get_traced_memory()
+    return {
+        'tracing': True,
+        'traced_bytes': traced,
+        'peak_traced_bytes': peak,
+        'top': [
+            {
+                'size_bytes': stat.size,
+                'count': stat.count,
+                'traceback': [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            }
+            for stat in snapshot.statistics(group_by)[:limit]
+        ],
+    }
+
+
+# Global RSS monitor
+rss_monitor = RSSMonitor(settings.rss_sample_interval_ms / 1000)
@@ -0,0 +1,182 @@
+"""Prometheus metrics shared by all server workers."""
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+from prometheus_client import (
+    CollectorRegistry,
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+
+# When run.py starts several uvicorn workers it points this variable at a
+# shared directory before any worker imports prometheus_client, so each
+# worker writes its samples there and exporters aggregate them.
+MULTIPROC_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 5e6, 1e7, 5e7, 1e8, 5e8)
+MEMORY_BUCKETS = (1e6, 1e7, 5e7, 1e8, 2.5e8, 5e8, 1e9, 2e9, 4e9)
+
+
+TOOL_CALLS = Counter(
+    'policy_reader_tool_calls_total',
+    'MCP tool calls by tool and outcome',
+    ['tool', 'status']
+)
+TOOL_LATENCY = Histogram(
+    'policy_reader_tool_call_duration_seconds',
+    'End-to-end MCP tool call latency',
+    ['tool'],
+    buckets=LATENCY_BUCKETS
+)
+IN_FLIGHT = Gauge(
+    'policy_reader_requests_in_flight',
+    'Tool calls currently being processed',
+    multiprocess_mode='livesum'
+)
+READER_LATENCY = Histogram(
+    'policy_reader_reader_download_duration_seconds',
+    'Document download latency by source protocol',
+    ['protocol'],
+    buckets=LATENCY_BUCKETS
+)
+READER_BYTES = Counter(
+    'policy_reader_reader_bytes_total',
+    'Bytes downloaded by source protocol',
+    ['protocol']
+)
+READER_ERRORS = Counter(
+    'policy_reader_reader_errors_total',
+    'Failed downloads by source protocol',
+    ['protocol']
+)
+PARSER_LATENCY = Histogram(
+    'policy_reader_parser_duration_seconds',
+    'Document parse latency by format',
+    ['format'],
+    buckets=LATENCY_BUCKETS
+)
+PARSER_INPUT_BYTES = Histogram(
+    'policy_reader_parser_input_bytes',
+    'Size of parsed documents by format',
+    ['format'],
+    buckets=SIZE_BUCKETS
+)
+READER_RETRIES = Counter(
+    'policy_reader_reader_retries_total',
+    'Reads retried after a transient failure by source protocol',
+    ['protocol']
+)
+READER_HEDGES = Counter(
+    'policy_reader_reader_hedges_total',
+    'Hedged reads by source protocol and which request finished first',
+    ['protocol', 'winner']
+)
+CIRCUIT_TRANSITIONS = Counter(
+    'policy_reader_circuit_transitions_total',
+    'Source circuit breaker state changes by protocol and new state',
+    ['protocol', 'state']
+)
+FAST_FAILURES = Counter(
+    'policy_reader_reader_fast_failures_total',
+    'Reads failed without contacting the source (open circuit or cached not-found)',
+    ['protocol', 'reason']
+)
+ADMISSION_REJECTIONS = Counter(
+    'policy_reader_admission_rejections_total',
+    'Tool calls rejected by admission control',
+    ['reason']
+)
+DEADLINES_EXCEEDED = Counter(
+    'policy_reader_deadlines_exceeded_total',
+    'Tool calls that ran out of time, by the operation under way',
+    ['operation']
+)
+ABANDONED_WORK = Counter(
+    'policy_reader_abandoned_work_total',
+    'Blocking work given up after its request was cancelled (thread: stopped at its next check, process: killed)',
+    ['kind']
+)
+QUEUED_REQUESTS = Gauge(
+    'policy_reader_requests_queued',
+    'Tool calls waiting for a concurrency slot',
+    multiprocess_mode='livesum'
+)
+CACHE_REQUESTS = Counter(
+    'policy_reader_cache_requests_total',
+    'Parsed document cache lookups (hit ratio = hit / (hit + miss))',
+    ['result']
+)
+
+CREDENTIAL_LOOKUPS = Counter(
+    'policy_reader_credential_lookups_total',
+    'Credential lookups (hit, miss, coalesced onto a pending fetch, refresh_failed)',
+    ['result']
+)
+
+PARSE_QUEUE_DEPTH = Gauge(
+    'policy_reader_parse_queue_depth',
+    'Parses waiting for a parse slot by scheduler lane',
+    ['lane'],
+    multiprocess_mode='livesum'
+)
+PARSES_RUNNING = Gauge(
+    'policy_reader_parses_running',
+    'Parses holding a parse slot by scheduler lane',
+    ['lane'],
+    multiprocess_mode='livesum'
+)
+PARSE_QUEUE_WAIT = Histogram(
+    'policy_reader_parse_queue_wait_seconds',
+    'Time parses waited for a parse slot by scheduler lane',
+    ['lane'],
+    buckets=LATENCY_BUCKETS
+)
+
+MEMORY_RESERVED = Gauge(
+    'policy_reader_memory_reserved_bytes',
+    'Estimated memory of parses currently admitted',
+    multiprocess_mode='livesum'
+)
+PARSER_PEAK_RSS = Histogram(
+    'policy_reader_parser_peak_rss_delta_bytes',
+    'Peak RSS growth during a parse by format (compare with the memory estimate)',
+    ['format'],
+    buckets=MEMORY_BUCKETS
+)
+
+
+@contextmanager
+def observe_latency(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the duration of a block, including when it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+def record_cache_lookup(hit: bool):
+    """Count a cache hit or miss."""
+    CACHE_REQUESTS.labels(result='hit' if hit else 'miss').inc()
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry to export: aggregated across workers in multiprocess mode."""
+    if os.environ.get(MULTIPROC_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render metrics in the Prometheus text format."""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
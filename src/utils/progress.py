@@ -0,0 +1,65 @@
+"""
+Request-scoped progress reporting for long tool calls.
+
+A transport that can deliver progress (MCP progress notifications) installs a
+callback with progress_reporter; code anywhere below it calls report_progress,
+which is a no-op when nobody is listening. Progress is a fraction of the whole
+call: progress_stage narrows the range a nested step reports into, so a parser
+can report pages 1..N without knowing what happens before or after it.
+
+The reporter is a context variable, so it follows the call into
+asyncio.to_thread and run_in_thread; callbacks must be thread-safe.
+"""
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+# Called with (fraction done in [0, 1], message)
+ProgressCallback = Callable[[float, Optional[str]], None]
+
+
+@dataclass(frozen=True)
+class _Reporter:
+    callback: ProgressCallback
+    start: float = 0.0
+    end: float = 1.0
+
+
+_reporter: contextvars.ContextVar[Optional[_Reporter]] = contextvars.ContextVar(
+    'progress_reporter', default=None
+)
+
+
+@contextmanager
+def progress_reporter(callback: ProgressCallback) -> Iterator[None]:
+    """Send progress reported within the block to callback."""
+    token = _reporter.set(_Reporter(callback))
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
+
+
+@contextmanager
+def progress_stage(start: float, end: float) -> Iterator[None]:
+    """Map progress reported within the block onto [start, end] of the current range."""
+    parent = _reporter.get()
+    if parent is None:
+        yield
+        return
+    width = parent.end - parent.start
+    token = _reporter.set(_Reporter(parent.callback, parent.start + start * width, parent.start + end * width))
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
+
+
+def report_progress(done: float, total: float = 1.0, message: Optional[str] = None):
+    """Report done out of total units of the current stage."""
+    reporter = _reporter.get()
+    if reporter is None:
+        return
+    fraction = min(max(done / total, 0.0), 1.0) if total else 0.0
+    reporter.callback(reporter.start + fraction * (reporter.end - reporter.start), message)
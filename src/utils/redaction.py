@@ -0,0 +1,168 @@
+"""
+Single-pass PII redaction for log data and document text.
+
+Redacts quoted secrets (password="...", api_key: '...', token, secret,
+credentials), US social security numbers and 16-digit card numbers.
+Instead of running one regex per pattern over the whole string, a single
+scan looks for the only places a match can occur (an assignment followed
+by a quote, or a run of three digits) and verifies each candidate locally,
+so text with nothing to redact is passed through at near memchr speed.
+"""
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+REDACTED = '[REDACTED]'
+
+# Every redactable match contains an assignment followed by a quote or a
+# run of three digits; the shared leading character class lets re skip
+# ahead quickly over text that has neither
+_CANDIDATE = re.compile(r'[\d:=](?:(?<=[:=])\s*["\']|(?<=\d)\d\d)')
+_SECRET_KEY = re.compile(
+    r'(?:password|api[_-]?key|token|secret|credentials)["\']?\s*\Z', re.IGNORECASE
+)
+_QUOTED_VALUE = re.compile(r'.*?["\']')
+_SSN = re.compile(r'\d{3}-\d{2}-\d{4}\b')
+_CARD = re.compile(r'\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b')
+
+# How far before an assignment the secret key name may start
+KEY_LOOKBEHIND = 64
+# Longest card number with separators, plus the character \b looks at
+NUMBER_LOOKAHEAD = 20
+# Characters redact_stream collects before scanning
+STREAM_BATCH = 4096
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _spans(text: str) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) of each redactable match, left to right."""
+    end = 0
+    for candidate in _CANDIDATE.finditer(text):
+        pos = candidate.start()
+        if pos < end:
+            continue
+        
+        if text[pos] in ':=':
+            key = _SECRET_KEY.search(text, max(end, pos - KEY_LOOKBEHIND), pos)
+            value = key and _QUOTED_VALUE.match(text, candidate.end())
+            if value:
+                end = value.end()
+                yield key.start(), end
+        elif pos == 0 or not _is_word(text[pos - 1]):
+            number = _SSN.match(text, pos) or _CARD.match(text, pos)
+            if number:
+                end = number.end()
+                yield pos, end
+
+
+def redact_text(text: str) -> str:
+    """Redact PII from a string; returns the input unchanged if nothing matches."""
+    if _CANDIDATE.search(text) is None:
+        return text
+    
+    parts: List[str] = []
+    last = 0
+    for start, end in _spans(text):
+        parts.append(text[last:start])
+        parts.append(REDACTED)
+        last = end
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return ''.join(parts)
+
+
+def _open_secret(text: str, spans: List[Tuple[int, int]]) -> Optional[int]:
+    """
+    Start of a secret whose value is still open at the end of text.
+    
+    That is a secret key and assignment followed by only whitespace, or by a
+    quote with no closing quote or newline after it. Only text that has not
+    arrived yet can complete it, and the value has no length limit.
+    """
+    starts = []
+    quote = max(text.rfind('"'), text.rfind("'"))
+    ends = [len(text)]
+    if quote > text.rfind('\n'):
+        ends.append(quote)
+    for pos in ends:
+        while pos > 0 and text[pos - 1].isspace():
+            pos -= 1
+        pos -= 1
+        if pos < 0 or text[pos] not in ':=':
+            continue
+        
+        # The scan skips assignments inside an earlier match, and starts its
+        # key search after the previous one
+        previous = 0
+        for start, end in spans:
+            if start > pos:
+                break
+            previous = end
+        if previous > pos:
+            continue
+        key = _SECRET_KEY.search(text, max(previous, pos - KEY_LOOKBEHIND), pos)
+        if key:
+            starts.append(key.start())
+    return min(starts, default=None)
+
+
+def _stream_cut(text: str, spans: List[Tuple[int, int]]) -> int:
+    """
+    Where to split text so that scanning the rest again, with more text
+    appended, finds exactly the matches a scan of the whole stream would.
+    """
+    # A key for an assignment yet to arrive, or a number, may start this close
+    # to the end
+    cut = len(text) - KEY_LOOKBEHIND - NUMBER_LOOKAHEAD
+    open_secret = _open_secret(text, spans)
+    if open_secret is not None:
+        cut = min(cut, open_secret)
+    # A digit at the start of the rest would pass the word boundary check
+    # that the character before it fails
+    while cut > 0 and text[cut].isdigit() and _is_word(text[cut - 1]):
+        cut -= 1
+    for start, end in spans:
+        if end > cut:
+            return max(0, min(cut, start))
+    return max(0, cut)
+
+
+def redact_stream(chunks: Iterable[str], batch: int = STREAM_BATCH) -> Iterator[str]:
+    """
+    Redact PII from text arriving in chunks.
+    
+    Output joins to redact_text of the whole stream. Text that a match may
+    still cover is held back and rescanned with the next chunk; a quoted
+    secret value is held for as long as it stays open, however long that is.
+    """
+    buffer = ''
+    wanted = batch
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) < wanted:
+            continue
+        
+        spans = list(_spans(buffer))
+        cut = _stream_cut(buffer, spans)
+        
+        parts: List[str] = []
+        last = 0
+        for start, end in spans:
+            if end > cut:
+                break
+            parts.append(buffer[last:start])
+            parts.append(REDACTED)
+            last = end
+        parts.append(buffer[last:cut])
+        buffer = buffer[cut:]
+        # Wait for the held text to double before rescanning it, so a long
+        # open value costs linear time
+        wanted = max(batch, 2 * len(buffer))
+        yield ''.join(parts)
+    
+    if buffer:
+        yield redact_text(buffer)
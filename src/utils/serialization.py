@@ -0,0 +1,107 @@
+"""Fast JSON encoding and content-negotiated compression for tool responses."""
+import asyncio
+import gzip
+import json
+from typing import Any, Dict, Optional
+from fastapi import Response
+from src.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # zstd is offered only when zstandard is installed
+    zstandard = None
+
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+# Larger bodies are compressed off the event loop
+INLINE_COMPRESSION_BYTES = 256 * 1024
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode a tool result as JSON bytes.
+    
+    Tool results are plain dicts built by the server, so they are encoded
+    directly rather than walked by jsonable_encoder first; values orjson does
+    not know natively (Path, Decimal, ...) are encoded as strings.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def loads(data: bytes) -> Any:
+    """Decode a JSON request body; raises ValueError on malformed input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def available_encodings() -> list[str]:
+    """Content codings this server can produce, most preferred first."""
+    return (['zstd'] if zstandard is not None else []) + ['gzip']
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header.
+    
+    Honours q-values (q=0 refuses a coding, '*' matches any); ties go to
+    the server's preference order.
+    """
+    if not accept_encoding:
+        return None
+    
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding] = quality
+    
+    best, best_quality = None, 0.0
+    for coding in available_encodings():
+        quality = weights.get(coding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress body with the given content coding."""
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+async def tool_response(result: Dict[str, Any], accept_encoding: Optional[str] = None, status_code: int = 200) -> Response:
+    """Build a JSON response, compressed when the client accepts it and the body is large enough."""
+    body = dumps(result)
+    headers = {'Vary': 'Accept-Encoding'}
+    
+    encoding = None
+    if settings.compression_enabled and len(body) >= settings.compression_min_bytes:
+        encoding = negotiate_encoding(accept_encoding)
+    if encoding:
+        if len(body) > INLINE_COMPRESSION_BYTES:
+            body = await asyncio.to_thread(compress, body, encoding)
+        else:
+            body = compress(body, encoding)
+        headers['Content-Encoding'] = encoding
+    
+    return Response(content=body, status_code=status_code, media_type='application/json', headers=headers)
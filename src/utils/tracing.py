@@ -0,0 +1,205 @@
+"""Request-scoped stage timing spans with optional OpenTelemetry export."""
+import contextvars
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+from src.config import settings
+from src.utils.logger import logger, log_metrics, set_request_context, reset_request_context
+from src.utils.memory import rss_monitor
+
+
+@dataclass
+class Span:
+    """A timed stage within a request."""
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    start: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    duration_ms: Optional[float] = None
+    status: str = 'ok'
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialisable view of the span."""
+        return {
+            'name': self.name,
+            'duration_ms': self.duration_ms,
+            'status': self.status,
+            **({'attributes': self.attributes} if self.attributes else {}),
+        }
+
+
+@dataclass
+class RequestTrace:
+    """All spans recorded while handling one request."""
+    request_id: str
+    agent_id: str
+    name: str
+    start: float = field(default_factory=time.perf_counter)
+    spans: List[Span] = field(default_factory=list)
+
+
+_current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar(
+    'current_trace', default=None
+)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    'current_span', default=None
+)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time a stage of the current request.
+    
+    Outside a request trace this is a no-op, so registries and tools can
+    be instrumented unconditionally.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    
+    parent = _current_span.get()
+    current = Span(
+        name=name,
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent else None,
+        start_ns=time.time_ns(),
+        start=time.perf_counter(),
+        attributes=attributes,
+    )
+    trace.spans.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException:
+        current.status = 'error'
+        raise
+    finally:
+        current.duration_ms = round((time.perf_counter() - current.start) * 1000, 3)
+        _current_span.reset(token)
+
+
+@contextmanager
+def request_trace(name: str, agent_id: str, request_id: Optional[str] = None) -> Iterator[RequestTrace]:
+    """
+    Trace one request: sets the logging context, records a root span (with
+    the peak RSS growth seen while it ran) and emits all spans as a
+    structured log line (and to the exporter) at the end.
+    """
+    trace = RequestTrace(request_id=request_id or uuid.uuid4().hex, agent_id=agent_id, name=name)
+    trace_token = _current_trace.set(trace)
+    context_token = set_request_context(trace.request_id, agent_id)
+    usage = rss_monitor.start()
+    try:
+        with span(name):
+            yield trace
+    finally:
+        rss_monitor.stop(usage)
+        if usage is not None:
+            trace.spans[0].attributes['peak_rss_delta_bytes'] = usage.peak_delta
+        _current_trace.reset(trace_token)
+        try:
+            _emit(trace)
+        finally:
+            reset_request_context(context_token)
+
+
+def current_timings() -> Optional[Dict[str, Any]]:
+    """Timings of the stages finished so far in the current request."""
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    return {
+        'request_id': trace.request_id,
+        'elapsed_ms': round((time.perf_counter() - trace.start) * 1000, 3),
+        'stages': [s.to_dict() for s in trace.spans if s.duration_ms is not None],
+    }
+
+
+def _emit(trace: RequestTrace):
+    """Log the finished trace and hand it to the configured exporter."""
+    root = trace.spans[0]
+    log_metrics(
+        'request.duration_ms',
+        root.duration_ms,
+        request=trace.name,
+        status=root.status,
+        peak_rss_delta_bytes=root.attributes.get('peak_rss_delta_bytes'),
+        stages=[s.to_dict() for s in trace.spans[1:]],
+    )
+    if settings.tracing_exporter != 'none':
+        try:
+            _export_otel(trace)
+        except Exception as e:
+            logger.warning(f"Trace export failed: {e}")
+
+
+_tracer = None
+_tracer_pid = None
+_tracer_lock = threading.Lock()
+
+
+def _get_tracer():
+    """Build the OpenTelemetry tracer on first use (per process)."""
+    global _tracer, _tracer_pid
+    with _tracer_lock:
+        # Exporter threads do not survive fork; rebuild in each worker
+        if _tracer is not None and _tracer_pid == os.getpid():
+            return _tracer
+        
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        
+        if settings.tracing_exporter == 'otlp':
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            exporter = OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+        else:
+            exporter = ConsoleSpanExporter(
+                out=open(settings.tracing_file_path, 'a'),
+                formatter=lambda s: s.to_json(indent=None) + '\n',
+            )
+        
+        provider = TracerProvider(
+            resource=Resource.create({'service.name': 'policy-document-reader'})
+        )
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+        _tracer = provider.get_tracer('policy-document-reader')
+        _tracer_pid = os.getpid()
+        return _tracer
+
+
+def _export_otel(trace: RequestTrace):
+    """Replay recorded spans as OpenTelemetry spans with their original timestamps."""
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.trace import Status, StatusCode
+    
+    tracer = _get_tracer()
+    otel_spans = {}
+    # Spans are recorded in start order, so parents precede children
+    for recorded in trace.spans:
+        parent = otel_spans.get(recorded.parent_id)
+        context = otel_trace.set_span_in_context(parent) if parent is not None else None
+        attributes = {
+            k: v if isinstance(v, (str, bool, int, float)) else str(v)
+            for k, v in recorded.attributes.items()
+        }
+        if recorded.parent_id is None:
+            attributes.update({'request.id': trace.request_id, 'agent.id': trace.agent_id})
+        otel_span = tracer.start_span(
+            recorded.name, context=context, start_time=recorded.start_ns, attributes=attributes
+        )
+        if recorded.status == 'error':
+            otel_span.set_status(Status(StatusCode.ERROR))
+        otel_spans[recorded.span_id] = otel_span
+    
+    for recorded in trace.spans:
+        end_ns = recorded.start_ns + int((recorded.duration_ms or 0) * 1_000_000)
+        otel_spans[recorded.span_id].end(end_time=end_ns)
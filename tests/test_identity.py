@@ -0,0 +1,29 @@
+"""Agent identity and rate limit keying tests."""
+import base64
+import json
+from src.services.rate_limiter import TokenBucketTable
+from src.utils.identity import agent_id_from_request
+
+
+def _token(subject: str) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({'sub': subject}).encode()).decode().rstrip('=')
+    return f"Bearer header.{payload}.signature"
+
+
+def test_new_token_subject_does_not_reset_rate_limit(tmp_path):
+    buckets = TokenBucketTable(tmp_path / "buckets.bin", rate_per_second=1 / 60, capacity=3)
+    
+    waits = [
+        buckets.take(agent_id_from_request(_token(f"agent-{attempt}"), '10.0.0.1'))
+        for attempt in range(4)
+    ]
+    
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] > 0
+
+
+def test_token_subject_cannot_drain_another_client(tmp_path):
+    buckets = TokenBucketTable(tmp_path / "buckets.bin", rate_per_second=1 / 60, capacity=1)
+    
+    assert buckets.take(agent_id_from_request(_token('victim'), '10.0.0.1')) == 0
+    assert buckets.take(agent_id_from_request(_token('victim'), '10.0.0.2')) == 0
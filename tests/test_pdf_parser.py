@@ -0,0 +1,17 @@
+"""PDF parser tests."""
+import asyncio
+import pytest
+from benchmarks.corpus import write_pdf
+from src.services.parsers.pdf_parser import PDFParser
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fast_parses_do_not_crash(tmp_path):
+    """pdfium is not thread-safe; concurrent thread parses used to segfault the worker."""
+    files = [write_pdf(tmp_path / f"doc{index}.pdf", pages=40, seed=index) for index in range(16)]
+    parser = PDFParser()
+    
+    for _ in range(15):
+        results = await asyncio.gather(*(parser.parse(path, engine='fast') for path in files))
+        assert [result['metadata']['pages'] for result in results] == [40] * len(files)
+        assert all(result['metadata']['engine'] == 'fast' for result in results)
@@ -0,0 +1,31 @@
+"""PII redaction tests."""
+import random
+from src.utils.redaction import REDACTED, redact_stream, redact_text
+
+
+def _chunked(text, size):
+    return [text[index:index + size] for index in range(0, len(text), size)]
+
+
+def test_stream_redacts_secret_across_chunk_boundary():
+    """A quoted value longer than any fixed overlap used to leak when it straddled a chunk."""
+    secret = 'x' * 20000
+    text = 'a' * 5000 + f' password="{secret}" tail'
+    
+    for size in (1, 7, 4096, 5003, 5012, 8192):
+        output = ''.join(redact_stream(_chunked(text, size), batch=64))
+        assert secret[:10] not in output
+        assert output == 'a' * 5000 + f' {REDACTED} tail'
+
+
+def test_stream_matches_whole_text():
+    pieces = [
+        'password="hunter2"', "api_key: 'k-123'", 'token =\n\n  "abc"', 'secret=  ',
+        '123-45-6789', '4111 1111 1111 1111', 'x123-45-6789', 'api-key="v"', 'xtoken="t"',
+        'credentials="' + 'c' * 300 + '"', 'password="open', '\n', ' ', 'word', '42', '=', '"',
+    ]
+    generator = random.Random(0)
+    for _ in range(300):
+        text = ''.join(generator.choice(pieces) for _ in range(generator.randint(1, 80)))
+        size = generator.randint(1, 200)
+        assert ''.join(redact_stream(_chunked(text, size), batch=generator.randint(1, 300))) == redact_text(text)